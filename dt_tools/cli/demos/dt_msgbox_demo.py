@@ -5,6 +5,9 @@ This module will demo the dt_tools.console.msgbox capabilities including:
 - Show message boxes with default timeouts
 - Show multi-line boxes
 - Show how to retrieve message box input, both visible and hidden (i.e. password)
+- Show a searchable choice box with 100,000 entries
+- Show a form box collecting several fields at once
+- Show a progress box updated by worker threads
 
 To run this demo standalone:
     `poetry run python -m dt_tools.cli.dt_msgbox_demo`
@@ -14,6 +17,7 @@ from dt_tools.console.console_helper import ColorFG
 from dt_tools.console.console_helper import ConsoleHelper as console
 from dt_tools.os.os_helper import OSHelper
 
+import threading
 import tkinter as tk
 
 import dt_tools.console.msgbox as msgbox
@@ -69,6 +73,39 @@ def demo():
     resp = msgbox.password('This is a password box', 'PASSWORD', 'SuperSecretPassword')
     console.print(f'  returns: {console.cwrap(resp, ColorFG.GREEN)}')
 
+    console.print('')
+    console.print_line_separator('Choice box (100,000 entries)', 40)
+    hosts = [f'host{idx:06d}.example.com' for idx in range(100_000)]
+    resp = msgbox.choice('Select host(s), type to filter', 'CHOICE', hosts, multiple=True)
+    console.print(f'  returns: {console.cwrap(resp, ColorFG.GREEN)}')
+
+    console.print('')
+    console.print_line_separator('Form box (no timeout)', 40)
+    resp = msgbox.form('Enter connection settings', 'FORM', fields=[
+        msgbox.FormField('host', 'Host', default='localhost', validator=lambda v: None if v else 'Host is required'),
+        msgbox.FormField('user', 'User id'),
+        msgbox.FormField('pwd', 'Password', msgbox.MB_FieldType.PASSWORD),
+        msgbox.FormField('env', 'Environment', msgbox.MB_FieldType.CHOICE, default='test', choices=['dev', 'test', 'prod']),
+        msgbox.FormField('save', 'Save settings', msgbox.MB_FieldType.CHECKBOX, default=True),
+    ])
+    console.print(f'  returns: {console.cwrap(resp, ColorFG.GREEN)}')
+
+    console.print('')
+    console.print_line_separator('Progress box (4 worker threads)', 40)
+    with msgbox.progress('Processing 4,000,000 items', 'PROGRESS', total=4_000_000) as box:
+        def worker():
+            for _ in range(1_000_000):
+                if box.cancelled:
+                    break
+                box.advance()
+        workers = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+    resp = msgbox.MB_ButtonType.CANCEL if box.cancelled else msgbox.MB_ButtonType.OK
+    console.print(f'  returns: {console.cwrap(resp, ColorFG.GREEN)}')
+
     console.print('')
     console.print(f"End of {console.cwrap('MessageBox', ColorFG.YELLOW)} demo.")
 
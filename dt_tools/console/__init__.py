@@ -1,3 +1,42 @@
-from loguru import logger
+"""
+Console tools for CLIs.
 
-logger.disable('dt_tools.console')
\ No newline at end of file
+Submodules (and their main classes) are imported on first use, so importing
+the package is cheap::
+
+    import dt_tools.console as console
+
+    console.ConsoleHelper.print('Hello')    # loads dt_tools.console.console_helper
+    console.msgbox.alert('Hello')           # loads dt_tools.console.msgbox (and tkinter)
+"""
+import importlib
+
+from dt_tools.console._lazy import LOGGER  # noqa: F401 - applies package logging default
+
+_SUBMODULES = ('ansi_strip', 'ansi_text', 'console_helper', 'dashboard', 'input_source', 'keyboard', 'log_pane',
+               'msgbox', 'pager', 'progress_bar', 'render_hooks', 'response_index', 'session_recorder',
+               'sparkline', 'spinner', 'table', 'virtual_terminal')
+_CLASSES = {
+    'ConsoleHelper': 'console_helper',
+    'ConsoleInputHelper': 'console_helper',
+    'ColorFG': 'console_helper',
+    'ColorBG': 'console_helper',
+    'TextStyle': 'console_helper',
+    'CursorShape': 'console_helper',
+    'ProgressBar': 'progress_bar',
+    'Spinner': 'spinner',
+    'SpinnerType': 'spinner',
+}
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'{__name__}.{name}')
+    if name in _CLASSES:
+        module = importlib.import_module(f'{__name__}.{_CLASSES[name]}')
+        return getattr(module, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_SUBMODULES) + list(_CLASSES))
@@ -0,0 +1,48 @@
+"""
+Lazy import helpers, keeps `import dt_tools.console` cheap for short-lived CLIs.
+
+- lazy_import(): Module is loaded on first attribute access (importlib.util.LazyLoader).
+- LOGGER: The loguru logger.
+
+The package default (dt_tools.console logging disabled) is applied once, when
+the package is imported, so logger.enable('dt_tools.console') works in any
+import order.
+"""
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+
+from loguru import logger as LOGGER
+
+_PACKAGE = 'dt_tools.console'
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Return module name, deferring the actual import until first attribute access.
+
+    Arguments:
+        name: Fully qualified module name.
+
+    Returns:
+        The module (already loaded if previously imported).
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f'No module named {name!r}', name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+# Library default, dt_tools.console log messages are disabled until the application enables them.
+# Applied at import (not on first use), so an enable() made by the application is never undone.
+LOGGER.disable(_PACKAGE)
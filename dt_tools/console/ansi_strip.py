@@ -0,0 +1,158 @@
+"""
+Streaming ANSI escape sequence stripper for large captured output.
+
+AnsiStripper works on bytes, one chunk at a time.  An escape sequence
+split across two chunks is held in a small carry buffer (at most
+MAX_CARRY bytes) until the rest arrives, so output is identical no matter
+how the input is chunked, and memory use does not depend on input size.
+The escape sequence syntax is the one used by
+:class:`~dt_tools.console.ansi_text.AnsiText`.
+
+strip_stream() copies between binary file objects in large blocks.  From
+the shell::
+
+    dt-ansi-strip job-console.log > job.log
+    zcat huge.log.gz | dt-ansi-strip | indexer
+
+    python -m dt_tools.console.ansi_strip -o job.log job-console.log
+
+Example::
+
+    from dt_tools.console.ansi_strip import AnsiStripper, strip_stream
+
+    with open('job-console.log', 'rb') as src, open('job.log', 'wb') as dst:
+        strip_stream(src, dst)
+
+    stripper = AnsiStripper()
+    for chunk in socket_chunks:
+        sink.write(stripper.feed(chunk))
+    sink.write(stripper.flush())
+
+"""
+import argparse
+import re
+import sys
+from typing import BinaryIO, Final, List
+
+from dt_tools.console.ansi_text import _Ansi
+
+
+class AnsiStripper():
+    """
+    Incremental escape sequence remover for byte streams.
+
+    Text is passed through unchanged (no decoding), so any ASCII compatible
+    encoding works.
+    """
+    MAX_CARRY: Final = 4096
+    """Longest unfinished sequence held back, longer ones are passed through as text."""
+    _TOKEN: Final = re.compile(_Ansi.TOKEN.pattern.encode('ascii'))
+    _INCOMPLETE: Final = re.compile(rb'\x1B(?:\][^\x07\x1B]*\x1B?|\[[0-?]*[ -/]*)?\Z')
+    """Start of an escape sequence running to the end of the chunk."""
+
+    def __init__(self):
+        self._carry = b''
+        self.bytes_in = 0
+        """Bytes fed."""
+        self.bytes_out = 0
+        """Bytes returned."""
+
+    def feed(self, data: bytes) -> bytes:
+        """
+        Strip a chunk.
+
+        Arguments:
+            data: Next chunk of input.
+
+        Returns:
+            Stripped output, an unfinished trailing sequence is held for the next call.
+        """
+        self.bytes_in += len(data)
+        if self._carry:
+            data = self._carry + data
+            self._carry = b''
+        if b'\x1b' not in data:
+            self.bytes_out += len(data)
+            return data
+        tail = self._INCOMPLETE.search(data, max(len(data) - self.MAX_CARRY, 0))
+        if tail is not None:
+            self._carry = data[tail.start():]
+            data = data[:tail.start()]
+        out = self._TOKEN.sub(b'', data)
+        self.bytes_out += len(out)
+        return out
+
+    def flush(self) -> bytes:
+        """
+        End of input.
+
+        Returns:
+            Remaining output.  An unfinished escape sequence at the very end is dropped.
+        """
+        self._carry = b''
+        return b''
+
+
+def strip_stream(src: BinaryIO, dst: BinaryIO, block_size: int = 1 << 20) -> AnsiStripper:
+    """
+    Copy src to dst with escape sequences removed.
+
+    Arguments:
+        src: Binary input (file, sys.stdin.buffer, ...).
+        dst: Binary output.
+
+    Keyword Arguments:
+        block_size: Read size in bytes (default: {1MB}).
+
+    Returns:
+        The AnsiStripper used (for the bytes_in/bytes_out counts).
+    """
+    stripper = AnsiStripper()
+    read = getattr(src, 'read1', src.read)
+    write = dst.write
+    while True:
+        block = read(block_size)
+        if not block:
+            break
+        out = stripper.feed(block)
+        if out:
+            write(out)
+    write(stripper.flush())
+    dst.flush()
+    return stripper
+
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point (dt-ansi-strip)."""
+    parser = argparse.ArgumentParser(prog='dt-ansi-strip',
+                                     description='Remove ANSI escape sequences (colors, cursor controls) from files or stdin.')
+    parser.add_argument('files', nargs='*', metavar='FILE', help="input file(s), '-' or none for stdin")
+    parser.add_argument('-o', '--output', metavar='FILE', help='output file (default: stdout)')
+    parser.add_argument('-b', '--block-size', type=int, default=1 << 20, metavar='BYTES',
+                        help='read block size (default: 1MB)')
+    args = parser.parse_args(argv)
+
+    dst = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    try:
+        for name in args.files or ['-']:
+            if name == '-':
+                strip_stream(sys.stdin.buffer, dst, args.block_size)
+            else:
+                with open(name, 'rb') as src:
+                    strip_stream(src, dst, args.block_size)
+    except BrokenPipeError:
+        # Reader went away (e.g. | head), not an error
+        import os
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+    except OSError as ex:
+        print(f'dt-ansi-strip: {ex}', file=sys.stderr)
+        return 1
+    finally:
+        if args.output:
+            dst.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,339 @@
+"""
+ANSI escape sequence aware string operations.
+
+Lengths, padding, truncation, wrapping and slicing are measured in
+visible characters, escape sequences (colors, styles, cursor controls)
+are zero width.  Styles are preserved: truncated or sliced text is closed
+with a reset, and wrapped lines re-open the styles active at the break.
+
+All operations share one precompiled tokenizer and return immediately
+(plain str operations) when the text contains no ESC character.
+
+Widths are counted in characters, East Asian wide characters and emoji
+are counted as one column.
+
+Example::
+
+    from dt_tools.console.ansi_text import AnsiText
+    from dt_tools.console.console_helper import ColorFG, ConsoleHelper
+
+    text = ConsoleHelper.cwrap('Disk usage 93%', ColorFG.RED)
+    AnsiText.visible_length(text)   # 14
+    AnsiText.truncate(text, 10)     # 'Disk usag…' in red
+    AnsiText.wrap(long_colored_text, 40)
+
+"""
+import re
+from typing import Final, List, Tuple
+
+
+class _Ansi:
+    ESC: Final = '\x1b'
+    RESET: Final = '\x1b[0m'
+    TOKEN: Final = re.compile(r'(\x1B(?:\][^\x07\x1B]*(?:\x07|\x1B\\)|\[[0-?]*[ -/]*[@-~]|[@-Z\\-_]))')
+    """OSC (title), CSI (colors, cursor) and two character escape sequences, captured for split()."""
+    WORD: Final = re.compile(r'\S+|\s+')
+
+
+class AnsiText():
+    """ANSI escape sequence aware string operations (see module documentation)."""
+
+    @classmethod
+    def has_escapes(cls, text: str) -> bool:
+        """True if text contains an ESC character."""
+        return _Ansi.ESC in text
+
+    @classmethod
+    def strip(cls, text: str) -> str:
+        """
+        Remove escape sequences.
+
+        Arguments:
+            text: Input string.
+
+        Returns:
+            text without escape sequences.
+        """
+        if _Ansi.ESC not in text:
+            return text
+        return _Ansi.TOKEN.sub('', text)
+
+    @classmethod
+    def visible_length(cls, text: str) -> int:
+        """
+        Number of visible characters in text.
+
+        Arguments:
+            text: Input string.
+
+        Returns:
+            Length, excluding escape sequences.
+        """
+        if _Ansi.ESC not in text:
+            return len(text)
+        return len(_Ansi.TOKEN.sub('', text))
+
+    @classmethod
+    def tokens(cls, text: str) -> List[Tuple[bool, str]]:
+        """
+        Split text into escape sequences and text.
+
+        Arguments:
+            text: Input string.
+
+        Returns:
+            List of (is_escape, token) tuples, in order.
+        """
+        if _Ansi.ESC not in text:
+            return [(False, text)] if text else []
+        return [(idx % 2 == 1, token) for idx, token in enumerate(_Ansi.TOKEN.split(text)) if token]
+
+    @classmethod
+    def slice(cls, text: str, start: int, end: int = None) -> str:
+        """
+        Visible columns start..end of text, like text[start:end] on the visible characters.
+
+        Escape sequences before and inside the slice are kept, so the slice
+        has the styles in effect at start.  A reset is appended if the slice
+        cut styled text short.
+
+        Arguments:
+            text: Input string.
+            start: First visible column (0 based).
+
+        Keyword Arguments:
+            end: Column after the last one, None for the end of text (default: {None}).
+
+        Returns:
+            Sliced string.
+        """
+        if _Ansi.ESC not in text:
+            return text[start:end]
+        if start < 0 or (end is not None and end < 0):
+            length = cls.visible_length(text)
+            start, end, _ = slice(start, end).indices(length)
+        parts = []
+        column = 0
+        escapes = False
+        cut = False
+        for idx, token in enumerate(_Ansi.TOKEN.split(text)):
+            if idx % 2:
+                parts.append(token)
+                escapes = True
+                continue
+            if not token:
+                continue
+            token_end = column + len(token)
+            if end is not None and column >= end:
+                cut = True
+                break
+            low = max(start - column, 0)
+            high = len(token) if end is None else min(end - column, len(token))
+            if low < high:
+                parts.append(token[low:high])
+            if end is not None and token_end > end:
+                cut = True
+                break
+            column = token_end
+        if cut and escapes:
+            parts.append(_Ansi.RESET)
+        return ''.join(parts)
+
+    @classmethod
+    def truncate(cls, text: str, width: int, ellipsis: str = '…') -> str:
+        """
+        Shorten text to width visible characters, ending with ellipsis if cut.
+
+        Arguments:
+            text: Input string.
+            width: Maximum visible length.
+
+        Keyword Arguments:
+            ellipsis: Marker appended when text is cut (default: {'…'}).
+
+        Returns:
+            text, or the truncated text.
+        """
+        if _Ansi.ESC not in text:
+            if len(text) <= width:
+                return text
+            keep = width - len(ellipsis)
+            return text[:keep] + ellipsis if keep > 0 else text[:width]
+        if cls.visible_length(text) <= width:
+            return text
+        keep = width - len(ellipsis)
+        if keep <= 0:
+            return cls.slice(text, 0, width)
+        sliced = cls.slice(text, 0, keep)
+        if sliced.endswith(_Ansi.RESET):
+            # Ellipsis keeps the style of the text it replaces
+            return f'{sliced[:-len(_Ansi.RESET)]}{ellipsis}{_Ansi.RESET}'
+        return f'{sliced}{ellipsis}'
+
+    @classmethod
+    def pad(cls, text: str, width: int, fill: str = ' ') -> str:
+        """
+        Left align text in width visible characters (pad right).
+
+        Arguments:
+            text: Input string.
+            width: Minimum visible length.
+
+        Keyword Arguments:
+            fill: Pad character (default: {' '}).
+
+        Returns:
+            Padded string, text if already width or longer.
+        """
+        if _Ansi.ESC not in text:
+            return text.ljust(width, fill)
+        return f'{text}{fill * (width - cls.visible_length(text))}'
+
+    @classmethod
+    def pad_left(cls, text: str, width: int, fill: str = ' ') -> str:
+        """
+        Right align text in width visible characters (pad left).
+
+        Arguments:
+            text: Input string.
+            width: Minimum visible length.
+
+        Keyword Arguments:
+            fill: Pad character (default: {' '}).
+
+        Returns:
+            Padded string, text if already width or longer.
+        """
+        if _Ansi.ESC not in text:
+            return text.rjust(width, fill)
+        return f'{fill * (width - cls.visible_length(text))}{text}'
+
+    @classmethod
+    def center(cls, text: str, width: int, fill: str = ' ') -> str:
+        """
+        Center text in width visible characters.
+
+        Arguments:
+            text: Input string.
+            width: Minimum visible length.
+
+        Keyword Arguments:
+            fill: Pad character (default: {' '}).
+
+        Returns:
+            Padded string, text if already width or longer.
+        """
+        if _Ansi.ESC not in text:
+            return text.center(width, fill)
+        space = width - cls.visible_length(text)
+        if space <= 0:
+            return text
+        left = space // 2
+        return f'{fill * left}{text}{fill * (space - left)}'
+
+    @classmethod
+    def fit(cls, text: str, width: int, ellipsis: str = '…') -> str:
+        """
+        Exactly width visible characters: truncate(), then pad().
+
+        Arguments:
+            text: Input string.
+            width: Visible length.
+
+        Keyword Arguments:
+            ellipsis: Marker appended when text is cut (default: {'…'}).
+
+        Returns:
+            Fitted string.
+        """
+        return cls.pad(cls.truncate(text, width, ellipsis), width)
+
+    @classmethod
+    def wrap(cls, text: str, width: int) -> List[str]:
+        """
+        Word wrap text to lines of at most width visible characters.
+
+        Newlines start a new line, words longer than width are split.  Styles
+        active at a line break are reset at the end of the line and re-applied
+        at the start of the next.
+
+        Arguments:
+            text: Input string.
+            width: Maximum visible line length (>= 1).
+
+        Returns:
+            List of lines.
+        """
+        if width < 1:
+            raise ValueError('wrap() width must be >= 1')
+        lines: List[str] = []
+        active: List[str] = []
+        """SGR sequences in effect."""
+        for paragraph in text.split('\n'):
+            line: List[str] = [''.join(active)] if active else []
+            length = 0
+            space = ''
+            for is_escape, token in cls.tokens(paragraph):
+                if is_escape:
+                    line.append(token)
+                    if token.endswith('m') and token.startswith('\x1b['):
+                        if token in ('\x1b[m', '\x1b[0m'):
+                            active = []
+                        else:
+                            active.append(token)
+                    continue
+                for word in _Ansi.WORD.findall(token):
+                    if word[0].isspace():
+                        space = word if length else ''
+                        continue
+                    if length + len(space) + len(word) <= width:
+                        line.append(space + word)
+                        length += len(space) + len(word)
+                        space = ''
+                        continue
+                    if length and len(word) <= width:
+                        lines.append(cls._close_line(line, active))
+                        line = [''.join(active)] if active else []
+                        line.append(word)
+                        length = len(word)
+                        space = ''
+                        continue
+                    # Word longer than a line, split it
+                    if length and length + len(space) < width:
+                        line.append(space)
+                        length += len(space)
+                    elif length:
+                        lines.append(cls._close_line(line, active))
+                        line = [''.join(active)] if active else []
+                        length = 0
+                    space = ''
+                    while word:
+                        room = width - length
+                        line.append(word[:room])
+                        length += len(word[:room])
+                        word = word[room:]
+                        if word:
+                            lines.append(cls._close_line(line, active))
+                            line = [''.join(active)] if active else []
+                            length = 0
+            lines.append(cls._close_line(line, active))
+        return lines
+
+    @staticmethod
+    def _close_line(line: List[str], active: List[str]) -> str:
+        text = ''.join(line)
+        return f'{text}{_Ansi.RESET}' if active else text
+
+
+if __name__ == "__main__":
+    from dt_tools.console.console_helper import ColorFG, ConsoleHelper, TextStyle
+
+    sample = f'The {ConsoleHelper.cwrap("quick brown", ColorFG.RED)} fox jumps over the ' \
+             f'{TextStyle.BOLD}{ColorFG.GREEN}lazy dog, supercalifragilisticexpialidocious{TextStyle.RESET} and runs away.'
+    ConsoleHelper.print(f'visible_length: {AnsiText.visible_length(sample)}  (len: {len(sample)})')
+    ConsoleHelper.print(f'truncate(20):   [{AnsiText.truncate(sample, 20)}]')
+    ConsoleHelper.print(f'slice(4, 15):   [{AnsiText.slice(sample, 4, 15)}]')
+    ConsoleHelper.print(f'center(30):     [{AnsiText.center(ConsoleHelper.cwrap("centered", ColorFG.YELLOW), 30)}]')
+    ConsoleHelper.print('wrap(18):')
+    for wrapped in AnsiText.wrap(sample, 18):
+        ConsoleHelper.print(f'  |{AnsiText.pad(wrapped, 18)}|')
@@ -21,26 +21,31 @@ Additionally, helper classes/namespaces provided:
 - **CursorShape**: Ansi codes for controlling cursor shape.
 
 """
+import collections
 import os
 import re
-import signal
 import sys
+import threading
 import time
 from enum import Enum
-from typing import Final, List, Tuple, Union
+from typing import Dict, Final, List, Tuple, Union
 
-from loguru import logger as LOGGER
+from dt_tools.console._lazy import LOGGER
 
-from dt_tools.misc.helpers import StringHelper
-from dt_tools.os.os_helper import OSHelper
+_IS_WINDOWS: Final = sys.platform == 'win32'
 
-if OSHelper.is_windows():
+if _IS_WINDOWS:
     import msvcrt
     from ctypes import byref, windll, wintypes  # noqa: F401
 else:
     import termios
     import tty
 
+from dt_tools.console.ansi_text import AnsiText
+from dt_tools.console.input_source import InputSource, TerminalInputSource
+from dt_tools.console.render_hooks import RenderHooks
+from dt_tools.console.response_index import ResponseIndex
+
 # TODO:
 #   update _output_to_terminal to allow for printing to stderr OR stdout (default)
 
@@ -148,6 +153,86 @@ class WindowControl:
 # https://www.lihaoyi.com/post/BuildyourownCommandLinewithANSIescapecodes.html
 # https://invisible-island.net/xterm/ctlseqs/ctlseqs.html
 
+
+class _OutputStats():
+    """
+    Terminal output counters, see :func:`~dt_tools.console.console_helper.ConsoleHelper.stats()`.
+
+    Only updated while enabled; ConsoleHelper checks a single class attribute
+    before calling in, so disabled counters cost one attribute test per write.
+    """
+    _ESCAPE: Final = re.compile(r'\x1b(?:\[([0-?]*)[ -/]*([@-~])|\]|[@-Z\\-_])')
+    _CSI_NAMES: Final = {
+        'A': 'cursor_up', 'B': 'cursor_down', 'C': 'cursor_right', 'D': 'cursor_left',
+        'H': 'cursor_move', 'f': 'cursor_move', 'J': 'erase_display', 'K': 'erase_line',
+        'S': 'scroll_up', 'T': 'scroll_down', 'm': 'sgr', 'r': 'scroll_region',
+        's': 'cursor_save', 'u': 'cursor_restore', 'n': 'dsr', 'q': 'cursor_shape',
+        'h': 'mode_set', 'l': 'mode_reset', 't': 'window',
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.bytes_written = 0
+            self.writes = 0
+            self.flushes = 0
+            self.escapes: Dict[str, int] = collections.Counter()
+            self.dsr_queries = 0
+            self.dsr_ns_total = 0
+            self.dsr_ns_max = 0
+            self.unicode_fallbacks = 0
+
+    def record_write(self, text: str, flush: bool = True):
+        size = len(text.encode('utf-8', errors='replace'))
+        escapes = self._escape_names(text) if '\x1b' in text else None
+        with self._lock:
+            self.writes += 1
+            self.flushes += flush
+            self.bytes_written += size
+            if escapes:
+                self.escapes.update(escapes)
+
+    def record_dsr(self, elapsed_ns: int):
+        with self._lock:
+            self.dsr_queries += 1
+            self.dsr_ns_total += elapsed_ns
+            self.dsr_ns_max = max(self.dsr_ns_max, elapsed_ns)
+
+    def record_unicode_fallback(self):
+        with self._lock:
+            self.unicode_fallbacks += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'bytes_written': self.bytes_written,
+                'writes': self.writes,
+                'flushes': self.flushes,
+                'escape_sequences': dict(self.escapes),
+                'dsr_queries': self.dsr_queries,
+                'dsr_latency_ms_total': self.dsr_ns_total / 1_000_000,
+                'dsr_latency_ms_avg': (self.dsr_ns_total / self.dsr_queries / 1_000_000) if self.dsr_queries else 0.0,
+                'dsr_latency_ms_max': self.dsr_ns_max / 1_000_000,
+                'unicode_fallbacks': self.unicode_fallbacks,
+            }
+
+    @classmethod
+    def _escape_names(cls, text: str) -> List[str]:
+        names = []
+        for match in cls._ESCAPE.finditer(text):
+            final = match.group(2)
+            if final is not None:
+                names.append(cls._CSI_NAMES.get(final, f'csi_{final}'))
+            elif match.group(0).endswith(']'):
+                names.append('osc')
+            else:
+                names.append('esc')
+        return names
+
+
 # ==========================================================================================================
 class ConsoleHelper():
     """
@@ -175,7 +260,85 @@ class ConsoleHelper():
         
     """
     LAST_CONSOLE_STR: str = None
-    
+    _stats: _OutputStats = None
+    """Output counters, None while disabled."""
+    _stats_data = _OutputStats()
+    _recorder = None
+    """Active SessionRecorder (see dt_tools.console.session_recorder), None if not recording."""
+    _output_target = None
+    """Replacement terminal (i.e. VirtualTerminal), None for the real console."""
+    _status_rows: int = 0
+    """Rows reserved by enable_status_bar(), 0 if disabled."""
+    _status_size: Tuple[int, int] = None
+    """Console size when the status bar scroll region was set."""
+    _size_cache: Tuple[int, int] = None
+    """Console size cached while watch_console_size() is active, None if stale."""
+    _size_generation: int = 0
+    """Incremented on each terminal resize notification."""
+    _size_watched: bool = False
+    _log_pane = None
+    """Active LogPane (see dt_tools.console.log_pane), None if not installed."""
+    _output_lock = threading.RLock()
+    """Serializes terminal writes, hold it to write a multi-part frame atomically."""
+
+    @classmethod
+    def set_output_target(cls, target) -> object:
+        """
+        Send console output to target instead of the terminal.
+
+        The target provides write(text), flush(), get_size() -> (rows, columns)
+        and cursor_position() -> (row, column), see
+        :class:`~dt_tools.console.virtual_terminal.VirtualTerminal`.
+
+        Arguments:
+            target: Output target, None to restore the terminal.
+
+        Returns:
+            The previous output target.
+        """
+        previous = cls._output_target
+        cls._output_target = target
+        return previous
+
+    @classmethod
+    def get_output_target(cls) -> object:
+        """Current output target, None for the terminal."""
+        return cls._output_target
+
+    @classmethod
+    def enable_stats(cls, enabled: bool = True):
+        """
+        Turn output instrumentation counters on or off.
+
+        Counters are kept while disabled, and continue when re-enabled.
+
+        Keyword Arguments:
+            enabled: Collect counters (default: {True}).
+        """
+        cls._stats = cls._stats_data if enabled else None
+
+    @classmethod
+    def stats(cls) -> dict:
+        """
+        Terminal output counters (see enable_stats()).
+
+        Returns:
+            Dictionary of:
+
+            - bytes_written: UTF-8 bytes written (text + escape sequences).
+            - writes, flushes: Number of write and flush calls.
+            - escape_sequences: Count by type (i.e. sgr, cursor_move, erase_line, dsr, osc).
+            - dsr_queries: Cursor position queries (terminal round-trips).
+            - dsr_latency_ms_total/avg/max: Cursor position query latency.
+            - unicode_fallbacks: Writes re-routed to stderr on UnicodeEncodeError.
+        """
+        return cls._stats_data.snapshot()
+
+    @classmethod
+    def reset_stats(cls):
+        """Zero the output counters."""
+        cls._stats_data.reset()
+
     @classmethod
     def cursor_set_attribute(cls, attr: Union[_CursorAttribute, str]):
         token = attr.value if isinstance(attr, _CursorAttribute) else attr
@@ -194,6 +357,12 @@ class ConsoleHelper():
         Returns:
             Size as (rows, columns).
         """
+        if cls._output_target is not None:
+            return cls._output_target.get_size()
+        cached = cls._size_cache
+        if cached is not None:
+            return cached
+        generation = cls._size_generation
         try:
             size = os.get_terminal_size()
             rows = int(size.lines)
@@ -201,10 +370,51 @@ class ConsoleHelper():
         except OSError:
             rows = 0
             columns = 0
+        if cls._size_watched and generation == cls._size_generation:
+            # Not cached if a resize arrived during the query
+            cls._size_cache = (rows, columns)
         return (rows, columns)
 
+    @classmethod
+    def watch_console_size(cls) -> bool:
+        """
+        Cache the get_console_size() result until the terminal is resized.
+
+        The cache is invalidated by the SIGWINCH signal, so the handler can
+        only be installed from the main thread, and not on Windows (where
+        get_console_size() keeps querying the console on each call).  A
+        previously installed SIGWINCH handler is still called.
+
+        Returns:
+            True if the size is cached, False if resizes can't be watched.
+        """
+        if cls._size_watched:
+            return True
+        if _IS_WINDOWS or threading.current_thread() is not threading.main_thread():
+            return False
+        import signal
+        previous = signal.getsignal(signal.SIGWINCH)
+
+        def on_resize(signum, frame):
+            cls._size_generation += 1
+            cls._size_cache = None
+            if callable(previous):
+                previous(signum, frame)
+
+        signal.signal(signal.SIGWINCH, on_resize)
+        cls._size_watched = True
+        LOGGER.trace('Console size watch installed (SIGWINCH)')
+        return True
+
+    @classmethod
+    def console_size_generation(cls) -> int:
+        """Number of terminal resizes seen since watch_console_size()."""
+        return cls._size_generation
+
     @classmethod
     def valid_console(cls) -> bool:
+        if cls._output_target is not None:
+            return True
         try:
             _ = os.get_terminal_size()
             return True
@@ -256,8 +466,7 @@ class ConsoleHelper():
             title: String to be displayed on the title bar.
         """
         title_cmd = WindowControl.WINDOW_TITLE.replace("%title%", title)
-        print(title_cmd)
-        cls._output_to_terminal(title_cmd)
+        cls._output_to_terminal(title_cmd, eol='\n')
 
     @classmethod
     def cursor_current_position(cls) -> Tuple[int, int]:
@@ -267,10 +476,18 @@ class ConsoleHelper():
         Returns:
             Cusor location: (row, col).
         """
-        if OSHelper.is_windows():
-            return cls._get_windows_cursor_position()
-        
-        return cls._get_linux_cursor_position()
+        if RenderHooks._hooks:
+            RenderHooks.count_bytes('\x1b[6n')
+        stats = cls._stats
+        if stats is None:
+            return cls._query_cursor_position()
+
+        start = time.perf_counter_ns()
+        try:
+            return cls._query_cursor_position()
+        finally:
+            stats.record_dsr(time.perf_counter_ns() - start)
+            stats.record_write('\x1b[6n')
             
 
     @classmethod
@@ -330,8 +547,8 @@ class ConsoleHelper():
             cls.cursor_up(abs(row_offset))
         elif row_offset > 0:
             cls.cursor_down(row_offset)
-        cls._output_to_terminal(_CursorClear.LINE)
-        cls.cursor_move(-1, 1)
+        # Carriage return positions to column 1 without querying the terminal for the current row
+        cls._output_to_terminal(f'{_CursorClear.LINE}\r')
 
     @classmethod
     def clear_to_EOL(cls):
@@ -418,11 +635,12 @@ class ConsoleHelper():
             True if successful, False if location not valid.
         """
 
-        cur_row, cur_col = cls.cursor_current_position()
-        if  row <= 0:
-            row = int(cur_row)
-        if column <= 0:
-            column = int(cur_col)
+        if row <= 0 or column <= 0:
+            cur_row, cur_col = cls.cursor_current_position()
+            if  row <= 0:
+                row = int(cur_row)
+            if column <= 0:
+                column = int(cur_col)
         max_rows, max_columns = cls.get_console_size()
         if row <= 0 or column <= 0:
             LOGGER.debug('cursor_move - row/column must be > 0')
@@ -488,36 +706,109 @@ class ConsoleHelper():
             eol: EndOfLine character (default: {'\\n'}).
 
         """
-        print(text, end=eol, flush=True)
+        cls._output_to_terminal(text, eol=eol)
         if wait > 0:
             time.sleep(wait)
 
     @classmethod
-    def display_status(cls, text, wait: int = 0, status_eyecatcher: bool = True):
+    def enable_status_bar(cls, rows: int = 1):
+        """
+        Reserve the bottom row(s) of the screen for display_status().
+
+        A scroll region (see set_console_viewport()) keeps normal output
+        scrolling above the status rows, so display_status() can update the
+        status with a single write, with no cursor position queries.
+
+        Keyword Arguments:
+            rows: Number of status rows (default: {1}).
+
+        Raises:
+            ValueError: Invalid number of rows for the console size.
+        """
+        max_row, _ = cls.get_console_size()
+        if rows < 1 or rows >= max_row:
+            raise ValueError(f'enable_status_bar(): Invalid rows: {rows}')
+        cls._status_rows = rows
+        # Scroll existing output up (if needed) so the cursor is not left in the status rows
+        cls._output_to_terminal('\n' * rows + f'{_ConsoleControl.ESC}[{rows}A')
+        cls._set_status_region()
+
+    @classmethod
+    def disable_status_bar(cls):
+        """Release the status rows, the whole screen scrolls again."""
+        if cls._status_rows == 0:
+            return
+        max_row, _ = cls.get_console_size()
+        first_row = max_row - cls._status_rows + 1
+        cls._status_rows = 0
+        cls._status_size = None
+        clear_rows = ''.join(f'{_ConsoleControl.ESC}[{row};1H{_CursorClear.LINE}' for row in range(first_row, max_row + 1))
+        cls._output_to_terminal(f'{_ConsoleControl.ESC}7{_ConsoleControl.ESC}[r{clear_rows}{_ConsoleControl.ESC}8')
+
+    @classmethod
+    def status_bar_enabled(cls) -> bool:
+        """True if enable_status_bar() is active."""
+        return cls._status_rows > 0
+
+    @classmethod
+    def _set_status_region(cls):
+        cls._status_size = cls.get_console_size()
+        max_row, _ = cls._status_size
+        # DECSTBM homes the cursor, so save/restore around it
+        cls._output_to_terminal(f'{_ConsoleControl.ESC}7{_ConsoleControl.ESC}[1;{max_row - cls._status_rows}r{_ConsoleControl.ESC}8')
+
+    @classmethod
+    def display_status(cls, text, wait: int = 0, status_eyecatcher: bool = True, row: int = 1):
         """
         Display status message on last row of screen.
 
+        When the status bar is enabled (see enable_status_bar()), the update
+        is a single write (DEC save cursor, move, text, restore cursor).
+        Otherwise the cursor position is queried, then restored.
+
         Arguments:
             text: Status message to be displayed.
 
         Keyword Arguments:
             wait: Number of seconds to wait/pause (default: {0}).
+            status_eyecatcher: Display status in reverse colors (default: {True}).
+            row: Status bar row, 1 is the first reserved row (default: {1}).
         """
-        max_row, max_col = cls.get_console_size()
-    
-        save_row, save_col = cls.cursor_current_position()
+        span = RenderHooks.begin('ConsoleHelper.display_status')
+        try:
+            if cls._status_rows > 0:
+                cls._display_status_bar(text, status_eyecatcher, row)
+                return
+            max_row, max_col = cls.get_console_size()
+        
+            save_row, save_col = cls.cursor_current_position()
+            if status_eyecatcher:
+                eyecatcher_style = f'{ColorBG.GREY}{ColorFG.WHITE2}'
+                # inverse_token = f'{eyecatcher_style}{TextStyle.INVERSE}'
+                text = f'{eyecatcher_style}{text.replace(TextStyle.RESET, f"{TextStyle.RESET}{eyecatcher_style}")}'
+                # cls.print(text, as_bytes=True)
+                
+            cls.print_at(max_row, 1, f'{text}', eol='')     
+            cls.clear_to_EOL()
+            cls.print_at(1, 1, TextStyle.RESET)   
+            cls.cursor_move(save_row, save_col)
+        finally:
+            RenderHooks.end(span)
+            if wait > 0:
+                time.sleep(wait)
+
+    @classmethod
+    def _display_status_bar(cls, text: str, status_eyecatcher: bool, row: int):
+        if cls.get_console_size() != cls._status_size:
+            # Terminal resized, scroll region must follow the new last row
+            cls._set_status_region()
+        max_row, _ = cls._status_size
+        status_row = max_row - cls._status_rows + min(max(row, 1), cls._status_rows)
         if status_eyecatcher:
             eyecatcher_style = f'{ColorBG.GREY}{ColorFG.WHITE2}'
-            # inverse_token = f'{eyecatcher_style}{TextStyle.INVERSE}'
             text = f'{eyecatcher_style}{text.replace(TextStyle.RESET, f"{TextStyle.RESET}{eyecatcher_style}")}'
-            # cls.print(text, as_bytes=True)
-            
-        cls.print_at(max_row, 1, f'{text}', eol='')     
-        cls.clear_to_EOL()
-        cls.print_at(1, 1, TextStyle.RESET)   
-        cls.cursor_move(save_row, save_col)
-        if wait > 0:
-            time.sleep(wait)
+        esc = _ConsoleControl.ESC
+        cls._output_to_terminal(f'{esc}7{esc}[{status_row};1H{text}{_CursorClear.EOL}{TextStyle.RESET}{esc}8')
     
     @classmethod
     def print_line_separator(cls, text: str = '', length: int = -1):
@@ -529,7 +820,7 @@ class ConsoleHelper():
             length: Lenght of the separator line  (default: {-1}).
             if < 0, use console width.
         """
-        print(cls.sprint_line_separator(text, length))
+        cls._output_to_terminal(cls.sprint_line_separator(text, length), eol='\n')
 
     @classmethod
     def sprint_line_separator(cls, text: str = '', length: int = -1) -> str:
@@ -548,7 +839,7 @@ class ConsoleHelper():
             row, col = cls.cursor_current_position()
             max_rows, max_cols = cls.get_console_size()
             length = max_cols - col
-        fill_len = length - len(cls.remove_nonprintable_characters(text))
+        fill_len = length - AnsiText.visible_length(text)
         if TextStyle.RESET in text:
             color_code = cls.color_code(style=TextStyle.UNDERLINE, fg=ColorFG.DEFAULT, bg=ColorBG.DEFAULT)
             text = text.replace(TextStyle.RESET, f'{TextStyle.RESET}{color_code}')
@@ -559,17 +850,18 @@ class ConsoleHelper():
     @classmethod
     def remove_nonprintable_characters(cls, text: str) -> str:
         """
-        Return the length of strings printable characters
+        Return text with ANSI escape sequences removed.
+
+        See :class:`~dt_tools.console.ansi_text.AnsiText` for other escape
+        sequence aware string operations.
 
         Args:
             text (str): Input string
 
         Returns:
-            int: Number of printable characters
+            str: text without escape sequences
         """
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        result = ansi_escape.sub('', text)    
-        return result
+        return AnsiText.strip(text)
     
     @classmethod
     def debug_display_cursor_location(cls, msg:str = ""):
@@ -593,14 +885,12 @@ class ConsoleHelper():
             **fg**: req -  The FG color OR color string (see ColorFG)
             **bg**: opt - The BG color (see ColorBG)
             **style**: opt - The style to be applied (see TextStyleControls)
-            **length**" opt - Length of string. Pad right with spaces, -1 = len(text).
+            **length**" opt - Visible length of string (escape sequences not counted). Pad right with spaces, -1 = no padding.
 
         Returns:
             Updated string.
         """
         w_text = str(text)
-        if length < 0:
-            length = len(w_text)
 
         color_code = ''
         if fg and bg and style:
@@ -615,7 +905,7 @@ class ConsoleHelper():
                    style = ''.join(style) 
                 color_code += style
 
-        padded_str = StringHelper.pad_r(w_text, length)
+        padded_str = AnsiText.pad(w_text, length) if length >= 0 else w_text
         ret_str =  f'{color_code}{padded_str}{_ConsoleControl.CEND}'
         # cls._output_to_terminal(ret_str, eol='\n', as_bytes=True)
         return ret_str
@@ -651,15 +941,29 @@ class ConsoleHelper():
     def _output_to_terminal(cls, token: str, eol:str='', as_bytes: bool = False, to_stderr: bool = False):
     
         output_str = bytes(token,'utf-8') if as_bytes else token
-        if to_stderr:
-            print(output_str, end=eol, flush=True, file=sys.stderr)
-        else:
-            try:
-                print(output_str, end=eol, flush=True)
-            except UnicodeEncodeError:
-                # stderr will escape non-printable characters
+        with cls._output_lock:
+            if cls._output_target is not None:
+                cls._output_target.write(f'{output_str}{eol}')
+                cls._output_target.flush()
+            elif to_stderr:
                 print(output_str, end=eol, flush=True, file=sys.stderr)
-        cls.LAST_CONSOLE_STR = token
+            else:
+                try:
+                    print(output_str, end=eol, flush=True)
+                except UnicodeEncodeError:
+                    # stderr will escape non-printable characters
+                    print(output_str, end=eol, flush=True, file=sys.stderr)
+                    if cls._stats is not None:
+                        cls._stats.record_unicode_fallback()
+            if cls._stats is not None:
+                cls._stats.record_write(f'{output_str}{eol}')
+            if RenderHooks._hooks:
+                RenderHooks.count_bytes(f'{output_str}{eol}')
+            if cls._recorder is not None:
+                cls._recorder.record(f'{output_str}{eol}')
+            if cls._log_pane is not None:
+                cls._log_pane._observe(f'{output_str}{eol}')
+            cls.LAST_CONSOLE_STR = token
 
     @classmethod
     def _display_color_palette(cls):
@@ -672,8 +976,14 @@ class ConsoleHelper():
                 for bg in range(40, 48):
                     format = ';'.join([str(style), str(fg), str(bg)])
                     token += '\x1b[%sm %s \x1b[0m' % (format, format)
-                print(token)
-            print('\n')
+                cls._output_to_terminal(token, eol='\n')
+            cls._output_to_terminal('\n', eol='\n')
+
+    @classmethod
+    def _query_cursor_position(cls) -> Tuple[int, int]:
+        if cls._output_target is not None:
+            return cls._output_target.cursor_position()
+        return cls._get_windows_cursor_position() if _IS_WINDOWS else cls._get_linux_cursor_position()
 
     @classmethod
     def _get_windows_cursor_position(cls) -> Tuple[int, int]:
@@ -748,9 +1058,35 @@ class ConsoleInputHelper():
     YES_NO_RESPONSE: Final[List[str]] = ['Y','y', 'N', 'n']
     """Yes/No valid_argument list constant"""
 
+    _MAX_CANDIDATES: Final = 20
+    _input_source: InputSource = TerminalInputSource()
+
+    @classmethod
+    def set_input_source(cls, source: InputSource) -> InputSource:
+        """
+        Set the source of prompt responses.
+
+        Install a :class:`~dt_tools.console.input_source.ScriptedInputSource` to 
+        run prompts unattended, or TerminalInputSource() to restore keyboard input.
+
+        Arguments:
+            source: New input source.
+
+        Returns:
+            The previous input source.
+        """
+        previous = cls._input_source
+        cls._input_source = source
+        return previous
+
     @classmethod
-    def get_input_with_timeout(cls, prompt: str, valid_responses: list = [],  
-                               default: str = None, timeout_secs: int = -1, 
+    def get_input_source(cls) -> InputSource:
+        """Current source of prompt responses."""
+        return cls._input_source
+
+    @classmethod
+    def get_input_with_timeout(cls, prompt: str, valid_responses: Union[list, ResponseIndex] = [],  
+                               default: str = None, timeout_secs: float = -1, 
                                parms_ok: bool = False) -> Union[str, Tuple[str, list]]:
         """
         Display a prompt for use input.  
@@ -764,8 +1100,13 @@ class ConsoleInputHelper():
             **valid_responses**: A list of valid responses (default: {[]}).
               User input must match one of the values. 
               If list is empty, all input will be accepted.
+              For large lists, pass a :class:`~dt_tools.console.response_index.ResponseIndex`
+              (built once) to enable case-insensitive and unique prefix matching.
+              Tab completes partial input, candidates are listed on bad input.
             **default**: Default value to be return on timeout (default: {None}).
             **timeout_secs**: Number of seconds to wait for response (default: {-1}).  
+              Fractions of a second are allowed.  The timeout covers the whole prompt, input
+              not completed with Enter when it expires is discarded and default is returned.
               If <0, no timeout, wait until user presses enter.
             **parms_ok**: Allow extra parameter input (default: {False}).
               If True, allows user to provide additional text after the valid response.
@@ -789,36 +1130,76 @@ class ConsoleInputHelper():
         chk_response = ''
         response_params: List = None
         valid_input = False
+        index = ResponseIndex.of(valid_responses)
+        completer = cls._completer(index)
         while not valid_input:
-            if timeout_secs < 0:
-                response = input(prompt)
-            else:
-                try:
-                    if OSHelper.is_windows():
-                        response = cls._input_with_timeout_win(prompt, timeout_secs, default)
-                    else:
-                        response = cls._input_with_timeout_nix(prompt, timeout_secs, default)
-                except TimeoutError:
-                    response = default
-                    valid_input = True
+            try:
+                response = cls._input_source.read_line(prompt, timeout_secs=timeout_secs, default=default, completer=completer)
+            except TimeoutError:
+                response = default
+                valid_input = True
             
-            if not parms_ok:
-                chk_response = response
-                response_params = None
-            else:
-                token = response.split()
-                if len(token) > 0:
-                    chk_response = token[0]
-                    response_params = token[1:]
-                else:
-                    chk_response = response
-                    response_params = None
-
-            if not valid_responses:
-                LOGGER.trace('no valid responses to check')
+            chk_response, response_params = cls._split_response(response, parms_ok)
+            matched, chk_response = cls._validate_response(chk_response, index, show_candidates=not valid_input)
+            valid_input = valid_input or matched
+
+        if parms_ok:
+            return chk_response, response_params
+        
+        return chk_response
+
+    @classmethod
+    async def get_input_with_timeout_async(cls, prompt: str, valid_responses: Union[list, ResponseIndex] = [],  
+                                           default: str = None, timeout_secs: float = -1, 
+                                           parms_ok: bool = False) -> Union[str, Tuple[str, list]]:
+        """
+        Display a prompt for user input without blocking the asyncio event loop.
+
+        Same behavior as :func:`~dt_tools.console.console_helper.ConsoleInputHelper.get_input_with_timeout()`,
+        but keystrokes are collected by an event loop reader so other tasks keep
+        running while waiting.  The timeout applies to the whole prompt.
+
+        Arguments:
+            **prompt**: Text to be displayed as prompt.
+            **valid_responses**: A list of valid responses (default: {[]}).
+            **default**: Default value to be return on timeout (default: {None}).
+            **timeout_secs**: Number of seconds to wait for response (default: {-1}).  
+              If <0, no timeout, wait until user presses enter.
+            **parms_ok**: Allow extra parameter input (default: {False}).
+
+        Returns:
+            User input or default value (if timeout).
+
+        Example::
+
+            import asyncio
+            from dt_tools.console.console_helper import ConsoleInputHelper
+
+            async def main():
+                resp = await ConsoleInputHelper.get_input_with_timeout_async('Continue (y/n) > ', 
+                    valid_responses=ConsoleInputHelper.YES_NO_RESPONSE, 
+                    default='y', 
+                    timeout_secs=5)
+                print(f'You selected: {resp}')
+
+            asyncio.run(main())
+
+        """
+        chk_response = ''
+        response_params: List = None
+        valid_input = False
+        index = ResponseIndex.of(valid_responses)
+        completer = cls._completer(index)
+        while not valid_input:
+            try:
+                response = await cls._input_source.read_line_async(prompt, timeout_secs=timeout_secs, default=default, completer=completer)
+            except TimeoutError:
+                response = default
                 valid_input = True
-            elif chk_response in valid_responses:
-                    valid_input = True
+
+            chk_response, response_params = cls._split_response(response, parms_ok)
+            matched, chk_response = cls._validate_response(chk_response, index, show_candidates=not valid_input)
+            valid_input = valid_input or matched
 
         if parms_ok:
             return chk_response, response_params
@@ -826,7 +1207,7 @@ class ConsoleInputHelper():
         return chk_response
 
     @classmethod
-    def wait_with_bypass(cls, secs: int):
+    def wait_with_bypass(cls, secs: float) -> bool:
         """
         Pause execution for specified number of seconds.
         
@@ -834,48 +1215,51 @@ class ConsoleInputHelper():
 
         Arguments:
             secs: Number of seconds to wait.
+
+        Returns:
+            True if the wait timed out, False if the user pressed enter.
         """
-        cls.get_input_with_timeout("", timeout_secs=secs)
+        try:
+            cls._input_source.read_line("", timeout_secs=secs, echo=False)
+        except TimeoutError:
+            return True
+        return False
 
     @classmethod
-    def _input_with_timeout_nix(cls,prompt: str, timeout_secs: int, default: str) -> str:
-        # set signal handler for *nix systems
-        LOGGER.trace("_input_with_timeout_nix()")
-        signal.signal(signal.SIGALRM, ConsoleInputHelper._alarm_handler)
-        signal.alarm(timeout_secs) # produce SIGALRM in `timeout` seconds
+    def _split_response(cls, response: str, parms_ok: bool) -> Tuple[str, list]:
+        if not parms_ok:
+            return response, None
+        
+        token = response.split() if response else []
+        if len(token) > 0:
+            return token[0], token[1:]
+        return response, None
 
-        response = default
-        try:
-            response = input(prompt)
-        finally:
-            signal.alarm(0) # cancel alarm
-            return response
-
-    @classmethod
-    def _input_with_timeout_win(cls, prompt: str, timeout_secs: int,  default: str= None) -> str:
-        LOGGER.trace("_input_with_timeout_win()")
-        sys.stdout.write(prompt)
-        sys.stdout.flush()
-        timer = time.monotonic
-        endtime = timer() + timeout_secs
-        result = []
-        while timer() < endtime:
-            if msvcrt.kbhit():
-                result.append(msvcrt.getwche()) #XXX can it block on multibyte characters?
-                endtime = timer() + timeout_secs  # Reset timer each time a key is pressed.
-                if result[-1] == '\r':   #XXX check what Windows returns here
-                    print('')
-                    return ''.join(result[:-1])
-            time.sleep(0.04) # just to yield to other processes/threads
-        if result:
-            print('')
-            return ''.join(result)
-        elif default:
-            print(default)
-        raise TimeoutError('Time Expired.')
-
-    def _alarm_handler(signum, frame):
-        raise TimeoutError('time expired.')
+    @classmethod
+    def _validate_response(cls, chk_response: str, index: ResponseIndex, show_candidates: bool = True) -> Tuple[bool, str]:
+        """Return (valid, response), response is the matching entry from the index."""
+        if not index:
+            LOGGER.trace('no valid responses to check')
+            return True, chk_response
+        
+        matched = index.match(chk_response)
+        if matched is not None:
+            return True, matched
+
+        if show_candidates and chk_response:
+            candidates = index.candidates(chk_response, limit=cls._MAX_CANDIDATES+1)
+            if candidates:
+                listing = ', '.join(candidates[:cls._MAX_CANDIDATES])
+                if len(candidates) > cls._MAX_CANDIDATES:
+                    listing += f', ... ({index.count(chk_response)} matches)'
+                ConsoleHelper._output_to_terminal(f'  Did you mean: {listing}', eol='\n')
+        return False, chk_response
+
+    @classmethod
+    def _completer(cls, index: ResponseIndex):
+        if not index:
+            return None
+        return lambda text: (index.complete(text), index.candidates(text, limit=cls._MAX_CANDIDATES+1))
 
 
 
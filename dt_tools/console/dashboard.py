@@ -0,0 +1,558 @@
+"""
+Live console dashboards built from named regions.
+
+The screen is split into rectangular regions: rows and columns, nested to
+any depth, sized by a fixed size or a share (ratio) of the space left.
+Leaf regions hold a widget (text, progress, spinner, table, status).
+
+Updating a widget marks its region dirty.  A render thread repaints only
+the dirty regions (and within them, only the lines that changed) in a
+single write per frame, at a capped frame rate, so any number of updates
+between two frames costs one repaint.  Terminal resizes are picked up
+through the ConsoleHelper geometry cache (watch_console_size()) and
+trigger a relayout.
+
+Example::
+
+    from dt_tools.console.dashboard import Dashboard, ProgressWidget, Region, StatusWidget, TextWidget
+
+    dash = Dashboard(Region.rows(
+        Region('title', TextWidget('Nightly load'), size=1),
+        Region.columns(
+            Region('progress', ProgressWidget('Rows', max_increments=total)),
+            Region('log', TextWidget(), ratio=2),
+        ),
+        Region('status', StatusWidget(), size=1),
+    ), fps=10)
+
+    with dash:
+        for idx, row in enumerate(rows, 1):
+            load(row)
+            dash['progress'].widget.update(idx)
+        dash['status'].widget.set_text('Done')
+
+"""
+import collections
+import threading
+import time
+from typing import Any, Deque, Dict, Final, Iterable, List, Optional, Sequence, Tuple
+
+from dt_tools.console._lazy import LOGGER
+
+from dt_tools.console.ansi_text import AnsiText
+from dt_tools.console.console_helper import ColorBG, ColorFG, ConsoleHelper, TextStyle
+from dt_tools.console.render_hooks import RenderHooks
+from dt_tools.console.spinner import SpinnerType
+
+
+class Split:
+    """Region split direction."""
+    ROWS: Final = 'rows'
+    """Children stacked top to bottom."""
+    COLUMNS: Final = 'columns'
+    """Children side by side, left to right."""
+
+
+class _DashControl:
+    ESC: Final = '\x1b'
+    ALT_SCREEN_ON: Final = '\x1b[?1049h'
+    ALT_SCREEN_OFF: Final = '\x1b[?1049l'
+    CLEAR_SCREEN: Final = '\x1b[2J'
+    IDLE_SECS: Final = 0.5
+    """Longest wait between frames, bounds the resize detection delay."""
+
+
+def _fit(text: str, width: int) -> str:
+    """text padded/truncated to width visible columns."""
+    if _DashControl.ESC not in text:
+        return text[:width].ljust(width)
+    fitted = AnsiText.truncate(text, width, ellipsis='')
+    # Reset, so styles don't bleed into the padding or the next region
+    return f'{fitted}{TextStyle.RESET}{" " * (width - AnsiText.visible_length(fitted))}'
+
+
+# == Widgets ==========================================================================================
+class Widget():
+    """
+    Dashboard widget base class.
+
+    Subclasses implement render() and call invalidate() when their content
+    changes.  Widgets with animated_secs > 0 are re-rendered at that interval.
+    """
+    animated_secs: float = 0.0
+
+    def __init__(self):
+        self._region: 'Region' = None
+
+    def invalidate(self):
+        """Mark the widget's region for repaint."""
+        if self._region is not None:
+            self._region.invalidate()
+
+    def render(self, width: int, height: int) -> List[str]:
+        """
+        Widget content.
+
+        Arguments:
+            width: Region width.
+            height: Region height.
+
+        Returns:
+            Up to height lines, fitted to width by the dashboard.
+        """
+        raise NotImplementedError
+
+
+class TextWidget(Widget):
+    """
+    Static or updated text.
+
+    Keyword Arguments:
+        text: Initial text, may contain newlines (default: {''}).
+        style: Color/style code(s) for the text (default: {None}).
+        tail: Show the last lines when the text is taller than the region (default: {False}).
+    """
+    def __init__(self, text: str = '', style: str = None, tail: bool = False):
+        super().__init__()
+        self._lines = text.splitlines()
+        self._style = style
+        self._tail = tail
+
+    def set_text(self, text: str):
+        """Replace the text."""
+        self._lines = text.splitlines()
+        self.invalidate()
+
+    def render(self, width: int, height: int) -> List[str]:
+        lines = self._lines[-height:] if self._tail else self._lines[:height]
+        if self._style:
+            return [f'{self._style}{line[:width].ljust(width)}{TextStyle.RESET}' for line in lines]
+        return lines
+
+
+class LogWidget(Widget):
+    """
+    Scrolling list of the most recent lines.
+
+    Keyword Arguments:
+        max_lines: Lines kept (default: {500}).
+    """
+    def __init__(self, max_lines: int = 500):
+        super().__init__()
+        self._lines: Deque[str] = collections.deque(maxlen=max_lines)
+
+    def append(self, line: str):
+        """Add a line at the bottom."""
+        self._lines.append(line)
+        self.invalidate()
+
+    def render(self, width: int, height: int) -> List[str]:
+        count = len(self._lines)
+        return [self._lines[idx] for idx in range(max(count - height, 0), count)]
+
+
+class StatusWidget(TextWidget):
+    """
+    Status line, displayed in reverse colors like ConsoleHelper.display_status().
+
+    Keyword Arguments:
+        text: Initial status (default: {''}).
+    """
+    def __init__(self, text: str = ''):
+        super().__init__(text, style=f'{ColorBG.GREY}{ColorFG.WHITE2}')
+
+
+class ProgressWidget(Widget):
+    """
+    Progress bar sized to its region.
+
+    Arguments:
+        caption: Text before the bar.
+        max_increments: Increment value of 100%.
+
+    Keyword Arguments:
+        fill: Bar fill character (default: {'█'}).
+        show_pct: Display percent complete (default: {True}).
+    """
+    def __init__(self, caption: str, max_increments: int, fill: str = '█', show_pct: bool = True):
+        super().__init__()
+        self._caption = caption
+        self._max_increments = max(max_increments, 1)
+        self._fill = fill
+        self._show_pct = show_pct
+        self._current = 0
+        self._suffix = ''
+
+    def update(self, current_increment: int, suffix: str = ''):
+        """
+        Set progress.
+
+        Arguments:
+            current_increment: Increments completed.
+
+        Keyword Arguments:
+            suffix: Text after the bar (default: {''}).
+        """
+        self._current = min(max(current_increment, 0), self._max_increments)
+        self._suffix = suffix
+        self.invalidate()
+
+    def render(self, width: int, height: int) -> List[str]:
+        pct = f' {100 * self._current / self._max_increments:5.1f}%' if self._show_pct else ''
+        suffix = f' {self._suffix}' if self._suffix else ''
+        bar_len = width - len(self._caption) - len(pct) - len(suffix) - 3
+        if bar_len < 1:
+            return [f'{self._caption}{pct}']
+        filled = bar_len * self._current // self._max_increments
+        return [f'{self._caption} [{self._fill * filled}{"-" * (bar_len - filled)}]{pct}{suffix}']
+
+
+class SpinnerWidget(Widget):
+    """
+    Animated spinner.
+
+    Arguments:
+        caption: Text before the spinner.
+
+    Keyword Arguments:
+        spinner: Spinner pattern (default: {SpinnerType.NORMAL_SPINNER}).
+    """
+    def __init__(self, caption: str, spinner: SpinnerType = SpinnerType.NORMAL_SPINNER):
+        super().__init__()
+        self._caption = caption
+        self._chars: List[str] = spinner.value['char_list']
+        self.animated_secs = spinner.value['speed']
+        self._suffix = ''
+        self.running = True
+        """Animate the spinner, False shows the caption only."""
+
+    def caption_suffix(self, suffix: str):
+        """Text displayed after the spinner."""
+        self._suffix = suffix
+        self.invalidate()
+
+    def render(self, width: int, height: int) -> List[str]:
+        if not self.running:
+            return [f'{self._caption}  {self._suffix}']
+        frame = self._chars[int(time.monotonic() / self.animated_secs) % len(self._chars)]
+        return [f'{self._caption} {frame}  {self._suffix}']
+
+
+class TableWidget(Widget):
+    """
+    Table of the most recent rows (see dt_tools.console.table).
+
+    Arguments:
+        columns: Column definitions (TableColumn, or header names).
+
+    Keyword Arguments:
+        max_rows: Rows kept (default: {500}).
+        **table_args: Passed to StreamingTable (i.e. separator, header).
+    """
+    def __init__(self, columns: Sequence[Any], max_rows: int = 500, **table_args):
+        super().__init__()
+        from dt_tools.console.table import StreamingTable
+        self._table = StreamingTable(columns, **table_args)
+        self._rows: Deque[Sequence[Any]] = collections.deque(maxlen=max_rows)
+
+    def add_row(self, row: Sequence[Any]):
+        """Add a row at the bottom."""
+        self._rows.append(row)
+        self.invalidate()
+
+    def set_rows(self, rows: Iterable[Sequence[Any]]):
+        """Replace the rows."""
+        self._rows.clear()
+        self._rows.extend(rows)
+        self.invalidate()
+
+    def render(self, width: int, height: int) -> List[str]:
+        body = max(height - (2 if self._table._header else 0), 0)
+        count = len(self._rows)
+        rows = [self._rows[idx] for idx in range(max(count - body, 0), count)]
+        return list(self._table.lines(rows))[:height]
+
+
+# == Layout ===========================================================================================
+class Region():
+    """
+    Rectangular screen area, holding a widget or split into child regions.
+
+    Keyword Arguments:
+        name: Region name, for Dashboard lookup (default: {None}).
+        widget: Widget displayed in the region (default: {None}).
+        size: Fixed rows (in a ROWS split) or columns (in a COLUMNS split) (default: {None}).
+        ratio: Share of the space left after fixed sizes (default: {1}).
+        split: Direction of children (see Split) (default: {Split.ROWS}).
+        children: Child regions (default: {None}).
+    """
+    def __init__(self, name: str = None, widget: Widget = None, size: int = None, ratio: int = 1,
+                 split: str = Split.ROWS, children: Sequence['Region'] = None):
+        self.name = name
+        self.size = size
+        self.ratio = max(ratio, 0)
+        self.split = split
+        self.children: List['Region'] = list(children or [])
+        self.row = 0
+        self.col = 0
+        self.height = 0
+        self.width = 0
+        self.dirty = True
+        self.widget: Widget = None
+        self._dashboard: 'Dashboard' = None
+        self._painted: List[str] = []
+        """Lines on screen, only changed lines are repainted."""
+        self._next_frame = 0.0
+        if widget is not None:
+            self.set_widget(widget)
+
+    @classmethod
+    def rows(cls, *children: 'Region', name: str = None, size: int = None, ratio: int = 1) -> 'Region':
+        """Region with children stacked top to bottom."""
+        return cls(name, size=size, ratio=ratio, split=Split.ROWS, children=children)
+
+    @classmethod
+    def columns(cls, *children: 'Region', name: str = None, size: int = None, ratio: int = 1) -> 'Region':
+        """Region with children side by side."""
+        return cls(name, size=size, ratio=ratio, split=Split.COLUMNS, children=children)
+
+    def set_widget(self, widget: Optional[Widget]):
+        """Display widget in this region (replacing the current one)."""
+        if self.widget is not None:
+            self.widget._region = None
+        self.widget = widget
+        if widget is not None:
+            widget._region = self
+        self.invalidate()
+
+    def invalidate(self):
+        """Mark the region for repaint."""
+        self.dirty = True
+        if self._dashboard is not None:
+            self._dashboard._wake.set()
+
+    def walk(self) -> Iterable['Region']:
+        """This region and all descendants."""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def _layout(self, row: int, col: int, height: int, width: int) -> List['Region']:
+        # Returns the visible leaf regions
+        if (row, col, height, width) != (self.row, self.col, self.height, self.width):
+            self.row, self.col, self.height, self.width = row, col, height, width
+            self._painted = []
+            self.dirty = True
+        if not self.children:
+            return [self] if height > 0 and width > 0 else []
+
+        along_rows = self.split == Split.ROWS
+        space = height if along_rows else width
+        fixed = sum(child.size for child in self.children if child.size is not None)
+        flexible = max(space - fixed, 0)
+        total_ratio = sum(child.ratio for child in self.children if child.size is None)
+        leaves = []
+        offset = 0
+        used_ratio = 0
+        for child in self.children:
+            if child.size is not None:
+                extent = child.size
+            elif total_ratio > 0:
+                # Cumulative rounding, the ratio shares always add up to the flexible space
+                start = flexible * used_ratio // total_ratio
+                used_ratio += child.ratio
+                extent = flexible * used_ratio // total_ratio - start
+            else:
+                extent = 0
+            extent = max(min(extent, space - offset), 0)
+            if along_rows:
+                leaves.extend(child._layout(row + offset, col, extent, width))
+            else:
+                leaves.extend(child._layout(row, col + offset, height, extent))
+            offset += extent
+        return leaves
+
+
+class Dashboard():
+    """
+    Render a region layout in the console.
+
+    Arguments:
+        root: Top level region (the whole screen).
+
+    Keyword Arguments:
+        fps: Maximum frames per second (default: {10}).
+        alt_screen: Use the terminal alternate screen, restoring the original
+          screen content on stop() (default: {True}).
+    """
+    def __init__(self, root: Region, fps: float = 10.0, alt_screen: bool = True):
+        self.root = root
+        self._frame_secs = 1.0 / max(fps, 0.1)
+        self._alt_screen = alt_screen
+        self._regions: Dict[str, Region] = {}
+        for region in root.walk():
+            region._dashboard = self
+            if region.name:
+                self._regions[region.name] = region
+        self._leaves: List[Region] = []
+        self._size: Tuple[int, int] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+        self.frames = 0
+        """Frames written."""
+        self.regions_painted = 0
+        """Region repaints (over all frames)."""
+
+    def __getitem__(self, name: str) -> Region:
+        return self._regions[name]
+
+    def start(self) -> 'Dashboard':
+        """Take over the screen and start the render thread, returns self."""
+        ConsoleHelper.watch_console_size()
+        setup = _DashControl.ALT_SCREEN_ON if self._alt_screen else ''
+        ConsoleHelper._output_to_terminal(setup)
+        ConsoleHelper.cursor_off()
+        self._size = None
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._render_loop, name='dashboard', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Render the final frame, stop the render thread and release the screen."""
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.render()
+        rows = self._size[0] if self._size else 1
+        ConsoleHelper.cursor_on()
+        if self._alt_screen:
+            ConsoleHelper._output_to_terminal(_DashControl.ALT_SCREEN_OFF)
+        else:
+            ConsoleHelper._output_to_terminal(f'{_DashControl.ESC}[{rows};1H\n')
+
+    def invalidate(self):
+        """Repaint everything on the next frame."""
+        for region in self._leaves:
+            region._painted = []
+            region.dirty = True
+        self._wake.set()
+
+    def render(self) -> int:
+        """
+        Render one frame: relayout if the console was resized, repaint dirty regions.
+
+        Returns:
+            Number of regions repainted.
+        """
+        with self._lock:
+            span = RenderHooks.begin('Dashboard.render')
+            try:
+                return self._render()
+            finally:
+                RenderHooks.end(span)
+
+    def __enter__(self) -> 'Dashboard':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _render(self) -> int:
+        parts = []
+        size = ConsoleHelper.get_console_size()
+        if size != self._size:
+            self._size = size
+            self._leaves = self.root._layout(1, 1, size[0], size[1])
+            # Screen is cleared, regions that kept their place are repainted too
+            self.invalidate()
+            parts.append(_DashControl.CLEAR_SCREEN)
+            LOGGER.trace(f'Dashboard layout: {size}, {len(self._leaves)} regions')
+
+        now = time.monotonic()
+        painted = 0
+        esc = _DashControl.ESC
+        for region in self._leaves:
+            widget = region.widget
+            if widget is not None and widget.animated_secs > 0 and now >= region._next_frame:
+                region._next_frame = now + widget.animated_secs
+                region.dirty = True
+            if not region.dirty:
+                continue
+            # Cleared first, an update during render() marks it for the next frame
+            region.dirty = False
+            lines = widget.render(region.width, region.height) if widget is not None else []
+            previous = region._painted
+            screen = []
+            for idx in range(region.height):
+                line = _fit(lines[idx], region.width) if idx < len(lines) else ' ' * region.width
+                screen.append(line)
+                if idx >= len(previous) or previous[idx] != line:
+                    parts.append(f'{esc}[{region.row + idx};{region.col}H{line}')
+            region._painted = screen
+            painted += 1
+
+        if parts:
+            ConsoleHelper._output_to_terminal(''.join(parts))
+            self.frames += 1
+        self.regions_painted += painted
+        return painted
+
+    def _idle_secs(self) -> float:
+        now = time.monotonic()
+        wait = _DashControl.IDLE_SECS
+        for region in self._leaves:
+            if region.widget is not None and region.widget.animated_secs > 0:
+                wait = min(wait, region._next_frame - now)
+        return max(wait, 0.0)
+
+    def _render_loop(self):
+        while not self._stop.is_set():
+            frame_start = time.monotonic()
+            self._wake.clear()
+            try:
+                self.render()
+            except Exception as ex:
+                LOGGER.debug(f'Dashboard render failed: {repr(ex)}')
+            # Frame rate cap, then sleep until an update or animation is due
+            if self._stop.wait(max(self._frame_secs - (time.monotonic() - frame_start), 0)):
+                return
+            self._wake.wait(self._idle_secs())
+
+
+if __name__ == "__main__":
+    import random
+    from dt_tools.console.table import Align, TableColumn
+
+    progress = ProgressWidget('Hosts', max_increments=200)
+    spinner = SpinnerWidget('Working', SpinnerType.DOTS)
+    log = LogWidget()
+    table = TableWidget(['Host', TableColumn('Latency ms', align=Align.RIGHT, width=10), 'Status'])
+    status = StatusWidget('Starting...')
+
+    dash = Dashboard(Region.rows(
+        Region('title', TextWidget('dt-console dashboard demo', style=TextStyle.BOLD), size=1),
+        Region.columns(
+            Region.rows(Region('progress', progress, size=1), Region('spinner', spinner, size=1), Region('log', log)),
+            Region('table', table, ratio=2),
+        ),
+        Region('status', status, size=1),
+    ), fps=20)
+
+    with dash:
+        for idx in range(1, 201):
+            host = f'web{idx:03}.example.com'
+            latency = random.randint(1, 250)
+            table.add_row((host, latency, 'slow' if latency > 200 else 'ok'))
+            log.append(f'Checked {host}')
+            progress.update(idx)
+            spinner.caption_suffix(host)
+            status.set_text(f'Frames: {dash.frames}  Region repaints: {dash.regions_painted}  Updates: {idx * 5}')
+            time.sleep(.02)
+        spinner.running = False
+        status.set_text(f'Done.  Frames: {dash.frames}  Region repaints: {dash.regions_painted}')
+        time.sleep(1.5)
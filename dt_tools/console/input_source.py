@@ -0,0 +1,372 @@
+"""
+Input sources for ConsoleInputHelper prompts.
+
+ConsoleInputHelper reads all prompt responses through an InputSource.  By default
+this is the terminal, but a scripted source may be installed so interactive CLIs
+can run unattended (CI, load tests) with no terminal attached.
+
+Sources provided:
+
+    - **TerminalInputSource**: Keyboard input (default).
+    - **ScriptedInputSource**: Responses from a list, file or pipe, answered immediately.
+      Responses may optionally be tied to prompts via a regex.
+    - **RecordingInputSource**: Wraps another source and records each prompt/response.
+    - **ReplayInputSource**: Replays a recording made by RecordingInputSource.
+
+Example::
+
+    from dt_tools.console.console_helper import ConsoleInputHelper
+    from dt_tools.console.input_source import ScriptedInputSource
+
+    script = ScriptedInputSource([
+        ('Continue', 'y'),                      # answer for a prompt containing 'Continue'
+        ('Pick a color', ScriptedInputSource.TIMEOUT),  # simulate timeout, default is returned
+        'anything',                             # answer for any prompt
+    ])
+    ConsoleInputHelper.set_input_source(script)
+    resp = ConsoleInputHelper.get_input_with_timeout('Continue (y/n) > ', ConsoleInputHelper.YES_NO_RESPONSE)
+
+"""
+import abc
+import collections
+import json
+import re
+import sys
+import threading
+import time
+from typing import IO, Callable, Deque, Final, Iterable, List, Optional, Tuple, Union
+
+from dt_tools.console._lazy import LOGGER
+from dt_tools.console.ansi_text import AnsiText
+
+if sys.platform == 'win32':
+    import msvcrt
+    from ctypes import byref, create_string_buffer, windll, wintypes
+else:
+    from dt_tools.console.keyboard import KeyboardReader
+
+Completer = Callable[[str], Tuple[str, List[str]]]
+
+
+class _WinConsole:
+    WAIT_OBJECT_0: Final = 0
+    WAIT_TIMEOUT: Final = 0x102
+    INPUT_RECORD_SIZE: Final = 20
+
+
+class InputSource(abc.ABC):
+    """
+    Base class for prompt input.
+
+    Subclasses implement read_line().  read_line_async() defaults to calling
+    read_line(), override it if the source may block.
+    """
+    @abc.abstractmethod
+    def read_line(self, prompt: str, timeout_secs: float = -1, default: str = None,
+                  completer: Completer = None, echo: bool = True) -> str:
+        """
+        Display prompt and return the response.
+
+        Arguments:
+            prompt: Prompt text.
+
+        Keyword Arguments:
+            timeout_secs: Seconds to wait for a response, < 0 waits forever (default: {-1}).
+            default: Value the caller will use on timeout, for display only (default: {None}).
+            completer: Tab completion function (default: {None}).
+            echo: Echo the response (default: {True}).
+
+        Raises:
+            TimeoutError: No response before timeout.
+            EOFError: No more input.
+
+        Returns:
+            Response text.
+        """
+
+    async def read_line_async(self, prompt: str, timeout_secs: float = -1, default: str = None,
+                              completer: Completer = None, echo: bool = True) -> str:
+        """Awaitable read_line(), see :func:`read_line`."""
+        return self.read_line(prompt, timeout_secs=timeout_secs, default=default, completer=completer, echo=echo)
+
+    def close(self):
+        """Release any resources held by the source."""
+        pass
+
+
+class TerminalInputSource(InputSource):
+    """
+    Read responses from the keyboard.
+
+    Prompts without a timeout are read with input(), unless stdin is a terminal
+    and tab completion or masked echo is needed.  Only then, or when a timeout
+    applies, is the KeyboardReader used.  input() buffers piped stdin, so
+    reading a pipe directly could skip responses input() had already read.
+    """
+
+    def read_line(self, prompt: str, timeout_secs: float = -1, default: str = None,
+                  completer: Completer = None, echo: bool = True) -> str:
+        if sys.platform == 'win32':
+            if timeout_secs < 0:
+                return input(prompt)
+            return self._input_with_timeout_win(prompt, timeout_secs, default, echo)
+
+        if timeout_secs < 0 and ((completer is None and echo) or not sys.stdin.isatty()):
+            return input(prompt)
+        return self._input_with_timeout_nix(prompt, timeout_secs, default, completer, echo)
+
+    async def read_line_async(self, prompt: str, timeout_secs: float = -1, default: str = None,
+                              completer: Completer = None, echo: bool = True) -> str:
+        if sys.platform == 'win32':
+            # Proactor event loops do not support add_reader(), wait on a worker thread instead
+            import asyncio
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.read_line, prompt, timeout_secs, default, completer, echo)
+
+        reader = KeyboardReader.default()
+        try:
+            return await reader.read_line_async(prompt, timeout_secs=timeout_secs, echo=echo, completer=completer)
+        except TimeoutError:
+            if echo:
+                reader.write(f'{default if default else ""}\n')
+            raise
+
+    def _input_with_timeout_nix(self, prompt: str, timeout_secs: float, default: str = None,
+                                completer: Completer = None, echo: bool = True) -> str:
+        LOGGER.trace("_input_with_timeout_nix()")
+        reader = KeyboardReader.default()
+        try:
+            return reader.read_line(prompt, timeout_secs=timeout_secs, echo=echo, completer=completer)
+        except TimeoutError:
+            if echo:
+                reader.write(f'{default if default else ""}\n')
+            raise
+
+    def _input_with_timeout_win(self, prompt: str, timeout_secs: float, default: str = None, echo: bool = True) -> str:
+        LOGGER.trace("_input_with_timeout_win()")
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        timer = time.monotonic
+        endtime = timer() + timeout_secs
+        getch = msvcrt.getwche if echo else msvcrt.getwch
+        handle = wintypes.HANDLE(msvcrt.get_osfhandle(sys.stdin.fileno()))
+        record = create_string_buffer(_WinConsole.INPUT_RECORD_SIZE)
+        count = wintypes.DWORD()
+        result = []
+        while True:
+            remaining = endtime - timer()
+            if remaining <= 0:
+                break
+            # Sleep until console input arrives or the deadline passes
+            wait = windll.kernel32.WaitForSingleObject(handle, wintypes.DWORD(max(int(remaining * 1000), 1)))
+            if wait == _WinConsole.WAIT_TIMEOUT:
+                continue
+            if wait != _WinConsole.WAIT_OBJECT_0:
+                # Not a waitable console handle, poll
+                time.sleep(0.04)
+            elif not msvcrt.kbhit():
+                # Signalled by a non-character event (key up, mouse, focus), remove it or the wait returns at once
+                windll.kernel32.ReadConsoleInputW(handle, record, 1, byref(count))
+                continue
+            while msvcrt.kbhit():
+                result.append(getch()) #XXX can it block on multibyte characters?
+                if result[-1] == '\r':   #XXX check what Windows returns here
+                    print('')
+                    return ''.join(result[:-1])
+        # Single deadline for the whole prompt, partial input is discarded (as KeyboardReader)
+        if result and echo:
+            sys.stdout.write('\b \b' * len(result))
+        if echo:
+            print(default if default else '')
+        raise TimeoutError('Time Expired.')
+
+
+class ScriptedInputSource(InputSource):
+    """
+    Answer prompts from a predefined script.
+
+    Each script entry is either a response (used for the next prompt), or a
+    (pattern, response) tuple.  A tuple is only used for a prompt matching the
+    pattern (re.search against the prompt with ANSI codes removed), entries are
+    consumed in order, skipping entries whose pattern doesn't match.
+
+    The response ScriptedInputSource.TIMEOUT simulates a prompt timeout.
+
+    Arguments:
+        script: Script entries.
+
+    Keyword Arguments:
+        echo: Write prompt and response to stdout (default: {False}).
+        cycle: Restart the script when exhausted, for load tests (default: {False}).
+    """
+    TIMEOUT: Final = '<timeout>'
+    """Response token simulating a prompt timeout."""
+
+    def __init__(self, script: Iterable[Union[str, Tuple[str, str]]], echo: bool = False, cycle: bool = False):
+        self._entries: List[Tuple[Optional[re.Pattern], str]] = [self._compile(entry) for entry in script]
+        self._remaining: Deque[Tuple[Optional[re.Pattern], str]] = collections.deque(self._entries)
+        self._echo = echo
+        self._cycle = cycle
+        self._lock = threading.Lock()
+        self._prompt_count = 0
+
+    @classmethod
+    def from_file(cls, source: Union[str, IO[str]], separator: str = None,
+                  echo: bool = False, cycle: bool = False) -> 'ScriptedInputSource':
+        """
+        Load script from a file (or pipe).
+
+        One response per line.  If separator is supplied, lines containing it
+        are split into pattern and response.  Blank lines are empty responses,
+        lines beginning with # are comments.
+
+        Arguments:
+            source: File name or open text file (i.e. sys.stdin).
+
+        Keyword Arguments:
+            separator: Pattern/response separator (default: {None}).
+            echo: Write prompt and response to stdout (default: {False}).
+            cycle: Restart the script when exhausted (default: {False}).
+
+        Returns:
+            Scripted input source.
+        """
+        if isinstance(source, str):
+            with open(source, encoding='utf-8') as script_file:
+                lines = script_file.read().splitlines()
+        else:
+            lines = source.read().splitlines()
+
+        script = []
+        for line in lines:
+            if line.startswith('#'):
+                continue
+            if separator is not None and separator in line:
+                pattern, response = line.split(separator, 1)
+                script.append((pattern, response))
+            else:
+                script.append(line)
+        return cls(script, echo=echo, cycle=cycle)
+
+    @property
+    def prompt_count(self) -> int:
+        """Number of prompts answered."""
+        return self._prompt_count
+
+    @property
+    def remaining(self) -> int:
+        """Number of unused script entries."""
+        return len(self._remaining)
+
+    def read_line(self, prompt: str, timeout_secs: float = -1, default: str = None,
+                  completer: Completer = None, echo: bool = True) -> str:
+        response = self._next_response(prompt)
+        if self._echo and echo:
+            # Imported on use, console_helper imports this module
+            from dt_tools.console.console_helper import ConsoleHelper
+            shown = (default if default else '') if response == self.TIMEOUT else response
+            ConsoleHelper._output_to_terminal(f'{prompt}{shown}\n')
+        if response == self.TIMEOUT:
+            raise TimeoutError('Scripted timeout.')
+        return response
+
+    def _next_response(self, prompt: str) -> str:
+        plain_prompt = AnsiText.strip(prompt)
+        with self._lock:
+            if not self._remaining and self._cycle:
+                self._remaining.extend(self._entries)
+            for idx, (pattern, response) in enumerate(self._remaining):
+                if pattern is None or pattern.search(plain_prompt):
+                    del self._remaining[idx]
+                    self._prompt_count += 1
+                    return response
+        raise EOFError(f'Script has no response for prompt: {plain_prompt!r}')
+
+    @staticmethod
+    def _compile(entry: Union[str, Tuple[str, str]]) -> Tuple[Optional[re.Pattern], str]:
+        if isinstance(entry, tuple):
+            pattern, response = entry
+            return (re.compile(pattern), response)
+        return (None, entry)
+
+
+class RecordingInputSource(InputSource):
+    """
+    Record prompts and responses from another source (JSON lines).
+
+    The recording can be played back with ReplayInputSource.
+
+    Arguments:
+        source: Source being recorded (i.e. TerminalInputSource()).
+        target: File name or open text file receiving the recording.
+    """
+    def __init__(self, source: InputSource, target: Union[str, IO[str]]):
+        self._source = source
+        self._owns_file = isinstance(target, str)
+        self._file = open(target, 'w', encoding='utf-8') if self._owns_file else target
+        self._lock = threading.Lock()
+
+    def read_line(self, prompt: str, timeout_secs: float = -1, default: str = None,
+                  completer: Completer = None, echo: bool = True) -> str:
+        try:
+            response = self._source.read_line(prompt, timeout_secs=timeout_secs, default=default,
+                                              completer=completer, echo=echo)
+        except TimeoutError:
+            self._record(prompt, ScriptedInputSource.TIMEOUT)
+            raise
+        self._record(prompt, response)
+        return response
+
+    async def read_line_async(self, prompt: str, timeout_secs: float = -1, default: str = None,
+                              completer: Completer = None, echo: bool = True) -> str:
+        try:
+            response = await self._source.read_line_async(prompt, timeout_secs=timeout_secs, default=default,
+                                                          completer=completer, echo=echo)
+        except TimeoutError:
+            self._record(prompt, ScriptedInputSource.TIMEOUT)
+            raise
+        self._record(prompt, response)
+        return response
+
+    def close(self):
+        self._file.flush()
+        if self._owns_file:
+            self._file.close()
+        self._source.close()
+
+    def _record(self, prompt: str, response: str):
+        with self._lock:
+            self._file.write(json.dumps({'prompt': prompt, 'response': response}) + '\n')
+            self._file.flush()
+
+
+class ReplayInputSource(ScriptedInputSource):
+    """
+    Replay a recording made by RecordingInputSource.
+
+    Arguments:
+        source: File name or open text file containing the recording.
+
+    Keyword Arguments:
+        strict: Responses are only used for the exact prompt they were recorded
+          for, otherwise responses are replayed in order (default: {False}).
+        echo: Write prompt and response to stdout (default: {False}).
+    """
+    def __init__(self, source: Union[str, IO[str]], strict: bool = False, echo: bool = False):
+        if isinstance(source, str):
+            with open(source, encoding='utf-8') as recording:
+                lines = recording.read().splitlines()
+        else:
+            lines = source.read().splitlines()
+
+        script = []
+        for line in lines:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if strict:
+                plain_prompt = AnsiText.strip(entry['prompt'])
+                script.append((f'^{re.escape(plain_prompt)}$', entry['response']))
+            else:
+                script.append(entry['response'])
+        super().__init__(script, echo=echo)
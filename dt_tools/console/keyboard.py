@@ -0,0 +1,847 @@
+"""
+Non-blocking keyboard input for Linux/Mac consoles.
+
+The KeyboardReader waits on stdin with a selector rather than a signal or
+a sleep loop, so:
+
+    - Timeouts have sub-second resolution.
+    - Reads may be issued from any thread (SIGALRM only works in the main thread).
+    - Existing signal handlers are left alone.
+
+While a line is being read, the terminal is placed in cbreak mode and the
+reader handles echo and simple line editing (backspace, ctrl-u) itself.
+
+A read_line() timeout is a single deadline for the whole prompt, keystrokes
+do not extend it.  If Enter has not been pressed when it expires, any partial
+input is erased and discarded and TimeoutError is raised, so callers fall back
+to their default rather than acting on half typed text.
+
+An asyncio flavor, read_line_async(), registers stdin with the running event
+loop so other tasks continue to run while waiting for keystrokes.
+
+The KeyDispatcher runs a background thread which decodes keystrokes (including
+arrow and function key escape sequences) into KeyEvents and delivers them to
+registered callbacks and/or a queue.  Use it to provide hotkeys while a
+ProgressBar or Spinner is running.
+
+Example::
+
+    from dt_tools.console.keyboard import KeyboardReader
+
+    reader = KeyboardReader()
+    try:
+        resp = reader.read_line('Continue (y/n) > ', timeout_secs=2.5)
+    except TimeoutError:
+        resp = 'n'
+
+"""
+import atexit
+import codecs
+import contextlib
+import os
+import queue
+import selectors
+import sys
+import threading
+import time
+from typing import Callable, Dict, Final, List, NamedTuple, Optional, Tuple
+
+from dt_tools.console._lazy import LOGGER
+
+if sys.platform != 'win32':
+    import termios
+    import tty
+
+
+class _KeyCode:
+    """Control characters handled by the line editor."""
+    ENTER: Final = ('\r', '\n')
+    BACKSPACE: Final = ('\x7f', '\x08')
+    CTRL_C: Final = '\x03'
+    CTRL_D: Final = '\x04'
+    CTRL_U: Final = '\x15'
+    ESC: Final = '\x1b'
+    TAB: Final = '\t'
+
+
+def _console_write(text: str):
+    """Default prompt/echo writer, via ConsoleHelper so output targets, hooks and recorders see it."""
+    # Imported on use, console_helper imports this module (via input_source)
+    from dt_tools.console.console_helper import ConsoleHelper
+    ConsoleHelper._output_to_terminal(text)
+
+
+class _LineEditor():
+    """
+    Accumulate keystrokes into a line of text.
+
+    Characters are fed in as they arrive, the completed line is returned
+    by feed() once Enter is pressed.  Escape sequences (arrow keys, function
+    keys, ...) are discarded.
+
+    If a completer is supplied, Tab completes the text entered so far.  The
+    completer is called with the current text and returns the completed text
+    and the list of candidates.
+    """
+    _MAX_CANDIDATES: Final = 20
+
+    def __init__(self, echo: bool = True, mask: str = None, write: Callable[[str], None] = None, prompt: str = '', 
+                 completer: Callable[[str], Tuple[str, List[str]]] = None):
+        self._echo = echo
+        self._mask = mask
+        self._out_write = _console_write if write is None else write
+        self._prompt = prompt
+        self._completer = completer
+        self._chars = []
+        self._remainder = ''
+        self._in_escape = False
+        self._in_csi = False
+
+    @property
+    def text(self) -> str:
+        """Text entered so far."""
+        return ''.join(self._chars)
+
+    def feed(self, text: str) -> Optional[str]:
+        """
+        Process input characters.
+
+        Arguments:
+            text: Characters read from the keyboard.
+
+        Raises:
+            KeyboardInterrupt: ctrl-c was pressed (raw mode only, cbreak delivers SIGINT).
+
+        Returns:
+            The completed line if Enter was pressed, else None.
+        """
+        for idx, char in enumerate(text):
+            if self._in_escape:
+                self._skip_escape(char)
+                continue
+            if char in _KeyCode.ENTER:
+                self._write('\n')
+                # Anything after the line terminator is left for the next read
+                self._remainder = text[idx+1:]
+                return self.text
+            if char in _KeyCode.BACKSPACE:
+                if self._chars:
+                    self._chars.pop()
+                    self._write('\b \b')
+            elif char == _KeyCode.CTRL_U:
+                self._write('\b \b' * len(self._chars))
+                self._chars.clear()
+            elif char == _KeyCode.CTRL_C:
+                raise KeyboardInterrupt()
+            elif char == _KeyCode.ESC:
+                self._in_escape = True
+            elif char == _KeyCode.TAB and self._completer is not None and self._mask is None:
+                self._complete()
+            elif char.isprintable():
+                self._chars.append(char)
+                self._write(char if self._mask is None else self._mask)
+        self._remainder = ''
+        return None
+
+    @property
+    def remainder(self) -> str:
+        """Characters received after the line terminator."""
+        return self._remainder
+
+    def _complete(self):
+        text = self.text
+        completion, candidates = self._completer(text)
+        if completion != text:
+            self._write('\b \b' * len(text) + completion)
+            self._chars = list(completion)
+        elif len(candidates) > 1:
+            listing = '  '.join(candidates[:self._MAX_CANDIDATES])
+            if len(candidates) > self._MAX_CANDIDATES:
+                listing += '  ...'
+            self._write(f'\n{listing}\n{self._prompt}{text}')
+        else:
+            self._write('\a')
+
+    def discard(self):
+        """Erase the text entered so far (timeout)."""
+        if self._mask != '':
+            self._write('\b \b' * len(self._chars))
+        self._chars.clear()
+
+    def _skip_escape(self, char: str):
+        if not self._in_csi and char in ('[', 'O'):
+            self._in_csi = True
+        elif not self._in_csi or '@' <= char <= '~':
+            self._in_escape = False
+            self._in_csi = False
+
+    def _write(self, token: str):
+        if self._echo:
+            self._out_write(token)
+
+
+class KeyboardReader():
+    """
+    Read keyboard input from stdin with selector based timeouts.
+
+    A single reader may be shared across threads, reads are serialized.
+    A blocked read may be woken from another thread via interrupt().
+
+    Example::
+
+        from dt_tools.console.keyboard import KeyboardReader
+
+        reader = KeyboardReader()
+        try:
+            name = reader.read_line('Name > ', timeout_secs=10)
+        except TimeoutError:
+            name = 'anonymous'
+    """
+    _READ_SIZE: Final = 1024
+    _default_reader: 'KeyboardReader' = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, stream=None, write: Callable[[str], None] = None):
+        """
+        Keyboard reader instantiation
+
+        Keyword Arguments:
+            stream: Input stream, must support fileno() (default: {sys.stdin})
+            write: Prompt and echo output function (default: {ConsoleHelper output})
+        """
+        self._stream = sys.stdin if stream is None else stream
+        self._write = _console_write if write is None else write
+        self._fd = self._stream.fileno()
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_r, False)
+        os.set_blocking(self._wakeup_w, False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._fd, selectors.EVENT_READ)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ)
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._pending = ''
+        self._lock = threading.RLock()
+        LOGGER.trace('KeyboardReader initialized.')
+
+    @classmethod
+    def default(cls) -> 'KeyboardReader':
+        """Shared reader for sys.stdin, created on first use."""
+        with cls._default_lock:
+            if cls._default_reader is None:
+                cls._default_reader = KeyboardReader()
+        return cls._default_reader
+
+    def fileno(self) -> int:
+        """File descriptor being read."""
+        return self._fd
+
+    def is_tty(self) -> bool:
+        """True if input is an interactive terminal."""
+        return os.isatty(self._fd)
+
+    @contextlib.contextmanager
+    def cbreak(self):
+        """
+        Context manager placing the terminal in cbreak mode.
+
+        Keystrokes are available immediately and are not echoed, signal
+        keys (ctrl-c) still work.  Original settings are restored on exit.
+        Does nothing if input is not a terminal.
+        """
+        if not self.is_tty():
+            yield
+            return
+
+        old_settings = termios.tcgetattr(self._fd)
+        try:
+            tty.setcbreak(self._fd, termios.TCSANOW)
+            yield
+        finally:
+            termios.tcsetattr(self._fd, termios.TCSADRAIN, old_settings)
+
+    def unread(self, text: str):
+        """
+        Push characters back, they are returned by the next read before any new input.
+
+        Arguments:
+            text: Characters to push back (i.e. keys typed ahead of a prompt).
+        """
+        with self._lock:
+            self._pending = text + self._pending
+
+    def write(self, text: str):
+        """Write text to the console through the reader's prompt/echo writer."""
+        self._write(text)
+
+    def interrupt(self):
+        """Wake up a read blocked in another thread, the read returns as if timed out."""
+        try:
+            os.write(self._wakeup_w, b'\0')
+        except BlockingIOError:
+            pass  # wakeup already pending
+
+    def read_bytes(self, timeout_secs: float = -1) -> Optional[bytes]:
+        """
+        Wait for input and return the bytes available.
+
+        Keyword Arguments:
+            timeout_secs: Seconds to wait, < 0 waits forever (default: {-1}).
+
+        Returns:
+            Bytes read, b'' on end-of-file, None on timeout or interrupt().
+        """
+        deadline = None if timeout_secs < 0 else time.monotonic() + timeout_secs
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            # Wait without the lock, so a blocked reader doesn't hold up other threads
+            events = self._selector.select(timeout)
+            if not events:
+                return None
+            with self._lock:
+                if any(key.fd == self._wakeup_r for key, _ in events):
+                    self._drain_wakeup()
+                    return None
+                # Another thread may have consumed the input while we waited for the lock
+                if any(key.fd == self._fd for key, _ in self._selector.select(0)):
+                    return os.read(self._fd, self._READ_SIZE)
+
+    def read_text(self, timeout_secs: float = -1) -> Optional[str]:
+        """
+        Wait for input and return the characters available.
+
+        Multi-byte (UTF-8) characters split across reads are held until complete.
+
+        Keyword Arguments:
+            timeout_secs: Seconds to wait, < 0 waits forever (default: {-1}).
+
+        Raises:
+            EOFError: Input stream is closed.
+
+        Returns:
+            Characters read, '' if a partial character arrived, None on timeout or interrupt().
+        """
+        with self._lock:
+            if self._pending:
+                text, self._pending = self._pending, ''
+                return text
+        data = self.read_bytes(timeout_secs)
+        if data is None:
+            return None
+        if data == b'':
+            raise EOFError('End of input.')
+        with self._lock:
+            return self._decoder.decode(data)
+
+    def read_line(self, prompt: str = '', timeout_secs: float = -1, echo: bool = True, mask: str = None,
+                  completer: Callable[[str], Tuple[str, List[str]]] = None) -> str:
+        """
+        Display prompt and read a line of input.
+
+        Keyword Arguments:
+            prompt: Text to be displayed as prompt (default: {''}).
+            timeout_secs: Seconds to wait for input, < 0 waits forever (default: {-1}).
+            echo: Echo keystrokes (default: {True}).
+            mask: Character echoed in place of each keystroke, i.e. for passwords (default: {None}).
+            completer: Tab completion function, called with the text entered, returns
+              (completed text, candidate list) (default: {None}).
+
+        Raises:
+            TimeoutError: Enter not pressed before timeout, partial input is discarded
+              (see module documentation).
+            EOFError: Input stream closed before any text was entered.
+
+        Returns:
+            Text entered (without line terminator).
+        """
+        editor = _LineEditor(echo=echo, mask=mask, write=self._write, prompt=prompt, completer=completer)
+        if prompt:
+            self._write(prompt)
+
+        with self._lock, self.cbreak():
+            deadline = None if timeout_secs < 0 else time.monotonic() + timeout_secs
+            while True:
+                remaining = -1 if deadline is None else deadline - time.monotonic()
+                if deadline is not None and remaining <= 0:
+                    break
+                try:
+                    text = self.read_text(remaining)
+                except EOFError:
+                    if editor.text:
+                        self._write('\n')
+                        return editor.text
+                    raise
+                if text is None:
+                    break
+                line = editor.feed(text)
+                if line is not None:
+                    self._pending = editor.remainder
+                    return line
+
+        editor.discard()
+        raise TimeoutError('Time Expired.')
+
+    async def read_line_async(self, prompt: str = '', timeout_secs: float = -1, echo: bool = True, mask: str = None,
+                              completer: Callable[[str], Tuple[str, List[str]]] = None) -> str:
+        """
+        Display prompt and read a line of input without blocking the event loop.
+
+        stdin is registered with loop.add_reader(), keystrokes are processed
+        as they arrive.
+
+        Keyword Arguments:
+            prompt: Text to be displayed as prompt (default: {''}).
+            timeout_secs: Seconds to wait for input, < 0 waits forever (default: {-1}).
+            echo: Echo keystrokes (default: {True}).
+            mask: Character echoed in place of each keystroke, i.e. for passwords (default: {None}).
+            completer: Tab completion function, called with the text entered, returns
+              (completed text, candidate list) (default: {None}).
+
+        Raises:
+            TimeoutError: Enter not pressed before timeout, partial input is discarded
+              (see module documentation).
+            EOFError: Input stream closed before any text was entered.
+
+        Returns:
+            Text entered (without line terminator).
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        editor = _LineEditor(echo=echo, mask=mask, write=self._write, prompt=prompt, completer=completer)
+        line_ready = loop.create_future()
+
+        def _complete(line: str = None, ex: BaseException = None):
+            if line_ready.done():
+                return
+            if ex is not None:
+                line_ready.set_exception(ex)
+            else:
+                self._pending = editor.remainder
+                line_ready.set_result(line)
+
+        def _on_readable():
+            data = os.read(self._fd, self._READ_SIZE)
+            if data == b'':
+                loop.remove_reader(self._fd)
+                if editor.text:
+                    _complete(editor.text)
+                else:
+                    _complete(ex=EOFError('End of input.'))
+                return
+            try:
+                line = editor.feed(self._decoder.decode(data))
+            except KeyboardInterrupt as ki:
+                _complete(ex=ki)
+                return
+            if line is not None:
+                _complete(line)
+
+        if prompt:
+            self._write(prompt)
+
+        with self.cbreak():
+            if self._pending:
+                text, self._pending = self._pending, ''
+                line = editor.feed(text)
+                if line is not None:
+                    _complete(line)
+            loop.add_reader(self._fd, _on_readable)
+            try:
+                timeout = None if timeout_secs < 0 else timeout_secs
+                return await asyncio.wait_for(line_ready, timeout)
+            except asyncio.TimeoutError:
+                editor.discard()
+                raise TimeoutError('Time Expired.') from None
+            finally:
+                loop.remove_reader(self._fd)
+
+    def close(self):
+        """Release selector and wakeup pipe."""
+        self._selector.close()
+        for fd in (self._wakeup_r, self._wakeup_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _drain_wakeup(self):
+        try:
+            while os.read(self._wakeup_r, self._READ_SIZE):
+                pass
+        except BlockingIOError:
+            pass
+
+
+class Key:
+    """Key names reported in :class:`KeyEvent` for non-printable keys."""
+    ANY: Final = '*'
+    """Register a callback for every key."""
+    ENTER: Final = 'enter'
+    TAB: Final = 'tab'
+    BACKSPACE: Final = 'backspace'
+    ESCAPE: Final = 'escape'
+    UP: Final = 'up'
+    DOWN: Final = 'down'
+    RIGHT: Final = 'right'
+    LEFT: Final = 'left'
+    HOME: Final = 'home'
+    END: Final = 'end'
+    INSERT: Final = 'insert'
+    DELETE: Final = 'delete'
+    PAGE_UP: Final = 'page_up'
+    PAGE_DOWN: Final = 'page_down'
+    F1: Final = 'f1'
+    F2: Final = 'f2'
+    F3: Final = 'f3'
+    F4: Final = 'f4'
+    F5: Final = 'f5'
+    F6: Final = 'f6'
+    F7: Final = 'f7'
+    F8: Final = 'f8'
+    F9: Final = 'f9'
+    F10: Final = 'f10'
+    F11: Final = 'f11'
+    F12: Final = 'f12'
+
+
+class KeyEvent(NamedTuple):
+    """A decoded keystroke."""
+    key: str
+    """Printable character, or Key name (with 'ctrl+', 'alt+', 'shift+' prefixes)."""
+    sequence: str
+    """Raw characters received for the key."""
+
+
+class KeyDecoder():
+    """
+    State machine decoding keyboard input into KeyEvents.
+
+    Handles CSI (ESC [) and SS3 (ESC O) sequences used by xterm/vt220 compatible
+    terminals for arrow, navigation and function keys, including modifier
+    parameters (i.e. ESC [1;5A is ctrl+up).  ESC followed by a character is
+    reported as alt+character.
+
+    A lone ESC can't be told apart from the start of a sequence until more
+    input arrives (or doesn't), call flush() when input goes idle to emit it.
+    """
+    _GROUND: Final = 0
+    _ESCAPE: Final = 1
+    _CSI: Final = 2
+    _SS3: Final = 3
+
+    _FINAL_KEYS: Final = {'A': Key.UP, 'B': Key.DOWN, 'C': Key.RIGHT, 'D': Key.LEFT, 
+                          'H': Key.HOME, 'F': Key.END, 
+                          'P': Key.F1, 'Q': Key.F2, 'R': Key.F3, 'S': Key.F4}
+    _TILDE_KEYS: Final = {1: Key.HOME, 2: Key.INSERT, 3: Key.DELETE, 4: Key.END, 
+                          5: Key.PAGE_UP, 6: Key.PAGE_DOWN, 7: Key.HOME, 8: Key.END,
+                          11: Key.F1, 12: Key.F2, 13: Key.F3, 14: Key.F4, 15: Key.F5,
+                          17: Key.F6, 18: Key.F7, 19: Key.F8, 20: Key.F9, 21: Key.F10,
+                          23: Key.F11, 24: Key.F12}
+    _CONTROL_KEYS: Final = {'\r': Key.ENTER, '\n': Key.ENTER, '\t': Key.TAB, 
+                            '\x7f': Key.BACKSPACE, '\x08': Key.BACKSPACE}
+
+    def __init__(self):
+        self._state = self._GROUND
+        self._sequence = ''
+
+    @property
+    def pending(self) -> bool:
+        """True if a partial escape sequence is buffered."""
+        return self._state != self._GROUND
+
+    def feed(self, text: str) -> List[KeyEvent]:
+        """
+        Decode input characters.
+
+        Arguments:
+            text: Characters read from the keyboard.
+
+        Returns:
+            List of completed KeyEvents (may be empty).
+        """
+        events = []
+        for char in text:
+            event = self._next(char)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def flush(self) -> List[KeyEvent]:
+        """
+        Emit any buffered partial sequence.
+
+        Returns:
+            ESC (or alt+[ / alt+O) event if a sequence was pending, else empty list.
+        """
+        if self._state == self._GROUND:
+            return []
+        sequence = self._sequence
+        self._reset()
+        if sequence == _KeyCode.ESC:
+            return [KeyEvent(Key.ESCAPE, sequence)]
+        return [KeyEvent(f'alt+{ch}' if idx == 0 else ch, sequence) for idx, ch in enumerate(sequence[1:])]
+
+    def take_pending(self) -> str:
+        """
+        Remove the buffered partial sequence without decoding it.
+
+        Returns:
+            Characters of the partial sequence ('' if none), i.e. to hand to KeyboardReader.unread().
+        """
+        sequence = self._sequence
+        self._reset()
+        return sequence
+
+    def _next(self, char: str) -> Optional[KeyEvent]:
+        if self._state == self._GROUND:
+            if char == _KeyCode.ESC:
+                self._state = self._ESCAPE
+                self._sequence = char
+                return None
+            return self._plain_key(char)
+
+        self._sequence += char
+        if self._state == self._ESCAPE:
+            if char == '[':
+                self._state = self._CSI
+                return None
+            if char == 'O':
+                self._state = self._SS3
+                return None
+            sequence = self._sequence
+            self._reset()
+            if char == _KeyCode.ESC:
+                # ESC ESC, report first and start over with the second
+                self._state = self._ESCAPE
+                self._sequence = char
+                return KeyEvent(Key.ESCAPE, _KeyCode.ESC)
+            return KeyEvent(f'alt+{self._plain_key(char).key}', sequence)
+
+        if self._state == self._SS3:
+            sequence = self._sequence
+            self._reset()
+            return KeyEvent(self._FINAL_KEYS.get(char, f'ss3+{char}'), sequence)
+
+        # CSI: parameter / intermediate bytes until a final byte (@ thru ~)
+        if '@' <= char <= '~':
+            sequence = self._sequence
+            self._reset()
+            return self._csi_key(sequence)
+        return None
+
+    def _plain_key(self, char: str) -> KeyEvent:
+        key = self._CONTROL_KEYS.get(char)
+        if key is None:
+            if ord(char) < 0x20:
+                key = f'ctrl+{chr(ord(char) + 0x60)}'
+            else:
+                key = char
+        return KeyEvent(key, char)
+
+    def _csi_key(self, sequence: str) -> KeyEvent:
+        final = sequence[-1]
+        params = sequence[2:-1].split(';')
+        try:
+            numbers = [int(p) if p else 1 for p in params]
+        except ValueError:
+            return KeyEvent(f'csi+{sequence[2:]}', sequence)
+
+        if final == '~':
+            key = self._TILDE_KEYS.get(numbers[0], f'csi+{sequence[2:]}')
+        else:
+            key = self._FINAL_KEYS.get(final, f'csi+{sequence[2:]}')
+        if len(numbers) > 1 and numbers[1] > 1:
+            modifier = numbers[1] - 1
+            prefix = ''
+            if modifier & 4:
+                prefix += 'ctrl+'
+            if modifier & 2:
+                prefix += 'alt+'
+            if modifier & 1:
+                prefix += 'shift+'
+            key = f'{prefix}{key}'
+        return KeyEvent(key, sequence)
+
+    def _reset(self):
+        self._state = self._GROUND
+        self._sequence = ''
+
+
+class KeyDispatcher():
+    """
+    Background keyboard listener delivering KeyEvents to callbacks and/or a queue.
+
+    While running, the terminal is in cbreak mode (no echo, keys available
+    immediately), so keystrokes do not disturb widgets drawing on the console.
+    Terminal settings are restored on stop(), on exit of the with block and,
+    as a last resort, at interpreter exit.
+
+    Callbacks run on the dispatcher thread, keep them short.  Avoid console
+    calls which query the terminal (i.e. cursor_current_position()) while the
+    dispatcher is running, the dispatcher would consume the terminal reply.
+
+    Example::
+
+        from dt_tools.console.keyboard import KeyDispatcher
+        from dt_tools.console.spinner import Spinner
+
+        cancelled = threading.Event()
+        spinner = Spinner('Working (q to quit)')
+        with KeyDispatcher() as keys:
+            keys.register('q', lambda evt: cancelled.set())
+            spinner.start_spinner()
+            while not cancelled.is_set() and more_work():
+                do_work()
+            spinner.stop_spinner()
+
+    """
+    def __init__(self, reader: KeyboardReader = None, event_queue: queue.Queue = None, esc_timeout: float = 0.05):
+        """
+        Key dispatcher instantiation
+
+        Keyword Arguments:
+            reader: Keyboard reader (default: {KeyboardReader.default()})
+            event_queue: If supplied, every KeyEvent is also put on this queue (default: {None})
+            esc_timeout: Seconds to wait for the rest of an escape sequence before
+              reporting ESC (default: {0.05})
+        """
+        self._reader = KeyboardReader.default() if reader is None else reader
+        self._queue = event_queue
+        self._esc_timeout = esc_timeout
+        self._callbacks: Dict[str, List[Callable[[KeyEvent], None]]] = {}
+        self._callback_lock = threading.Lock()
+        self._thread: threading.Thread = None
+        self._stopping = threading.Event()
+        self._saved_tty = None
+        LOGGER.trace('KeyDispatcher initialized.')
+
+    @property
+    def events(self) -> Optional[queue.Queue]:
+        """Queue receiving KeyEvents (None if not configured)."""
+        return self._queue
+
+    @property
+    def running(self) -> bool:
+        """True if the dispatcher thread is active."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def register(self, key: str, callback: Callable[[KeyEvent], None]):
+        """
+        Register a callback for a key.
+
+        Arguments:
+            key: Character (i.e. 'q') or Key name (i.e. Key.UP, 'ctrl+up'). 
+              Key.ANY receives all keys.
+            callback: Function called with the KeyEvent.
+        """
+        with self._callback_lock:
+            self._callbacks.setdefault(key, []).append(callback)
+
+    def unregister(self, key: str, callback: Callable[[KeyEvent], None] = None):
+        """
+        Remove callback(s) for a key.
+
+        Arguments:
+            key: Key the callback was registered for.
+
+        Keyword Arguments:
+            callback: Callback to remove, if None all callbacks for key are removed (default: {None})
+        """
+        with self._callback_lock:
+            if callback is None:
+                self._callbacks.pop(key, None)
+            elif callback in self._callbacks.get(key, []):
+                self._callbacks[key].remove(callback)
+
+    def start(self):
+        """Start listening for keystrokes."""
+        if self.running:
+            return
+        if self._reader.is_tty():
+            self._saved_tty = termios.tcgetattr(self._reader.fileno())
+            atexit.register(self._restore_tty)
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name='KeyDispatcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop listening and restore terminal settings."""
+        self._stopping.set()
+        if self._thread is not None:
+            # From a callback the dispatcher thread checks _stopping on return, no wakeup needed
+            if self._thread is not threading.current_thread():
+                self._reader.interrupt()
+                self._thread.join()
+                # Wakeup may not have been consumed (thread was not waiting), don't leave it for the next read
+                self._reader._drain_wakeup()
+            self._thread = None
+        self._restore_tty()
+
+    def dispatch(self, event: KeyEvent):
+        """
+        Deliver an event to the queue and registered callbacks.
+
+        Called by the dispatcher thread, may be used to inject synthetic keys.
+
+        Arguments:
+            event: Key event to deliver.
+        """
+        if self._queue is not None:
+            self._queue.put(event)
+        with self._callback_lock:
+            callbacks = self._callbacks.get(event.key, []) + self._callbacks.get(Key.ANY, [])
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as ex:
+                LOGGER.warning(f'KeyDispatcher callback for [{event.key}] failed: {repr(ex)}')
+
+    def __enter__(self) -> 'KeyDispatcher':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _run(self):
+        decoder = KeyDecoder()
+        try:
+            with self._reader.cbreak():
+                while not self._stopping.is_set():
+                    timeout = self._esc_timeout if decoder.pending else -1
+                    try:
+                        text = self._reader.read_text(timeout)
+                    except EOFError:
+                        break
+                    if text is None:
+                        events = decoder.flush()
+                    else:
+                        events = decoder.feed(text)
+                    for event in events:
+                        self.dispatch(event)
+        except Exception as ex:
+            LOGGER.error(f'KeyDispatcher stopped: {repr(ex)}')
+
+    def _restore_tty(self):
+        if self._saved_tty is not None:
+            try:
+                termios.tcsetattr(self._reader.fileno(), termios.TCSADRAIN, self._saved_tty)
+            except (termios.error, OSError) as ex:
+                LOGGER.trace(f'_restore_tty()-{repr(ex)}')
+            self._saved_tty = None
+            atexit.unregister(self._restore_tty)
+
+
+if __name__ == "__main__":
+    reader = KeyboardReader()
+    try:
+        resp = reader.read_line('Enter some text (2.5 sec timeout) > ', timeout_secs=2.5)
+        print(f'You entered: {resp}')
+    except TimeoutError:
+        print('\nTimed out.')
+
+    print('Press keys (arrows, function keys, ...), q to quit.')
+    done = threading.Event()
+    with KeyDispatcher() as dispatcher:
+        dispatcher.register(Key.ANY, lambda evt: print(f'  {evt.key:15} {evt.sequence!r}'))
+        dispatcher.register('q', lambda evt: done.set())
+        done.wait()
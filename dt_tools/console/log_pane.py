@@ -0,0 +1,181 @@
+"""
+Loguru sink that keeps log output from tearing live widgets.
+
+LogPane collects log messages and writes them in batches, through the same
+serialized writer as ProgressBar/Spinner frames (ConsoleHelper's output
+lock).  Each batch clears the widget line, writes the log lines (which
+scroll up above the widget), then repaints the widget line once.  A burst
+of thousands of log lines per second therefore costs one write and one
+widget repaint per flush interval instead of one per log line.
+
+LogPane tracks the current partial line (the widget frame) from the
+ConsoleHelper output, so widgets need no changes.  With the status bar
+enabled (ConsoleHelper.enable_status_bar()) log lines scroll within the
+region above the status rows.
+
+Example::
+
+    from loguru import logger
+    from dt_tools.console.log_pane import LogPane
+    from dt_tools.console.progress_bar import ProgressBar
+
+    logger.remove()    # default stderr handler would write around the pane
+    with LogPane(logger, level='INFO'):
+        p_bar = ProgressBar('Loading', bar_length=40, max_increments=len(jobs))
+        for idx, job in enumerate(jobs, 1):
+            logger.info(f'Processing {job}')
+            p_bar.display_progress(idx)
+
+"""
+import collections
+import threading
+from typing import Deque, Final
+
+from dt_tools.console._lazy import LOGGER
+
+from dt_tools.console.console_helper import ConsoleHelper
+
+
+class _PaneControl:
+    CLEAR_LINE: Final = '\r\x1b[2K'
+    MAX_PARTIAL: Final = 2048
+    """Longest widget line replayed after a batch."""
+
+
+class LogPane():
+    """
+    Batching log sink, cooperating with live widgets.
+
+    Only one pane is active at a time, starting a pane replaces the active one.
+
+    Keyword Arguments:
+        logger: Loguru logger to add the sink to, None to use the pane as a
+          plain sink (i.e. ``logger.add(pane.write)``) (default: {None}).
+        flush_secs: Interval between batch writes (default: {0.05}).
+        max_pending: Messages held between flushes, oldest are dropped (and
+          reported) beyond it (default: {10_000}).
+        **sink_args: Passed to logger.add() (i.e. level, format, filter).
+          colorize defaults to True.
+    """
+    def __init__(self, logger=None, flush_secs: float = 0.05, max_pending: int = 10_000, **sink_args):
+        self._logger = logger
+        self._sink_args = sink_args
+        self._sink_args.setdefault('colorize', True)
+        self._flush_secs = flush_secs
+        self._max_pending = max(max_pending, 1)
+        self._pending: Deque[str] = collections.deque()
+        self._lock = threading.Lock()
+        self._dropped = 0
+        self._handler_id: int = None
+        self._flusher: threading.Thread = None
+        self._stop = threading.Event()
+        self._partial = ''
+        """Output since the last newline (the live widget line)."""
+        self.batches = 0
+        """Batches written."""
+        self.messages = 0
+        """Log messages written."""
+        self.dropped = 0
+        """Log messages dropped (max_pending exceeded)."""
+
+    def start(self) -> 'LogPane':
+        """Start the pane (and add the loguru sink), returns self."""
+        previous = ConsoleHelper._log_pane
+        if previous is not None and previous is not self:
+            previous.stop()
+        ConsoleHelper._log_pane = self
+        if self._logger is not None and self._handler_id is None:
+            # Bound method: loguru would treat the pane itself as a stream (calling flush()/stop())
+            self._handler_id = self._logger.add(self.write, **self._sink_args)
+        self._stop.clear()
+        self._flusher = threading.Thread(target=self._flush_loop, name='log-pane', daemon=True)
+        self._flusher.start()
+        LOGGER.trace('LogPane started')
+        return self
+
+    def stop(self):
+        """Remove the sink, write pending messages and stop the pane."""
+        if self._handler_id is not None:
+            handler_id, self._handler_id = self._handler_id, None
+            self._logger.remove(handler_id)
+        if self._flusher is not None:
+            self._stop.set()
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+        if ConsoleHelper._log_pane is self:
+            ConsoleHelper._log_pane = None
+
+    def write(self, message: str):
+        """Queue a log message (loguru sink interface)."""
+        with self._lock:
+            if len(self._pending) >= self._max_pending:
+                self._pending.popleft()
+                self._dropped += 1
+            self._pending.append(message)
+
+    def flush(self):
+        """Write queued messages now."""
+        with self._lock:
+            if not self._pending and not self._dropped:
+                return
+            messages = self._pending
+            self._pending = collections.deque()
+            dropped = self._dropped
+            self._dropped = 0
+
+        text = ''.join(messages)
+        if text and not text.endswith('\n'):
+            text += '\n'
+        if dropped:
+            text = f'[{dropped} log messages dropped]\n{text}'
+        with ConsoleHelper._output_lock:
+            # Clear the widget line, log lines scroll up, then repaint the widget once
+            ConsoleHelper._output_to_terminal(f'{_PaneControl.CLEAR_LINE}{text}{self._partial}')
+        self.batches += 1
+        self.messages += len(messages)
+        self.dropped += dropped
+
+    def __enter__(self) -> 'LogPane':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _observe(self, text: str):
+        # Called by ConsoleHelper (output lock held) for each write
+        newline = text.rfind('\n')
+        if newline >= 0:
+            partial = text[newline + 1:]
+        elif not text.strip('\r'):
+            # Cursor return only (i.e. end of a Spinner tick), keep the frame on the line
+            partial = self._partial if self._partial.endswith('\r') else self._partial + '\r'
+        elif text.startswith('\r') or self._partial.endswith('\r'):
+            # New frame over the same line
+            partial = text
+        else:
+            partial = self._partial + text
+        self._partial = partial if len(partial) <= _PaneControl.MAX_PARTIAL else ''
+
+    def _flush_loop(self):
+        while not self._stop.wait(self._flush_secs):
+            try:
+                self.flush()
+            except Exception as ex:
+                LOGGER.debug(f'LogPane flush failed: {repr(ex)}')
+
+
+if __name__ == "__main__":
+    import time
+    from loguru import logger
+    from dt_tools.console.progress_bar import ProgressBar
+
+    logger.remove()
+    with LogPane(logger, format='<green>{time:HH:mm:ss.SSS}</green> | {level: <8} | {message}'):
+        p_bar = ProgressBar('Log burst', bar_length=40, max_increments=200)
+        for incr in range(1, 201):
+            for line in range(10):
+                logger.info(f'Step {incr} detail {line}')
+            p_bar.display_progress(incr)
+            time.sleep(.01)
+    print()
@@ -7,16 +7,49 @@ Message boxes provided:
     - confirm: Confirmation message box with OK/Cancel buttons.  Returns caption of button clicked.
     - prompt: Display message box with text input and OK/Cancel buttons.  Returns text entered, or None if Cancel clicked.
     - password: Displays a passworkd message box and OK/Cancel buttons.  Input is masked. Returns text entered, or None if Cancel clicked.
+    - choice: Searchable list of choices, handles very large lists.  Returns choice(s) selected, or None if Cancel clicked.
+    - form: Several fields (text, password, choice, checkbox) in one message box.  Returns dict of values, or None if Cancel clicked.
+    - progress: Progress bar window (percent, rate, ETA, Cancel button) updated by worker threads.  Returns a ProgressBox handle.
+
+Each message box also has a non-blocking flavor, submit_alert(), submit_confirm(),
+submit_prompt() and submit_password() return a concurrent.futures.Future right away,
+while alert_async(), confirm_async(), prompt_async() and password_async() may be
+awaited from asyncio code.
 
 Features:
     - Ability to set Timeout seconds.  Message box will return 'timeout' when triggered.
     - Confirm message box allows user to customize buttons available.
+    - Dialogs share one hidden Tk root (created on first use, or up front via prewarm()),
+      so back-to-back message boxes display quickly.
+    - Thread safe.  Dialogs may be requested from any thread, they are queued to
+      a dedicated GUI thread which runs the Tk mainloop.
+    - macOS: Tk only works on the main thread, so there is no GUI thread.  Blocking
+      message boxes called from the main thread are displayed on it.  Calls from
+      other threads, the non-blocking flavors and progress() use the console fallback.
+    - Console fallback.  When no display is usable (i.e. headless server, no DISPLAY),
+      the same calls prompt on the console through ConsoleInputHelper's input source,
+      with the same return values (including TIMEOUT_RETURN_VALUE).  The display
+      check is done once and cached, see display_available() and set_console_mode().
 
 """
-import tkinter as tk
-from typing import List, Tuple, Union
+from __future__ import annotations
+
+import abc
+import atexit
+import collections
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
 from enum import Enum
-from loguru import logger as LOGGER
+from dt_tools.console._lazy import LOGGER, lazy_import
+from dt_tools.console.render_hooks import RenderHooks
+
+# tkinter is loaded when the first dialog is displayed
+tk = lazy_import('tkinter')
 
 # This version derived from the below projects:
 
@@ -53,7 +86,6 @@ TODO Roadmap:
 - Be able to specify a custom icon in the message box.
 - Be able to place the message box at an arbitrary position (including on multi screen layouts)
 - Add mouse clicks to unit testing.
-- progress() function to display a progress bar
 - Maybe other types of dialog: open, save, file/folder picker, etc.
 """
 
@@ -92,22 +124,1250 @@ class MB_ButtonType:
 TIMEOUT_RETURN_VALUE = "Timeout"
 """Value returned when MsgBox times out."""
 
-# Initialize some global variables that will be reset later
+class MB_FieldType:
+    """Constants for form() field types."""
+    TEXT = "text"
+    PASSWORD = "password"
+    CHOICE = "choice"
+    CHECKBOX = "checkbox"
+
+
+class FormField(NamedTuple):
+    """
+    Field definition for :func:`form`.
+
+    Attributes:
+        name: Key of the field value in the returned dict.
+        label: Caption displayed next to the field (default: name).
+        type: MB_FieldType (default: {MB_FieldType.TEXT}).
+        default: Initial value, str for text/password/choice, bool for checkbox.
+        choices: Values for a MB_FieldType.CHOICE field.
+        validator: Called with the field value when OK is clicked, returns None
+          if valid, else the error message to display (a ValueError raised by
+          the validator is displayed the same way).
+        mask: Mask character for MB_FieldType.PASSWORD fields (default: {"*"}).
+    """
+    name: str
+    label: str = None
+    type: str = MB_FieldType.TEXT
+    default: Any = None
+    choices: Sequence[str] = None
+    validator: Callable[[Any], Optional[str]] = None
+    mask: str = "*"
+
+# Font settings, used for dialogs created after the change
 _used_font_family = MB_FontFamily.PROPORTIONAL
 _used_font_size = MB_FontSize.PROPORTIONAL.value
-__choiceboxMultipleSelect = None
-__widgetTexts = None
-__replyButtonText = None
-__choiceboxResults = None
-__firstWidget = None
-__enterboxText = None
-__enterboxDefaultText = ""
-__multenterboxText = ""
-choiceboxChoices = None
-choiceboxWidget = None
-entryWidget = None
-boxRoot = None
-buttonsFrame = None
+
+
+class _Dialog(abc.ABC):
+    """
+    Base class for a message box.
+
+    Each dialog holds its own widgets and result.  show() must be called on
+    the thread owning the Tk root; when the dialog finishes (button, timeout,
+    window closed) the window is destroyed and on_close is called with the result.
+    """
+    def __init__(self, title: str = "", timeout: int = None):
+        self._title = "" if title is None else title
+        self._timeout = timeout
+        self._timeout_id: str = None
+        self._on_close: Callable[[Any], None] = None
+        self._span = None
+        self.window: tk.Toplevel = None
+        self.result = None
+
+    @property
+    def trace_name(self) -> str:
+        """Render hook span name (i.e. msgbox.ButtonBox)."""
+        return f'msgbox.{type(self).__name__.lstrip("_")}'
+
+    def show(self, master: tk.Misc, on_close: Callable[[Any], None]):
+        """Build and display dialog as a Toplevel of master."""
+        self._on_close = on_close
+        self._span = RenderHooks.begin(self.trace_name, {'title': self._title})
+        self.window = tk.Toplevel(master=master)
+        self.window.withdraw()
+        self.window.title(self._title)
+        self.window.iconname("Dialog")
+        self.window.geometry(rootWindowPosition)
+        self.window.protocol("WM_DELETE_WINDOW", self._window_closed)
+
+        focus_widget = self._build()
+
+        focus_widget.focus_force()
+        self.window.attributes("-topmost", True)  # agd
+        self.window.deiconify()
+        if self._timeout is not None:
+            self._timeout_id = self.window.after(self._timeout, self._timed_out)
+
+    @property
+    def finished(self) -> bool:
+        return self.window is None and self._on_close is not None
+
+    def close(self, result=None):
+        """Close dialog (GUI thread only), returning result to the caller."""
+        self._finish(result)
+
+    @abc.abstractmethod
+    def _build(self) -> tk.Widget:
+        """Create dialog widgets, return the widget to receive focus."""
+
+    @abc.abstractmethod
+    def run_console(self):
+        """Console version of the dialog (no display), returns the same result as the window would."""
+
+    def _console_header(self, text: str = None):
+        """Print title and message text ahead of the console prompt."""
+        text = self._msg if text is None else text
+        if self._title:
+            _console_print(self._title)
+        if text:
+            _console_print(text)
+
+    def _finish(self, result):
+        if self.window is None:
+            return
+        if self._timeout_id is not None:
+            self.window.after_cancel(self._timeout_id)
+            self._timeout_id = None
+        window, self.window = self.window, None
+        try:
+            window.destroy()
+        except tk.TclError as ex:
+            LOGGER.trace(f'_Dialog._finish()-{repr(ex)}')
+        self.result = result
+        RenderHooks.end(self._span)
+        self._span = None
+        self._on_close(result)
+
+    def _finish_event(self, result) -> str:
+        """Finish from a widget event binding, once the event has been handled."""
+        if self.window is not None:
+            self.window.after_idle(self._finish, result)
+        return "break"
+
+    def _timed_out(self):
+        self._timeout_id = None
+        self._finish(TIMEOUT_RETURN_VALUE)
+
+    def _window_closed(self):
+        self._finish(None)
+
+    def _bind_arrows(self, widget: tk.Widget, skip_arrow_keys: bool = False):
+        widget.bind("<Down>", self._tab_right)
+        widget.bind("<Up>", self._tab_left)
+
+        if not skip_arrow_keys:
+            widget.bind("<Right>", self._tab_right)
+            widget.bind("<Left>", self._tab_left)
+
+    def _tab_right(self, event):
+        self.window.event_generate("<Tab>")
+
+    def _tab_left(self, event):
+        self.window.event_generate("<Shift-Tab>")
+
+
+class _ButtonBox(_Dialog):
+    """Message with a row of buttons, result is the caption of the button clicked."""
+    def __init__(self, msg: str, title: str, choices: Union[List, Tuple], timeout: int = None):
+        super().__init__(title, timeout)
+        self._msg = msg
+        self._choices = choices
+
+    def _build(self) -> tk.Widget:
+        self.window.minsize(400, 100)
+
+        # ------------- define the messageFrame ---------------------------------
+        messageFrame = tk.Frame(master=self.window)
+        messageFrame.pack(side=tk.TOP, fill=tk.BOTH)
+
+        # ------------- define the buttonsFrame ---------------------------------
+        buttonsFrame = tk.Frame(master=self.window)
+        buttonsFrame.pack(side=tk.TOP, fill=tk.BOTH)
+
+        # -------------------- place the widgets in the frames -----------------------
+        messageWidget = tk.Message(messageFrame, text=self._msg, width=MSGBOX_WIDTH)
+        messageWidget.configure(font=(_used_font_family, _used_font_size))
+        messageWidget.pack(side=tk.TOP, expand=tk.YES, fill=tk.X, padx="3m", pady="3m")
+
+        return self._put_buttons_in_buttonframe(buttonsFrame)
+
+    def run_console(self):
+        # Enter selects the first button, as it has the focus in the window
+        self._console_header()
+        choices = [str(choice) for choice in self._choices]
+        return _console_input(f"({'/'.join(choices)}) > ", choices=choices, empty=choices[0], timeout=self._timeout)
+
+    def _put_buttons_in_buttonframe(self, buttonsFrame: tk.Frame) -> tk.Widget:
+        """Put the buttons in the buttons frame, return the first button"""
+        firstWidget = None
+        for buttonText in self._choices:
+            tempButton = tk.Button(buttonsFrame, takefocus=1, text=buttonText)
+            self._bind_arrows(tempButton)
+            tempButton.pack(
+                expand=tk.YES, side=tk.LEFT, padx="1m", pady="1m", ipadx="2m", ipady="1m"
+            )
+
+            # remember the first widget, so we can put the focus there
+            if firstWidget is None:
+                firstWidget = tempButton
+
+            # bind activation events to the activation event handler
+            handler = lambda event, text=buttonText: self._finish_event(text)
+            for selectionEvent in STANDARD_SELECTION_EVENTS:
+                tempButton.bind("<%s>" % selectionEvent, handler)
+
+            if MB_ButtonType.CANCEL in self._choices:
+                tempButton.bind("<Escape>", lambda event: self._finish_event(MB_ButtonType.CANCEL))
+        return firstWidget
+
+
+class _FillableBox(_Dialog):
+    """Message with a text entry field, result is the text entered or None if cancelled."""
+    def __init__(self, msg: str, title: str = "", default: str = "", mask: str = None, timeout: int = None):
+        super().__init__(title, timeout)
+        self._msg = msg
+        self._default = "" if default is None else default
+        self._mask = mask
+        self._entryWidget: tk.Entry = None
+
+    def _build(self) -> tk.Widget:
+        self.window.bind("<Escape>", self._cancel)
+
+        # ------------- define the messageFrame ---------------------------------
+        messageFrame = tk.Frame(master=self.window)
+        messageFrame.pack(side=tk.TOP, fill=tk.BOTH)
+
+        # ------------- define the entryFrame ---------------------------------
+        entryFrame = tk.Frame(master=self.window)
+        entryFrame.pack(side=tk.TOP, fill=tk.BOTH)
+
+        # ------------- define the buttonsFrame ---------------------------------
+        buttonsFrame = tk.Frame(master=self.window)
+        buttonsFrame.pack(side=tk.TOP, fill=tk.BOTH)
+
+        # -------------------- the msg widget ----------------------------
+        messageWidget = tk.Message(messageFrame, width="4.5i", text=self._msg)
+        messageWidget.configure(font=(_used_font_family, _used_font_size))
+        messageWidget.pack(side=tk.RIGHT, expand=1, fill=tk.BOTH, padx="3m", pady="3m")
+
+        # --------- entryWidget ----------------------------------------------
+        self._entryWidget = tk.Entry(entryFrame, width=40)
+        self._bind_arrows(self._entryWidget, skip_arrow_keys=True)
+        self._entryWidget.configure(font=(_used_font_family, MB_FontSize.TEXT.value))
+        if self._mask:
+            self._entryWidget.configure(show=self._mask)
+        self._entryWidget.pack(side=tk.LEFT, padx="3m")
+        self._entryWidget.bind("<Return>", self._ok)
+        self._entryWidget.bind("<Escape>", self._cancel)
+
+        # put text into the entryWidget and have it pre-highlighted
+        if self._default != "":
+            self._entryWidget.insert(0, self._default)
+            self._entryWidget.select_range(0, tk.END)
+
+        self._put_ok_cancel_buttons(buttonsFrame)
+        return self._entryWidget
+
+    def _put_ok_cancel_buttons(self, buttonsFrame: tk.Frame):
+        # ------------------ ok button -------------------------------
+        okButton = tk.Button(buttonsFrame, takefocus=1, text=MB_ButtonType.OK)
+        self._bind_arrows(okButton)
+        okButton.pack(expand=1, side=tk.LEFT, padx="3m", pady="3m", ipadx="2m", ipady="1m")
+        for selectionEvent in STANDARD_SELECTION_EVENTS:
+            okButton.bind("<%s>" % selectionEvent, self._ok)
+
+        # ------------------ cancel button -------------------------------
+        cancelButton = tk.Button(buttonsFrame, takefocus=1, text=MB_ButtonType.CANCEL)
+        self._bind_arrows(cancelButton)
+        cancelButton.pack(
+            expand=1, side=tk.RIGHT, padx="3m", pady="3m", ipadx="2m", ipady="1m"
+        )
+        for selectionEvent in STANDARD_SELECTION_EVENTS:
+            cancelButton.bind("<%s>" % selectionEvent, self._cancel)
+
+    def _ok(self, event):
+        return self._finish_event(self._entryWidget.get())
+
+    def _cancel(self, event):
+        return self._finish_event(None)
+
+    def _restore(self, event):
+        self._entryWidget.delete(0, len(self._entryWidget.get()))
+        self._entryWidget.insert(0, self._default)
+
+    def run_console(self):
+        self._console_header()
+        if self._mask:
+            return _console_input("> ", empty=self._default, timeout=self._timeout, echo=False)
+        shown = f"[{self._default}] " if self._default else ""
+        return _console_input(f"{shown}> ", empty=self._default, timeout=self._timeout)
+
+
+class _FormBox(_FillableBox):
+    """Message with one row per field, result is a dict of field values or None if cancelled."""
+    def __init__(self, msg: str, title: str, fields: Iterable[Union[FormField, dict]], timeout: int = None):
+        super().__init__(msg, title, timeout=timeout)
+        self._fields: List[FormField] = [field if isinstance(field, FormField) else FormField(**field) for field in fields]
+        names = [field.name for field in self._fields]
+        if len(set(names)) != len(names):
+            raise ValueError(f'Duplicate form field names: {names}')
+        self._variables: Dict[str, tk.Variable] = {}
+        self._widgets: Dict[str, tk.Widget] = {}
+        self._errorWidget: tk.Label = None
+
+    def _build(self) -> tk.Widget:
+        from tkinter import ttk
+
+        self.window.bind("<Escape>", self._cancel)
+
+        # ------------- define the messageFrame ---------------------------------
+        messageFrame = tk.Frame(master=self.window)
+        messageFrame.pack(side=tk.TOP, fill=tk.BOTH)
+
+        # ------------- define the fieldsFrame ---------------------------------
+        fieldsFrame = tk.Frame(master=self.window)
+        fieldsFrame.pack(side=tk.TOP, fill=tk.BOTH, padx="3m")
+
+        # ------------- define the buttonsFrame ---------------------------------
+        buttonsFrame = tk.Frame(master=self.window)
+        buttonsFrame.pack(side=tk.TOP, fill=tk.BOTH)
+
+        # -------------------- the msg widget ----------------------------
+        if self._msg:
+            messageWidget = tk.Message(messageFrame, width="4.5i", text=self._msg)
+            messageWidget.configure(font=(_used_font_family, _used_font_size))
+            messageWidget.pack(side=tk.RIGHT, expand=1, fill=tk.BOTH, padx="3m", pady="3m")
+
+        # -------------------- one row per field ----------------------------
+        font = (_used_font_family, MB_FontSize.TEXT.value)
+        firstWidget = None
+        for row, field in enumerate(self._fields):
+            label = tk.Label(fieldsFrame, text=field.name if field.label is None else field.label, anchor=tk.W)
+            label.configure(font=(_used_font_family, _used_font_size))
+            label.grid(row=row, column=0, sticky=tk.W, padx="1m", pady="1m")
+
+            if field.type == MB_FieldType.CHECKBOX:
+                variable = tk.BooleanVar(master=self.window, value=bool(field.default))
+                widget = tk.Checkbutton(fieldsFrame, variable=variable)
+                self._bind_arrows(widget)
+            elif field.type == MB_FieldType.CHOICE:
+                choices = [str(choice) for choice in (field.choices or [])]
+                default = "" if field.default is None else str(field.default)
+                if not default and choices:
+                    default = choices[0]
+                variable = tk.StringVar(master=self.window, value=default)
+                widget = ttk.Combobox(fieldsFrame, textvariable=variable, values=choices, state="readonly", width=38)
+                widget.configure(font=font)
+            elif field.type in (MB_FieldType.TEXT, MB_FieldType.PASSWORD):
+                variable = tk.StringVar(master=self.window, value="" if field.default is None else str(field.default))
+                widget = tk.Entry(fieldsFrame, textvariable=variable, width=40)
+                widget.configure(font=font)
+                if field.type == MB_FieldType.PASSWORD and field.mask:
+                    widget.configure(show=field.mask)
+                self._bind_arrows(widget, skip_arrow_keys=True)
+                widget.bind("<Return>", self._ok)
+            else:
+                raise ValueError(f'Invalid form field type: {field.type}')
+
+            widget.grid(row=row, column=1, sticky=tk.W, padx="1m", pady="1m")
+            self._variables[field.name] = variable
+            self._widgets[field.name] = widget
+            if firstWidget is None:
+                firstWidget = widget
+
+        # -------------------- validation errors ----------------------------
+        self._errorWidget = tk.Label(fieldsFrame, text="", fg="red", anchor=tk.W)
+        self._errorWidget.grid(row=len(self._fields), column=0, columnspan=2, sticky=tk.W, padx="1m")
+
+        self._put_ok_cancel_buttons(buttonsFrame)
+        if isinstance(firstWidget, tk.Entry) and self._fields[0].default:
+            firstWidget.select_range(0, tk.END)
+        return firstWidget
+
+    def _values(self) -> Dict[str, Any]:
+        return {name: variable.get() for name, variable in self._variables.items()}
+
+    def _validate(self, values: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """Run field validators, return (field name, error message) for the first failure, None if all valid."""
+        for field in self._fields:
+            error = self._validate_field(field, values[field.name])
+            if error:
+                return field.name, error
+        return None
+
+    def _validate_field(self, field: FormField, value: Any) -> Optional[str]:
+        if field.validator is None:
+            return None
+        try:
+            error = field.validator(value)
+        except (TypeError, ValueError) as ex:
+            error = str(ex) or repr(ex)
+        return str(error) if error else None
+
+    def _ok(self, event):
+        values = self._values()
+        failure = self._validate(values)
+        if failure is not None:
+            name, error = failure
+            self._errorWidget.configure(text=error)
+            self._widgets[name].focus_set()
+            return "break"
+        return self._finish_event(values)
+
+    def run_console(self):
+        self._console_header(self._msg)
+        deadline = None if self._timeout is None else time.monotonic() + self._timeout / 1000
+        values = {}
+        for field in self._fields:
+            label = field.name if field.label is None else field.label
+            while True:
+                timeout = None if deadline is None else max(0, int((deadline - time.monotonic()) * 1000))
+                if field.type == MB_FieldType.CHECKBOX:
+                    default = 'y' if field.default else 'n'
+                    resp = _console_input(f"{label} (y/n) [{default}] > ", choices=['y', 'n'], empty=default, timeout=timeout)
+                elif field.type == MB_FieldType.CHOICE:
+                    choices = [str(choice) for choice in (field.choices or [])]
+                    default = str(field.default) if field.default is not None else (choices[0] if choices else "")
+                    resp = _console_input(f"{label} ({'/'.join(choices)}) [{default}] > ", choices=choices,
+                                          empty=default, timeout=timeout)
+                elif field.type in (MB_FieldType.TEXT, MB_FieldType.PASSWORD):
+                    default = "" if field.default is None else str(field.default)
+                    masked = field.type == MB_FieldType.PASSWORD
+                    shown = f" [{default}]" if default and not masked else ""
+                    resp = _console_input(f"{label}{shown} > ", empty=default, timeout=timeout, echo=not masked)
+                else:
+                    raise ValueError(f'Invalid form field type: {field.type}')
+
+                if resp is None or resp == TIMEOUT_RETURN_VALUE:
+                    return resp
+                if field.type == MB_FieldType.CHECKBOX:
+                    resp = resp == 'y'
+                values[field.name] = resp
+                failure = self._validate_field(field, resp)
+                if failure is None:
+                    break
+                _console_print(f'  {failure}')
+        return values
+
+    def _restore(self, event):
+        for field in self._fields:
+            default = field.default
+            if field.type == MB_FieldType.CHECKBOX:
+                self._variables[field.name].set(bool(default))
+            else:
+                self._variables[field.name].set("" if default is None else str(default))
+
+
+class _ChoiceFilter():
+    """
+    Case-insensitive substring filter over a large list of choices.
+
+    The lowercase index is built once.  Results for each filter text are kept
+    on a stack, so typing another character only rescans the previous matches
+    and deleting a character pops back to an earlier result.
+    """
+    def __init__(self, choices: Iterable[Any]):
+        self.choices: List[str] = [str(choice) for choice in choices]
+        self._index: List[str] = [choice.casefold() for choice in self.choices]
+        self._history: List[Tuple[str, Sequence[int]]] = [("", range(len(self.choices)))]
+
+    def filter(self, text: str) -> Sequence[int]:
+        """Return the indexes of the choices containing text."""
+        key = text.casefold()
+        history = self._history
+        while len(history) > 1 and not key.startswith(history[-1][0]):
+            history.pop()
+        base_key, base = history[-1]
+        if key == base_key:
+            return base
+        index = self._index
+        matches = [idx for idx in base if key in index[idx]]
+        history.append((key, matches))
+        return matches
+
+
+class _ChoiceBox(_FillableBox):
+    """
+    Filter entry above a virtual list of choices, result is the choice (or list of choices) selected.
+
+    Only the visible rows are loaded into the Listbox, the scrollbar and
+    navigation keys move a window over the filtered matches.
+    """
+    _ROWS = 15
+    _MARK = ("[ ] ", "[x] ")
+
+    def __init__(self, msg: str, title: str, choices: Iterable[Any], default: str = None,
+                 multiple: bool = False, timeout: int = None):
+        super().__init__(msg, title, default="", timeout=timeout)
+        self._filter = _ChoiceFilter(choices)
+        self._multiple = multiple
+        self._matches: Sequence[int] = self._filter.filter("")
+        self._top = 0
+        self._cursor = 0
+        self._selected: set = set()
+        self._filter_id: str = None
+        self._listWidget: tk.Listbox = None
+        self._scrollWidget: tk.Scrollbar = None
+        self._countWidget: tk.Label = None
+        if default is not None:
+            try:
+                self._cursor = self._filter.choices.index(str(default))
+            except ValueError:
+                pass
+
+    def _build(self) -> tk.Widget:
+        self.window.bind("<Escape>", self._cancel)
+
+        # ------------- define the messageFrame ---------------------------------
+        messageFrame = tk.Frame(master=self.window)
+        messageFrame.pack(side=tk.TOP, fill=tk.BOTH)
+
+        # ------------- define the entryFrame ---------------------------------
+        entryFrame = tk.Frame(master=self.window)
+        entryFrame.pack(side=tk.TOP, fill=tk.BOTH, padx="3m")
+
+        # ------------- define the listFrame ---------------------------------
+        listFrame = tk.Frame(master=self.window)
+        listFrame.pack(side=tk.TOP, fill=tk.BOTH, expand=tk.YES, padx="3m")
+
+        # ------------- define the buttonsFrame ---------------------------------
+        buttonsFrame = tk.Frame(master=self.window)
+        buttonsFrame.pack(side=tk.TOP, fill=tk.BOTH)
+
+        # -------------------- the msg widget ----------------------------
+        messageWidget = tk.Message(messageFrame, width="4.5i", text=self._msg)
+        messageWidget.configure(font=(_used_font_family, _used_font_size))
+        messageWidget.pack(side=tk.RIGHT, expand=1, fill=tk.BOTH, padx="3m", pady="3m")
+
+        # --------- filter entry + match count ----------------------------------
+        self._entryWidget = tk.Entry(entryFrame, width=40)
+        self._entryWidget.configure(font=(_used_font_family, MB_FontSize.TEXT.value))
+        self._entryWidget.pack(side=tk.LEFT, fill=tk.X, expand=tk.YES)
+        self._countWidget = tk.Label(entryFrame, anchor=tk.E, font=(_used_font_family, _used_font_size))
+        self._countWidget.pack(side=tk.RIGHT, padx="1m")
+
+        self._entryWidget.bind("<KeyRelease>", self._filter_changed)
+        self._entryWidget.bind("<Return>", self._ok)
+        self._entryWidget.bind("<Escape>", self._cancel)
+        self._entryWidget.bind("<Down>", lambda event: self._move(1))
+        self._entryWidget.bind("<Up>", lambda event: self._move(-1))
+        self._entryWidget.bind("<Next>", lambda event: self._move(self._ROWS))
+        self._entryWidget.bind("<Prior>", lambda event: self._move(-self._ROWS))
+        if self._multiple:
+            self._entryWidget.bind("<Control-space>", self._toggle_cursor)
+            self._entryWidget.bind("<Insert>", self._toggle_cursor)
+
+        # --------- virtual list ----------------------------------------------
+        self._listWidget = tk.Listbox(listFrame, height=self._ROWS, width=50, activestyle=tk.NONE,
+                                      exportselection=False, takefocus=0)
+        self._listWidget.configure(font=(_used_font_family, MB_FontSize.TEXT.value))
+        self._scrollWidget = tk.Scrollbar(listFrame, orient=tk.VERTICAL, command=self._scrolled)
+        self._listWidget.pack(side=tk.LEFT, fill=tk.BOTH, expand=tk.YES)
+        self._scrollWidget.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self._listWidget.bind("<Button-1>", self._clicked)
+        self._listWidget.bind("<Double-Button-1>", self._ok)
+        self._listWidget.bind("<MouseWheel>", lambda event: self._scroll_rows(-1 if event.delta > 0 else 1))
+        self._listWidget.bind("<Button-4>", lambda event: self._scroll_rows(-1))
+        self._listWidget.bind("<Button-5>", lambda event: self._scroll_rows(1))
+
+        self._put_ok_cancel_buttons(buttonsFrame)
+        self._move(0)
+        return self._entryWidget
+
+    # -------------------- filtering / navigation ----------------------------
+    def _filter_changed(self, event):
+        # Coalesce a burst of keystrokes into one filter pass
+        if self._filter_id is None:
+            self._filter_id = self.window.after(30, self._apply_filter)
+
+    def _apply_filter(self):
+        self._filter_id = None
+        if self.window is None:
+            return
+        matches = self._filter.filter(self._entryWidget.get())
+        if matches is not self._matches:
+            self._matches = matches
+            self._top = 0
+            self._cursor = 0
+            self._render()
+
+    def _move(self, delta: int) -> str:
+        count = len(self._matches)
+        self._cursor = max(0, min(count - 1, self._cursor + delta))
+        if self._cursor < self._top:
+            self._top = self._cursor
+        elif self._cursor >= self._top + self._ROWS:
+            self._top = self._cursor - self._ROWS + 1
+        self._render()
+        return "break"
+
+    def _scroll_rows(self, rows: int) -> str:
+        self._set_top(self._top + rows)
+        return "break"
+
+    def _scrolled(self, action: str, *args):
+        if action == tk.MOVETO:
+            self._set_top(int(float(args[0]) * len(self._matches)))
+        elif action == tk.SCROLL:
+            step = self._ROWS if args[1] == tk.PAGES else 1
+            self._set_top(self._top + int(args[0]) * step)
+
+    def _set_top(self, top: int):
+        self._top = max(0, min(top, len(self._matches) - self._ROWS))
+        self._cursor = max(self._top, min(self._cursor, self._top + self._ROWS - 1))
+        self._render()
+
+    def _render(self):
+        count = len(self._matches)
+        visible = self._matches[self._top:self._top + self._ROWS]
+        choices = self._filter.choices
+        if self._multiple:
+            rows = [self._MARK[idx in self._selected] + choices[idx] for idx in visible]
+        else:
+            rows = [choices[idx] for idx in visible]
+        self._listWidget.delete(0, tk.END)
+        if rows:
+            self._listWidget.insert(tk.END, *rows)
+            self._listWidget.selection_set(self._cursor - self._top)
+        if count:
+            self._scrollWidget.set(self._top / count, min(1.0, (self._top + self._ROWS) / count))
+        else:
+            self._scrollWidget.set(0.0, 1.0)
+        self._countWidget.configure(text=f'{count:,} of {len(choices):,}')
+
+    # -------------------- selection ----------------------------
+    def _clicked(self, event) -> str:
+        row = self._listWidget.nearest(event.y)
+        if 0 <= row < len(self._matches) - self._top:
+            self._cursor = self._top + row
+            if self._multiple:
+                self._toggle_cursor()
+            else:
+                self._render()
+        return "break"
+
+    def _toggle_cursor(self, event=None) -> str:
+        if self._matches:
+            idx = self._matches[self._cursor]
+            self._selected.symmetric_difference_update((idx,))
+            self._render()
+        return "break"
+
+    def _ok(self, event):
+        if self._filter_id is not None:
+            # filter text typed but not applied yet
+            self.window.after_cancel(self._filter_id)
+            self._apply_filter()
+        return self._finish_event(self._result())
+
+    def _result(self):
+        choices = self._filter.choices
+        if self._multiple:
+            selected = self._selected or ([self._matches[self._cursor]] if self._matches else [])
+            return [choices[idx] for idx in sorted(selected)]
+        if not self._matches:
+            return None
+        return choices[self._matches[self._cursor]]
+
+    def run_console(self):
+        # Large lists are not printed, Tab completes and lists candidates for partial input
+        self._console_header()
+        choices = self._filter.choices
+        for choice in choices[:_CONSOLE_MAX_LIST]:
+            _console_print(f'  {choice}')
+        if len(choices) > _CONSOLE_MAX_LIST:
+            _console_print(f'  ... ({len(choices) - _CONSOLE_MAX_LIST:,} more, Tab to complete)')
+        default = choices[self._cursor] if choices else ""
+        if not self._multiple:
+            return _console_input(f"[{default}] > ", choices=choices, empty=default, timeout=self._timeout)
+
+        index = _console_index(choices)
+        while True:
+            resp = _console_input(f"comma separated [{default}] > ", empty=default, timeout=self._timeout)
+            if resp is None or resp == TIMEOUT_RETURN_VALUE:
+                return resp
+            selected, invalid = [], []
+            for entry in resp.split(','):
+                entry = entry.strip()
+                if entry:
+                    match = index.match(entry)
+                    (invalid if match is None else selected).append(entry if match is None else match)
+            if not invalid:
+                return selected
+            _console_print(f"  Invalid: {', '.join(invalid)}")
+
+    def _finish(self, result):
+        if self._filter_id is not None and self.window is not None:
+            self.window.after_cancel(self._filter_id)
+            self._filter_id = None
+        super()._finish(result)
+
+
+class _ProgressBox(_Dialog):
+    """
+    Progress bar with percent, rate and ETA, updated from a queue.
+
+    Worker threads only put (op, value) tuples on the queue.  The dialog drains
+    the queue on a fixed after() tick, folds all pending updates into the
+    current state and repaints at most once per tick, so the number of updates
+    never affects the Tk event loop.
+    """
+    _TICK_MS = 100
+    _MAX_DRAIN = 100_000
+    """Updates applied per tick, the remainder is picked up on the next tick."""
+    _RATE_WINDOW_SECS = 5.0
+
+    # Update operations
+    ADVANCE = 0
+    COMPLETED = 1
+    TOTAL = 2
+    MESSAGE = 3
+    CLOSE = 4
+
+    def __init__(self, msg: str, title: str, total: int, updates: queue.SimpleQueue, cancellable: bool = True):
+        super().__init__(title, timeout=None)
+        self._msg = msg
+        self._total = total
+        self._completed = 0
+        self._updates = updates
+        self._cancellable = cancellable
+        self._started = time.monotonic()
+        self._samples: collections.deque = collections.deque()
+        self._tick_id: str = None
+        self._messageWidget: tk.Message = None
+        self._bar = None
+        self._statusWidget: tk.Label = None
+
+    def _build(self) -> tk.Widget:
+        from tkinter import ttk
+
+        self.window.minsize(400, 100)
+
+        # ------------- define the messageFrame ---------------------------------
+        messageFrame = tk.Frame(master=self.window)
+        messageFrame.pack(side=tk.TOP, fill=tk.BOTH)
+
+        # ------------- define the barFrame ---------------------------------
+        barFrame = tk.Frame(master=self.window)
+        barFrame.pack(side=tk.TOP, fill=tk.BOTH)
+
+        # -------------------- place the widgets in the frames -----------------------
+        self._messageWidget = tk.Message(messageFrame, text=self._msg, width=MSGBOX_WIDTH)
+        self._messageWidget.configure(font=(_used_font_family, _used_font_size))
+        self._messageWidget.pack(side=tk.TOP, expand=tk.YES, fill=tk.X, padx="3m", pady="3m")
+
+        self._bar = ttk.Progressbar(barFrame, orient=tk.HORIZONTAL, length=MSGBOX_WIDTH - 20)
+        self._bar.pack(side=tk.TOP, padx="3m")
+        self._statusWidget = tk.Label(barFrame, anchor=tk.W, font=(_used_font_family, _used_font_size))
+        self._statusWidget.pack(side=tk.TOP, fill=tk.X, padx="3m", pady="1m")
+        self._repaint()
+
+        focus_widget = self._bar
+        if self._cancellable:
+            buttonsFrame = tk.Frame(master=self.window)
+            buttonsFrame.pack(side=tk.TOP, fill=tk.BOTH)
+            cancelButton = tk.Button(buttonsFrame, takefocus=1, text=MB_ButtonType.CANCEL)
+            cancelButton.pack(expand=tk.YES, side=tk.TOP, padx="1m", pady="1m", ipadx="2m", ipady="1m")
+            for selectionEvent in STANDARD_SELECTION_EVENTS:
+                cancelButton.bind("<%s>" % selectionEvent, self._cancel)
+            self.window.bind("<Escape>", self._cancel)
+            focus_widget = cancelButton
+
+        self._tick_id = self.window.after(self._TICK_MS, self._tick)
+        return focus_widget
+
+    def _tick(self):
+        self._tick_id = None
+        if self.window is None:
+            return
+        changed, closing = self._drain()
+        if closing:
+            self._finish(MB_ButtonType.OK)
+            return
+        if changed:
+            self._repaint()
+        self._tick_id = self.window.after(self._TICK_MS, self._tick)
+
+    def _drain(self) -> Tuple[bool, bool]:
+        """Apply pending updates, return (state changed, close requested)."""
+        changed = False
+        get = self._updates.get_nowait
+        for _ in range(self._MAX_DRAIN):
+            try:
+                op, value = get()
+            except queue.Empty:
+                break
+            changed = True
+            if op == self.ADVANCE:
+                self._completed += value
+            elif op == self.COMPLETED:
+                self._completed = value
+            elif op == self.TOTAL:
+                self._total = value
+            elif op == self.MESSAGE:
+                self._msg = value
+            elif op == self.CLOSE:
+                return changed, True
+        return changed, False
+
+    def _status(self, now: float) -> Tuple[float, str]:
+        """Return (percent complete or None if total unknown, status text)."""
+        samples = self._samples
+        samples.append((now, self._completed))
+        while len(samples) > 2 and now - samples[0][0] > self._RATE_WINDOW_SECS:
+            samples.popleft()
+        first_time, first_completed = samples[0]
+        if now > first_time:
+            rate = (self._completed - first_completed) / (now - first_time)
+        else:
+            elapsed = now - self._started
+            rate = self._completed / elapsed if elapsed > 0 else 0.0
+
+        if not self._total:
+            return None, f'{self._completed:,}  {rate:,.1f}/s'
+
+        percent = min(100.0, self._completed * 100.0 / self._total)
+        if rate > 0:
+            eta = _format_duration(max(0, self._total - self._completed) / rate)
+        else:
+            eta = '--:--:--'
+        return percent, f'{percent:5.1f}%  {self._completed:,}/{self._total:,}  {rate:,.1f}/s  ETA {eta}'
+
+    def _repaint(self):
+        percent, status = self._status(time.monotonic())
+        if self._messageWidget.cget('text') != self._msg:
+            self._messageWidget.configure(text=self._msg)
+        if percent is None:
+            if str(self._bar.cget('mode')) != 'indeterminate':
+                self._bar.configure(mode='indeterminate')
+            self._bar.step()
+        else:
+            if str(self._bar.cget('mode')) != 'determinate':
+                self._bar.configure(mode='determinate', maximum=100)
+            self._bar['value'] = percent
+        self._statusWidget.configure(text=status)
+
+    def _finish(self, result):
+        if self._tick_id is not None and self.window is not None:
+            self.window.after_cancel(self._tick_id)
+            self._tick_id = None
+        super()._finish(result)
+
+    def _cancel(self, event=None):
+        return self._finish_event(MB_ButtonType.CANCEL)
+
+    def _window_closed(self):
+        self._finish(MB_ButtonType.CANCEL)
+
+    def run_console(self):
+        # Same queue and tick, rendered as a status line which is rewritten in place
+        self._console_header("")
+        closing = False
+        shown_msg = None
+        while not closing:
+            time.sleep(self._TICK_MS / 1000)
+            _, closing = self._drain()
+            percent, status = self._status(time.monotonic())
+            if self._msg != shown_msg:
+                if shown_msg is not None:
+                    _console_print()
+                shown_msg = self._msg
+            bar = '' if percent is None else '[' + ('#' * int(percent / 5)).ljust(20) + '] '
+            _console_print(f'\r{self._msg} {bar}{status}\x1b[K', eol='')
+        _console_print()
+        return MB_ButtonType.OK
+
+
+def _format_duration(secs: float) -> str:
+    secs = int(secs + 0.5)
+    return f'{secs // 3600}:{secs // 60 % 60:02d}:{secs % 60:02d}'
+
+
+_CONSOLE_MAX_LIST = 20
+"""Max choices listed by the console fallback."""
+
+
+def _console_index(choices: Sequence[str]):
+    from dt_tools.console.response_index import ResponseIndex
+    return ResponseIndex(choices, case_sensitive=False, allow_prefix=True)
+
+
+def _console_print(text: str = '', eol: str = '\n'):
+    """Console fallback output, written through ConsoleHelper (output target, recorder, log pane)."""
+    from dt_tools.console.console_helper import ConsoleHelper
+    ConsoleHelper._output_to_terminal(text, eol=eol)
+
+
+def _console_input(prompt: str, choices: Sequence[str] = None, empty: str = "", timeout: int = None, echo: bool = True):
+    """
+    Console fallback prompt, reads through ConsoleInputHelper's input source.
+
+    Arguments:
+        prompt: Prompt text.
+
+    Keyword Arguments:
+        choices: Valid responses, case-insensitive, unique prefix accepted (default: {None} - any).
+        empty: Value returned for a blank response (default: {""})
+        timeout: Milliseconds to wait for a response (default: {None} - no timeout)
+        echo: Echo the response (default: {True})
+
+    Returns:
+        Response (as listed in choices), TIMEOUT_RETURN_VALUE on timeout, None on end of input (i.e. ctrl-d).
+    """
+    from dt_tools.console.console_helper import ConsoleInputHelper
+    from dt_tools.console.input_source import TerminalInputSource
+
+    source = ConsoleInputHelper.get_input_source()
+    index = _console_index(choices) if choices else None
+    completer = ConsoleInputHelper._completer(index) if index else None
+    timeout_secs = -1 if timeout is None else timeout / 1000
+    while True:
+        try:
+            resp = source.read_line(prompt, timeout_secs=timeout_secs, default=TIMEOUT_RETURN_VALUE,
+                                    completer=completer, echo=echo)
+        except TimeoutError:
+            return TIMEOUT_RETURN_VALUE
+        except EOFError:
+            if echo:
+                _console_print()
+            return None
+        finally:
+            if not echo and isinstance(source, TerminalInputSource):
+                _console_print()
+        resp = resp.strip()
+        if not resp:
+            return empty
+        if index is None:
+            return resp
+        valid, resp = ConsoleInputHelper._validate_response(resp, index)
+        if valid:
+            return resp
+
+
+class _DialogManager():
+    """
+    Owner of the GUI thread and the hidden Tk root shared by all message boxes.
+
+    Tk must only be used from the thread which created it, so one daemon GUI
+    thread creates the root and runs the mainloop.  Dialog requests from any
+    thread are put on a queue, the GUI thread drains the queue on a short
+    after() tick, displays each dialog as a Toplevel, and delivers the result
+    through a Future.
+
+    Dialogs for a caller supplied root are run on the caller's thread (the
+    caller owns that Tk interpreter).
+
+    On macOS (_MAIN_THREAD_TK) the root is created on the main thread and
+    dialogs run there, modally, other threads get the console fallback.
+    """
+    _MAIN_THREAD_TK = sys.platform == 'darwin'
+    """Tk may only be used from the main thread (macOS), no GUI thread."""
+    _POLL_MS = 20
+    _CANCEL_CHECK_MS = 100
+    _SHUTDOWN = object()
+
+    _root: tk.Tk = None
+    _thread: threading.Thread = None
+    _requests: queue.Queue = queue.Queue()
+    _lock = threading.Lock()
+    _ready = threading.Event()
+    _start_error: BaseException = None
+    _display: bool = None
+    """Cached result of display_available()."""
+    _console_mode: bool = None
+    """Forced mode, see set_console_mode()."""
+
+    @classmethod
+    def display_available(cls) -> bool:
+        """True if message boxes can be displayed, checked once and cached."""
+        if cls._console_mode is not None:
+            return not cls._console_mode
+        if cls._MAIN_THREAD_TK and threading.current_thread() is not threading.main_thread():
+            return False
+        if cls._display is None:
+            with cls._lock:
+                if cls._display is None:
+                    cls._display = cls._check_display()
+        return cls._display
+
+    @classmethod
+    def _check_display(cls) -> bool:
+        if sys.platform not in ('win32', 'darwin') and not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+            LOGGER.debug('msgbox - no DISPLAY, using console')
+            return False
+        try:
+            cls._start_locked()
+        except Exception as ex:
+            LOGGER.debug(f'msgbox - display not usable, using console: {repr(ex)}')
+            return False
+        return True
+
+    @classmethod
+    def submit(cls, dialog: _Dialog) -> Future:
+        """
+        Queue dialog for display on the GUI thread, the Future receives the result.
+
+        The Future stays pending while the dialog is displayed, so it may be
+        cancelled at any time.  Cancelling closes the dialog.
+        """
+        if cls._MAIN_THREAD_TK or not cls.display_available():
+            # macOS: no GUI thread to display the dialog while the caller continues
+            return cls._submit_console(dialog)
+
+        future = Future()
+
+        def _deliver(result):
+            try:
+                if not future.cancelled():
+                    future.set_result(result)
+            except InvalidStateError:
+                pass  # cancelled by another thread in the meantime
+
+        def _watch_cancel():
+            if dialog.finished:
+                return
+            if future.cancelled():
+                dialog.close(None)
+            else:
+                cls._root.after(cls._CANCEL_CHECK_MS, _watch_cancel)
+
+        def _show(root: tk.Tk):
+            dialog.show(root, _deliver)
+            root.after(cls._CANCEL_CHECK_MS, _watch_cancel)
+
+        cls._submit(_show, future)
+        return future
+
+    @classmethod
+    def call(cls, func: Callable[[tk.Tk], Any]) -> Future:
+        """Run func(root) on the GUI thread, the Future receives the return value."""
+        future = Future()
+
+        def _call(root: tk.Tk):
+            if future.set_running_or_notify_cancel():
+                future.set_result(func(root))
+
+        if cls._MAIN_THREAD_TK:
+            cls._ensure_started()
+        if threading.current_thread() is cls._thread:
+            _call(cls._root)
+        else:
+            cls._submit(_call, future)
+        return future
+
+    @classmethod
+    def run(cls, dialog: _Dialog, root: tk.Misc = None):
+        """Display dialog and wait for the result."""
+        if root is None and not cls.display_available():
+            return cls._run_console(dialog)
+        if root is None and cls._MAIN_THREAD_TK:
+            cls._ensure_started()
+        if root is not None or threading.current_thread() is cls._thread:
+            return cls._run_local(dialog, cls._root if root is None else root)
+        return cls.submit(dialog).result()
+
+    @classmethod
+    def prewarm(cls):
+        """Start the GUI thread and lay out a throw-away dialog so fonts and widget classes are loaded."""
+        if not cls.display_available():
+            return
+        def _layout(root: tk.Tk):
+            dialog = tk.Toplevel(master=root)
+            dialog.withdraw()
+            tk.Message(dialog, text='', width=MSGBOX_WIDTH, font=(_used_font_family, _used_font_size)).pack()
+            tk.Entry(dialog, font=(_used_font_family, MB_FontSize.TEXT.value)).pack()
+            tk.Button(dialog, text=MB_ButtonType.OK).pack()
+            dialog.update_idletasks()
+            dialog.destroy()
+
+        cls.call(_layout).result()
+
+    @classmethod
+    def shutdown(cls, timeout: float = 2.0):
+        """Stop the GUI thread and destroy the shared root."""
+        if cls._MAIN_THREAD_TK:
+            with cls._lock:
+                if cls._root is not None and threading.current_thread() is cls._thread:
+                    cls._root.destroy()
+                    cls._root = None
+                    cls._thread = None
+            return
+        with cls._lock:
+            thread = cls._thread
+            if thread is None:
+                return
+            cls._requests.put((cls._SHUTDOWN, None))
+        if thread is not threading.current_thread():
+            thread.join(timeout)
+
+    @classmethod
+    def _run_local(cls, dialog: _Dialog, master: tk.Misc):
+        user_root = master is not cls._root
+        if user_root:
+            master.withdraw()
+        dialog.show(master, lambda result: None)
+        if not dialog.finished:
+            master.wait_window(dialog.window)
+        if user_root:
+            master.deiconify()
+        return dialog.result
+
+    @classmethod
+    def _submit(cls, action: Callable[[tk.Tk], None], future: Future):
+        cls._ensure_started()
+        cls._requests.put((action, future))
+
+    @classmethod
+    def _submit_console(cls, dialog: _Dialog) -> Future:
+        """Run the console version of dialog on a worker thread."""
+        future = Future()
+
+        def _run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(cls._run_console(dialog))
+            except BaseException as ex:
+                future.set_exception(ex)
+
+        threading.Thread(target=_run, name='msgbox-console', daemon=True).start()
+        return future
+
+    @classmethod
+    def _run_console(cls, dialog: _Dialog):
+        span = RenderHooks.begin(dialog.trace_name, {'title': dialog._title, 'console': True})
+        try:
+            return dialog.run_console()
+        finally:
+            RenderHooks.end(span)
+
+    @classmethod
+    def _ensure_started(cls):
+        with cls._lock:
+            cls._start_locked()
+
+    @classmethod
+    def _start_locked(cls):
+        if cls._MAIN_THREAD_TK:
+            # Only reached on the main thread (see display_available())
+            if cls._root is None:
+                LOGGER.trace('_DialogManager - create Tk root on main thread')
+                cls._root = tk.Tk()
+                cls._root.withdraw()
+                cls._thread = threading.current_thread()
+            return
+        if cls._thread is None or not cls._thread.is_alive():
+            cls._ready.clear()
+            cls._start_error = None
+            cls._thread = threading.Thread(target=cls._gui_thread, name='msgbox-gui', daemon=True)
+            cls._thread.start()
+            cls._ready.wait()
+            if cls._start_error is not None:
+                cls._thread = None
+                raise cls._start_error
+
+    @classmethod
+    def _gui_thread(cls):
+        try:
+            LOGGER.trace('_DialogManager - create Tk root')
+            cls._root = tk.Tk()
+            cls._root.withdraw()
+        except Exception as ex:
+            cls._start_error = ex
+            cls._ready.set()
+            return
+
+        atexit.register(cls.shutdown)
+        cls._ready.set()
+        cls._root.after(cls._POLL_MS, cls._poll)
+        cls._root.mainloop()
+        try:
+            cls._root.destroy()
+        except tk.TclError as ex:
+            LOGGER.trace(f'_DialogManager._gui_thread()-{repr(ex)}')
+        cls._root = None
+        atexit.unregister(cls.shutdown)
+        with cls._lock:
+            cls._thread = None
+        cls._fail_pending(RuntimeError('Message box GUI thread stopped.'))
+
+    @classmethod
+    def _poll(cls):
+        while True:
+            try:
+                action, future = cls._requests.get_nowait()
+            except queue.Empty:
+                break
+            if action is cls._SHUTDOWN:
+                cls._root.quit()
+                return
+            if future.cancelled():
+                continue
+            try:
+                action(cls._root)
+            except Exception as ex:
+                LOGGER.warning(f'Message box failed: {repr(ex)}')
+                try:
+                    future.set_exception(ex)
+                except InvalidStateError:
+                    pass
+        cls._root.after(cls._POLL_MS, cls._poll)
+
+    @classmethod
+    def _fail_pending(cls, ex: BaseException):
+        while True:
+            try:
+                action, future = cls._requests.get_nowait()
+            except queue.Empty:
+                break
+            if future is not None and not future.done():
+                try:
+                    future.set_exception(ex)
+                except InvalidStateError:
+                    pass
+
+
+def prewarm():
+    """
+    Create the message box Tk root ahead of time.
+
+    Optional, call at application startup so the first message box appears
+    as quickly as later ones.
+    """
+    _DialogManager.prewarm()
+
+
+def shutdown():
+    """Stop the message box GUI thread (it is re-started on next use)."""
+    _DialogManager.shutdown()
+
+
+def display_available() -> bool:
+    """
+    Check if message boxes can be displayed.
+
+    Checked on first use and cached.  On Linux, no DISPLAY/WAYLAND_DISPLAY
+    means no display (Tk is not started), otherwise the Tk root is created
+    and any failure means no display.
+
+    Returns:
+        True for message box windows, False if console prompts are used.
+    """
+    return _DialogManager.display_available()
+
+
+def set_console_mode(enabled: bool = True):
+    """
+    Force message boxes to the console (True) or to windows (False).
+
+    Arguments:
+        enabled: True for console prompts, False for windows, None to auto-detect (default: {True})
+    """
+    _DialogManager._console_mode = enabled
 
 
 def set_font(family: MB_FontFamily, size: MB_FontSize = MB_FontSize.DEFAULT):
@@ -226,299 +1486,365 @@ def _passwordTkinter(text="", title="", default="", mask="*", root=None, timeout
 password = _passwordTkinter
 
 
-def timeoutBoxRoot():
-    global boxRoot, __replyButtonText, __enterboxText
-    try:
-        boxRoot.destroy() # timeoutBoxRoot
-    except Exception as ex:
-        LOGGER.trace(f'timeoutBoxRoot()-{repr(ex)}')
+def _choiceTkinter(text="", title="", choices=(), default=None, multiple=False, root=None, timeout=None):
+    """
+    Displays a message box with a searchable list of choices, and OK & Cancel buttons.
 
-    __replyButtonText = TIMEOUT_RETURN_VALUE
-    __enterboxText = TIMEOUT_RETURN_VALUE
+    Typing in the filter field narrows the list to choices containing the
+    text (case-insensitive).  Up/Down/PgUp/PgDn move the selection, Enter or
+    double-click accepts.  For multiple selections click rows, or press
+    Ctrl+Space/Insert, to toggle them.
 
+    Only the visible rows are drawn, so lists of 100,000+ choices stay responsive.
 
-def _buttonbox(msg: str, title: str, choices: Union[List,Tuple], root=None, timeout=None):
+    Keyword Arguments:
+        text: Text content of the message box (default: {""})
+        title: Title bar text (default: {""})
+        choices: List of choices (default: {()})
+        default: Initially selected choice (default: {None})
+        multiple: Allow more than one choice to be selected (default: {False})
+        root: Base window (default: {None})
+        timeout: Number of seconds to display box (default: {None})
+
+    Returns:
+        The choice selected (list of choices if multiple), or None if Cancel was clicked.
     """
-    Display a msg, a title, and a set of buttons.
+    dialog = _ChoiceBox(str(text), title, choices, default=default, multiple=multiple, timeout=timeout)
+    return _DialogManager.run(dialog, root=root)
 
-    The buttons are defined by the members of the choices list.
+choice = _choiceTkinter
 
-    Arguments:
-        msg: Text content of the message box
-        title: Title bar text
-        choices: A list or tuple of the choices to be displayed
+
+def _formTkinter(text="", title="", fields=(), root=None, timeout=None):
+    """
+    Displays a message box with several input fields, and OK & Cancel buttons.
+
+    Collects all values in one window, instead of a series of prompt()/password() calls.
+    When OK is clicked each field validator is run, on failure the error is
+    displayed and the box stays open.
 
     Keyword Arguments:
+        text: Text content of the message box (default: {""})
+        title: Title bar text (default: {""})
+        fields: List of FormField (or dicts of FormField arguments) (default: {()})
         root: Base window (default: {None})
         timeout: Number of seconds to display box (default: {None})
 
     Returns:
-        Text caption of the Button clicked.
+        Dict of field name: value (str, bool for checkboxes), or None if Cancel was clicked.
+
+    Example::
+
+        import dt_tools.console.msgbox as msgbox
+        from dt_tools.console.msgbox import FormField, MB_FieldType
+
+        values = msgbox.form('Connection settings', 'SETUP', fields=[
+            FormField('host', 'Host', default='localhost', validator=lambda v: None if v else 'Host is required'),
+            FormField('user', 'User id'),
+            FormField('pwd', 'Password', MB_FieldType.PASSWORD),
+            FormField('env', 'Environment', MB_FieldType.CHOICE, default='test', choices=['dev', 'test', 'prod']),
+            FormField('save', 'Save settings', MB_FieldType.CHECKBOX, default=True),
+        ])
     """
+    return _DialogManager.run(_FormBox(str(text), title, fields, timeout=timeout), root=root)
 
-    global boxRoot, __replyButtonText, __widgetTexts, buttonsFrame
+form = _formTkinter
 
-    # Initialize __replyButtonText to the first choice.
-    # This is what will be used if the window is closed by the close button.
-    __replyButtonText = choices[0]
 
-    if root:
-        root.withdraw()
-        boxRoot = tk.Toplevel(master=root)
-        boxRoot.withdraw()
-    else:
-        boxRoot = tk.Tk()
-        boxRoot.withdraw()
-
-    boxRoot.title(title)
-    boxRoot.iconname("Dialog")
-    boxRoot.geometry(rootWindowPosition)
-    boxRoot.minsize(400, 100)
-
-    # ------------- define the messageFrame ---------------------------------
-    messageFrame = tk.Frame(master=boxRoot)
-    messageFrame.pack(side=tk.TOP, fill=tk.BOTH)
-
-    # ------------- define the buttonsFrame ---------------------------------
-    buttonsFrame = tk.Frame(master=boxRoot)
-    buttonsFrame.pack(side=tk.TOP, fill=tk.BOTH)
-
-    # -------------------- place the widgets in the frames -----------------------
-    messageWidget = tk.Message(messageFrame, text=msg, width=MSGBOX_WIDTH)
-    # messageWidget.configure(font=(MB_FontFamily.PROPORTIONAL, MB_FontSize.PROPORTIONAL))
-    messageWidget.configure(font=(_used_font_family, _used_font_size))
-    messageWidget.pack(side=tk.TOP, expand=tk.YES, fill=tk.X, padx="3m", pady="3m")
-
-    __put_buttons_in_buttonframe(choices)
-
-    # -------------- the action begins -----------
-    # put the focus on the first button
-    __firstWidget.focus_force()
-    boxRoot.attributes("-topmost", True)  # agd
-    boxRoot.deiconify()
-    _timeout_id: str = None
-    if timeout is not None:
-        _timeout_id = boxRoot.after(timeout, timeoutBoxRoot)
-    boxRoot.mainloop()
-
-    if _timeout_id is not None:
-        boxRoot.after_cancel(_timeout_id)
-
-    try:
-        boxRoot.destroy()
-    except tk.TclError:
-        if __replyButtonText != TIMEOUT_RETURN_VALUE:
-            __replyButtonText = None
-
-    if root:
-        root.deiconify()
-    return __replyButtonText
-
-
-def __put_buttons_in_buttonframe(choices):
-    """Put the buttons in the buttons frame"""
-    global __widgetTexts, __firstWidget, buttonsFrame
-
-    __firstWidget = None
-    __widgetTexts = {}
-
-    i = 0
-
-    for buttonText in choices:
-        tempButton = tk.Button(buttonsFrame, takefocus=1, text=buttonText)
-        _bindArrows(tempButton)
-        tempButton.pack(
-            expand=tk.YES, side=tk.LEFT, padx="1m", pady="1m", ipadx="2m", ipady="1m"
-        )
+class ProgressBox():
+    """
+    Handle for a progress message box, returned by :func:`progress`.
 
-        # remember the text associated with this widget
-        __widgetTexts[tempButton] = buttonText
+    All methods are thread safe and cheap (an update is one queue put), so
+    worker threads may report every item processed.  The window collects the
+    updates and repaints a few times per second.
 
-        # remember the first widget, so we can put the focus there
-        if i == 0:
-            __firstWidget = tempButton
-            i = 1
+    Example::
 
-        # for the commandButton, bind activation events to the activation event handler
-        commandButton = tempButton
-        handler = __buttonEvent
-        for selectionEvent in STANDARD_SELECTION_EVENTS:
-            commandButton.bind("<%s>" % selectionEvent, handler)
+        import dt_tools.console.msgbox as msgbox
 
-        if MB_ButtonType.CANCEL in choices:
-            commandButton.bind("<Escape>", __cancelButtonEvent)
+        with msgbox.progress('Copying files', 'Backup', total=len(files)) as box:
+            for file in files:
+                if box.cancelled:
+                    break
+                copy(file)
+                box.advance()
+    """
+    def __init__(self, text: str = "", title: str = "", total: int = None, cancellable: bool = True):
+        self._updates = queue.SimpleQueue()
+        self._cancelled = threading.Event()
+        self._closed = False
+        dialog = _ProgressBox(str(text), title, total, self._updates, cancellable=cancellable)
+        self._future = _DialogManager.submit(dialog)
+        self._future.add_done_callback(self._dialog_done)
+
+    @property
+    def cancelled(self) -> bool:
+        """True if the user cancelled (Cancel button, Esc or window closed)."""
+        return self._cancelled.is_set()
+
+    @property
+    def future(self) -> Future:
+        """Future receiving MB_ButtonType.OK (closed via close()) or MB_ButtonType.CANCEL."""
+        return self._future
+
+    def advance(self, count: int = 1):
+        """Add count to the number of items completed."""
+        if not self._closed:
+            self._updates.put((_ProgressBox.ADVANCE, count))
+
+    def update(self, completed: int = None, text: str = None, total: int = None):
+        """
+        Set progress values, arguments left as None are unchanged.
+
+        Keyword Arguments:
+            completed: Number of items completed (default: {None})
+            text: Message text (default: {None})
+            total: Total number of items, None or 0 if unknown (default: {None})
+        """
+        if self._closed:
+            return
+        if total is not None:
+            self._updates.put((_ProgressBox.TOTAL, total))
+        if completed is not None:
+            self._updates.put((_ProgressBox.COMPLETED, completed))
+        if text is not None:
+            self._updates.put((_ProgressBox.MESSAGE, str(text)))
+
+    def close(self, wait: bool = True):
+        """
+        Close the progress window.
+
+        Keyword Arguments:
+            wait: Wait for the window to close (default: {True})
+        """
+        if not self._closed:
+            self._updates.put((_ProgressBox.CLOSE, None))
+        if wait:
+            self._future.exception()
+
+    def wait(self, timeout: float = None) -> str:
+        """Wait for the window to close, return MB_ButtonType.OK or MB_ButtonType.CANCEL."""
+        return self._future.result(timeout)
+
+    def __enter__(self) -> 'ProgressBox':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _dialog_done(self, future: Future):
+        self._closed = True
+        if future.cancelled() or future.exception() is not None or future.result() != MB_ButtonType.OK:
+            self._cancelled.set()
+
+
+def progress(text="", title="", total=None, cancellable=True) -> ProgressBox:
+    """
+    Display a progress message box, without waiting.
 
+    The window shows a progress bar, percent complete, rate (items/sec) and
+    estimated time remaining.  Update it through the returned handle from any
+    thread; a Cancel button (optional) sets ProgressBox.cancelled.
 
-def _bindArrows(widget, skipArrowKeys=False):
-    widget.bind("<Down>", _tabRight)
-    widget.bind("<Up>", _tabLeft)
+    Keyword Arguments:
+        text: Text content of the message box (default: {""})
+        title: Title bar text (default: {""})
+        total: Total number of items, None if unknown (bar shows activity only) (default: {None})
+        cancellable: Display a Cancel button (default: {True})
+
+    Returns:
+        ProgressBox handle.
+    """
+    return ProgressBox(text, title, total=total, cancellable=cancellable)
 
-    if not skipArrowKeys:
-        widget.bind("<Right>", _tabRight)
-        widget.bind("<Left>", _tabLeft)
 
+def submit_alert(text="", title="", button=MB_ButtonType.OK, timeout=None) -> Future:
+    """
+    Display an alert box without waiting for it to be dismissed.
 
-def _tabRight(event):
-    boxRoot.event_generate("<Tab>")
+    Keyword Arguments:
+        text: Text content of the message box (default: {""})
+        title: Title bar text (default: {""})
+        button: Button caption (default: {MB_ButtonType.OK})
+        timeout: Number of milliseconds to display box (default: {None})
 
+    Returns:
+        Future receiving the text of the button clicked on.  Cancel the
+        future to close the message box.
 
-def _tabLeft(event):
-    boxRoot.event_generate("<Shift-Tab>")
+    Example::
 
+        import dt_tools.console.msgbox as msgbox
 
-def __buttonEvent(event):
+        ack = msgbox.submit_alert('Backup started', 'Backup')
+        ... keep working ...
+        resp = ack.result(timeout=60)
     """
-    Handle an event that is generated by a person clicking a button.
+    dialog = _ButtonBox(str(text), title, [str(button)], timeout=timeout)
+    future = _DialogManager.submit(dialog)
+    return _chain_future(future, lambda resp: button if resp is None else resp)
+
+
+def submit_confirm(text="", title="", buttons=(MB_ButtonType.OK, MB_ButtonType.CANCEL), timeout=None) -> Future:
     """
-    global boxRoot, __widgetTexts, __replyButtonText
-    __replyButtonText = __widgetTexts[event.widget]
-    boxRoot.quit()  # quit the main loop
+    Display a confirmation box without waiting for a response.
 
+    Keyword Arguments:
+        text: Text content of the message box (default: {""})
+        title: Title bar text (default: {""})
+        buttons: A list of button text (default: {(MB_ButtonType.OK, MB_ButtonType.CANCEL)})
+        timeout: Number of milliseconds to display box (default: {None})
 
-def __cancelButtonEvent(event):
-    """Handle pressing Esc by clicking the Cancel button."""
-    global boxRoot, __widgetTexts, __replyButtonText
-    __replyButtonText = MB_ButtonType.CANCEL
-    boxRoot.quit()
+    Returns:
+        Future receiving the text of the button clicked on.
+    """
+    return _DialogManager.submit(_ButtonBox(str(text), title, [str(b) for b in buttons], timeout=timeout))
 
 
-def __fillablebox(msg, title="", default="", mask=None, root=None, timeout=None):
+def submit_prompt(text="", title="", default="", timeout=None) -> Future:
     """
-    Show a box in which a user can enter some text.
-    You may optionally specify some default text, which will appear in the
-    enterbox when it is displayed.
-    Returns the text that the user entered, or None if he cancels the operation.
+    Display a text input box without waiting for a response.
+
+    Keyword Arguments:
+        text: Text content of the message box (default: {""})
+        title: Title bar text (default: {""})
+        default: Default text (default: {""})
+        timeout: Number of milliseconds to display box (default: {None})
+
+    Returns:
+        Future receiving the text entered, or None if Cancel was clicked.
     """
+    return _DialogManager.submit(_FillableBox(str(text), title, default=default, mask=None, timeout=timeout))
 
-    global boxRoot, __enterboxText, __enterboxDefaultText
-    global cancelButton, entryWidget, okButton
 
-    if title is None:
-        title == ""
-    if default is None:
-        default = ""
-    __enterboxDefaultText = default
-    __enterboxText = __enterboxDefaultText
+def submit_password(text="", title="", default="", mask="*", timeout=None) -> Future:
+    """
+    Display a password box without waiting for a response.
 
-    if root:
-        root.withdraw()
-        boxRoot = tk.Toplevel(master=root)
-        boxRoot.withdraw()
-    else:
-        boxRoot = tk.Tk()
-        boxRoot.withdraw()
-
-    boxRoot.title(title)
-    boxRoot.iconname("Dialog")
-    boxRoot.geometry(rootWindowPosition)
-    boxRoot.bind("<Escape>", __enterboxCancel)
-
-    # ------------- define the messageFrame ---------------------------------
-    messageFrame = tk.Frame(master=boxRoot)
-    messageFrame.pack(side=tk.TOP, fill=tk.BOTH)
-
-    # ------------- define the buttonsFrame ---------------------------------
-    buttonsFrame = tk.Frame(master=boxRoot)
-    buttonsFrame.pack(side=tk.TOP, fill=tk.BOTH)
-
-    # ------------- define the entryFrame ---------------------------------
-    entryFrame = tk.Frame(master=boxRoot)
-    entryFrame.pack(side=tk.TOP, fill=tk.BOTH)
-
-    # ------------- define the buttonsFrame ---------------------------------
-    buttonsFrame = tk.Frame(master=boxRoot)
-    buttonsFrame.pack(side=tk.TOP, fill=tk.BOTH)
-
-    # -------------------- the msg widget ----------------------------
-    messageWidget = tk.Message(messageFrame, width="4.5i", text=msg)
-    # messageWidget.configure(font=(MB_FontFamily.PROPORTIONAL, MB_FontSize.PROPORTIONAL))
-    messageWidget.configure(font=(_used_font_family, _used_font_size))
-    messageWidget.pack(side=tk.RIGHT, expand=1, fill=tk.BOTH, padx="3m", pady="3m")
-
-    # --------- entryWidget ----------------------------------------------
-    entryWidget = tk.Entry(entryFrame, width=40)
-    _bindArrows(entryWidget, skipArrowKeys=True)
-    # entryWidget.configure(font=(MB_FontFamily.PROPORTIONAL, TEXT_ENTRY_FONT_SIZE))
-    entryWidget.configure(font=(_used_font_family, MB_FontSize.TEXT.value))
-    if mask:
-        entryWidget.configure(show=mask)
-    entryWidget.pack(side=tk.LEFT, padx="3m")
-    entryWidget.bind("<Return>", __enterboxGetText)
-    entryWidget.bind("<Escape>", __enterboxCancel)
-
-    # put text into the entryWidget and have it pre-highlighted
-    if __enterboxDefaultText != "":
-        entryWidget.insert(0, __enterboxDefaultText)
-        entryWidget.select_range(0, tk.END)
-
-    # ------------------ ok button -------------------------------
-    okButton = tk.Button(buttonsFrame, takefocus=1, text=MB_ButtonType.OK)
-    _bindArrows(okButton)
-    okButton.pack(expand=1, side=tk.LEFT, padx="3m", pady="3m", ipadx="2m", ipady="1m")
-
-    # for the commandButton, bind activation events to the activation event handler
-    commandButton = okButton
-    handler = __enterboxGetText
-    for selectionEvent in STANDARD_SELECTION_EVENTS:
-        commandButton.bind("<%s>" % selectionEvent, handler)
-
-    # ------------------ cancel button -------------------------------
-    cancelButton = tk.Button(buttonsFrame, takefocus=1, text=MB_ButtonType.CANCEL)
-    _bindArrows(cancelButton)
-    cancelButton.pack(
-        expand=1, side=tk.RIGHT, padx="3m", pady="3m", ipadx="2m", ipady="1m"
-    )
+    Keyword Arguments:
+        text: Text content of the message box (default: {""})
+        title: Title bar text (default: {""})
+        default: Default text (default: {""})
+        mask: Mask character to display on user keystrokes (default: {"*"})
+        timeout: Number of milliseconds to display box (default: {None})
+
+    Returns:
+        Future receiving the text entered, or None if Cancel was clicked.
+    """
+    return _DialogManager.submit(_FillableBox(str(text), title, default=default, mask=mask, timeout=timeout))
+
+
+def submit_choice(text="", title="", choices=(), default=None, multiple=False, timeout=None) -> Future:
+    """
+    Display a choice box without waiting for a response, see :func:`choice`.
+
+    Returns:
+        Future receiving the choice (list of choices if multiple), or None if Cancel was clicked.
+    """
+    return _DialogManager.submit(_ChoiceBox(str(text), title, choices, default=default, multiple=multiple, timeout=timeout))
 
-    # for the commandButton, bind activation events to the activation event handler
-    commandButton = cancelButton
-    handler = __enterboxCancel
-    for selectionEvent in STANDARD_SELECTION_EVENTS:
-        commandButton.bind("<%s>" % selectionEvent, handler)
-
-    # ------------------- time for action! -----------------
-    entryWidget.focus_force()  # put the focus on the entryWidget
-    boxRoot.attributes("-topmost", True)     # agd
-    boxRoot.deiconify()
-    _timeout_id: str = None
-    if timeout is not None:
-        _timeout_id = boxRoot.after(timeout, timeoutBoxRoot)
-        # boxRoot.after(timeout, )
-    boxRoot.mainloop()  # run it!
-
-    # -------- after the run has completed ----------------------------------
-    if _timeout_id is not None:
-        boxRoot.after_cancel(_timeout_id)
-
-    if root:
-        root.deiconify()
-    try:
-        boxRoot.destroy()  # button_click didn't destroy boxRoot, so we do it now
-    except tk.TclError:
-        if __enterboxText != TIMEOUT_RETURN_VALUE:
-            return None
 
-    return __enterboxText
+def submit_form(text="", title="", fields=(), timeout=None) -> Future:
+    """
+    Display a form box without waiting for a response, see :func:`form`.
+
+    Returns:
+        Future receiving the dict of field values, or None if Cancel was clicked.
+    """
+    return _DialogManager.submit(_FormBox(str(text), title, fields, timeout=timeout))
+
+
+async def alert_async(text="", title="", button=MB_ButtonType.OK, timeout=None) -> str:
+    """Awaitable :func:`alert`, cancelling the awaiting task closes the message box."""
+    import asyncio
+    return await asyncio.wrap_future(submit_alert(text, title, button, timeout=timeout))
+
+
+async def confirm_async(text="", title="", buttons=(MB_ButtonType.OK, MB_ButtonType.CANCEL), timeout=None) -> str:
+    """Awaitable :func:`confirm`, cancelling the awaiting task closes the message box."""
+    import asyncio
+    return await asyncio.wrap_future(submit_confirm(text, title, buttons, timeout=timeout))
+
+
+async def prompt_async(text="", title="", default="", timeout=None) -> str:
+    """Awaitable :func:`prompt`, cancelling the awaiting task closes the message box."""
+    import asyncio
+    return await asyncio.wrap_future(submit_prompt(text, title, default, timeout=timeout))
+
+
+async def password_async(text="", title="", default="", mask="*", timeout=None) -> str:
+    """Awaitable :func:`password`, cancelling the awaiting task closes the message box."""
+    import asyncio
+    return await asyncio.wrap_future(submit_password(text, title, default, mask, timeout=timeout))
 
 
-def __enterboxGetText(event):
-    global __enterboxText
+async def choice_async(text="", title="", choices=(), default=None, multiple=False, timeout=None) -> Union[str, List[str], None]:
+    """Awaitable :func:`choice`, cancelling the awaiting task closes the message box."""
+    import asyncio
+    return await asyncio.wrap_future(submit_choice(text, title, choices, default, multiple, timeout=timeout))
 
-    __enterboxText = entryWidget.get()
-    boxRoot.quit()
 
+async def form_async(text="", title="", fields=(), timeout=None) -> Optional[Dict[str, Any]]:
+    """Awaitable :func:`form`, cancelling the awaiting task closes the message box."""
+    import asyncio
+    return await asyncio.wrap_future(submit_form(text, title, fields, timeout=timeout))
 
-def __enterboxRestore(event):
-    global entryWidget
 
-    entryWidget.delete(0, len(entryWidget.get()))
-    entryWidget.insert(0, __enterboxDefaultText)
+def _chain_future(source: Future, transform: Callable[[Any], Any]) -> Future:
+    """Return a Future receiving transform(source result); cancelling it cancels source."""
+    target = Future()
 
+    def _source_done(fut: Future):
+        try:
+            if fut.cancelled():
+                target.cancel()
+            elif fut.exception() is not None:
+                target.set_exception(fut.exception())
+            else:
+                target.set_result(transform(fut.result()))
+        except InvalidStateError:
+            pass  # target cancelled
 
-def __enterboxCancel(event):
-    global __enterboxText
+    def _target_done(fut: Future):
+        if fut.cancelled():
+            source.cancel()
+
+    source.add_done_callback(_source_done)
+    target.add_done_callback(_target_done)
+    return target
+
+
+def _buttonbox(msg: str, title: str, choices: Union[List,Tuple], root=None, timeout=None):
+    """
+    Display a msg, a title, and a set of buttons.
+
+    The buttons are defined by the members of the choices list.
+
+    Arguments:
+        msg: Text content of the message box
+        title: Title bar text
+        choices: A list or tuple of the choices to be displayed
+
+    Keyword Arguments:
+        root: Base window (default: {None})
+        timeout: Number of seconds to display box (default: {None})
+
+    Returns:
+        Text caption of the Button clicked.
+    """
+    return _DialogManager.run(_ButtonBox(msg, title, choices, timeout=timeout), root=root)
+
+
+def __fillablebox(msg, title="", default="", mask=None, root=None, timeout=None):
+    """
+    Show a box in which a user can enter some text.
+    You may optionally specify some default text, which will appear in the
+    enterbox when it is displayed.
+    Returns the text that the user entered, or None if he cancels the operation.
+    """
+    return _DialogManager.run(_FillableBox(msg, title, default=default, mask=mask, timeout=timeout), root=root)
 
-    __enterboxText = None
-    boxRoot.quit()
 
 if __name__ == "__main__":
     alert('This is an alert box', 'ALERT1')
@@ -537,3 +1863,18 @@ if __name__ == "__main__":
     confirm('this is a confirm box, 5 sec timeout', "CONFIRM", timeout=5000)
     prompt('This is a prompt box', 'PROMPT', 'default')
     password('This is a password box', 'PASSWORD', 'default')
+
+    choice('This is a choice box', 'CHOICE', [f'Item {idx:06d}' for idx in range(100_000)], multiple=True)
+
+    form('This is a form box', 'FORM', fields=[
+        FormField('name', 'Name', default='default'),
+        FormField('pwd', 'Password', MB_FieldType.PASSWORD),
+        FormField('color', 'Color', MB_FieldType.CHOICE, choices=['Red', 'Green', 'Blue']),
+        FormField('save', 'Save', MB_FieldType.CHECKBOX, default=True),
+    ])
+
+    with progress('This is a progress box', 'PROGRESS', total=2_000_000) as box:
+        for _ in range(2_000_000):
+            if box.cancelled:
+                break
+            box.advance()
@@ -0,0 +1,481 @@
+"""
+Console pager for very large files.
+
+The file is memory mapped, nothing is read into Python strings except the
+lines on screen.  Line positions come from a sparse index (the offset of
+every 8192nd line), built lazily as far as the pager has been, so opening
+a multi-GB file is immediate and jumping to the end costs one newline
+count over the mapped buffer.
+
+Only the visible window is rendered.  Moving one line scrolls the screen
+region (ConsoleHelper viewport) and draws the single new line, larger
+moves repaint the window in one write.  Searches run the regular
+expression directly over the mapped buffer.
+
+Keys::
+
+    q, ESC              quit
+    down, j, enter      next line         up, k       previous line
+    space, pgdn, f      next page         pgup, b     previous page
+    g, home             first line        G, end      last line
+    left, right         scroll horizontally
+    /pattern            search forward    ?pattern    search backward
+    n / N               repeat search forward / backward
+
+Example::
+
+    from dt_tools.console.pager import Pager
+
+    with Pager('/var/log/job.log') as pager:
+        pager.view()
+
+    python -m dt_tools.console.pager /var/log/job.log
+
+"""
+import bisect
+import mmap
+import os
+import re
+import sys
+from array import array
+from typing import Final, Iterator, List, Optional, Pattern, Tuple, Union
+
+from dt_tools.console._lazy import LOGGER
+
+from dt_tools.console.ansi_text import AnsiText
+from dt_tools.console.console_helper import ColorBG, ColorFG, ConsoleHelper, TextStyle
+
+
+class _PagerControl:
+    ESC: Final = '\x1b'
+    ALT_SCREEN_ON: Final = '\x1b[?1049h'
+    ALT_SCREEN_OFF: Final = '\x1b[?1049l'
+    REVERSE_INDEX: Final = '\x1bM'
+    CLEAR_EOL: Final = '\x1b[K'
+    HIGHLIGHT_ON: Final = '\x1b[7m'
+    HIGHLIGHT_OFF: Final = '\x1b[27m'
+    STATUS_STYLE: Final = f'{ColorBG.GREY}{ColorFG.WHITE2}'
+    H_SCROLL: Final = 8
+    SEARCH_WINDOW: Final = 1 << 20
+    """Bytes scanned per step of a backward search."""
+
+
+class _LineIndex():
+    """
+    Sparse line offset index over a buffer.
+
+    Stores the start offset of every STEP-th line, extended on demand.
+    Newlines are counted in CHUNK sized slices, so the memory used to scan
+    is bounded no matter how long the lines are.
+    """
+    STEP: Final = 8192
+    CHUNK: Final = 1 << 16
+
+    def __init__(self, buffer: Union[mmap.mmap, bytes]):
+        self._buffer = buffer
+        self._size = len(buffer)
+        self._marks = array('q', [0])
+        """_marks[k] = offset of line k * STEP."""
+        self._lines_total: int = None
+        """Number of lines, once the whole buffer has been indexed."""
+
+    @property
+    def complete(self) -> bool:
+        """True if the whole buffer is indexed."""
+        return self._lines_total is not None
+
+    def line_count(self) -> int:
+        """Number of lines (indexes the whole buffer)."""
+        while self._lines_total is None:
+            self._add_mark()
+        return self._lines_total
+
+    def known_lines(self) -> int:
+        """Lines indexed so far (the total once complete)."""
+        return self._lines_total if self._lines_total is not None else (len(self._marks) - 1) * self.STEP
+
+    def offset(self, line: int) -> Optional[int]:
+        """Start offset of line (0 based), None if past the end."""
+        if line < 0:
+            return None
+        mark = line // self.STEP
+        # The next mark (or the end) must be known to tell if line exists
+        while mark + 1 >= len(self._marks) and self._lines_total is None:
+            self._add_mark()
+        if self._lines_total is not None and line >= self._lines_total:
+            return None
+        pos = self._marks[mark]
+        find = self._buffer.find
+        for _ in range(line - mark * self.STEP):
+            pos = find(b'\n', pos) + 1
+        return pos
+
+    def line_of(self, offset: int) -> int:
+        """Line (0 based) containing offset."""
+        while self._lines_total is None and self._marks[-1] <= offset:
+            if not self._add_mark():
+                break
+        mark = bisect.bisect_right(self._marks, offset) - 1
+        return mark * self.STEP + self._count(self._marks[mark], offset)
+
+    def _count(self, start: int, end: int) -> int:
+        count = 0
+        for pos in range(start, end, self.CHUNK):
+            count += self._buffer[pos:min(pos + self.CHUNK, end)].count(b'\n')
+        return count
+
+    def _add_mark(self) -> bool:
+        # Index the next STEP lines, False at end of buffer
+        if self._lines_total is not None:
+            return False
+        pos = self._marks[-1]
+        needed = self.STEP
+        buffer = self._buffer
+        while pos < self._size:
+            chunk_end = min(pos + self.CHUNK, self._size)
+            newlines = buffer[pos:chunk_end].count(b'\n')
+            if newlines < needed:
+                needed -= newlines
+                pos = chunk_end
+                continue
+            for _ in range(needed):
+                pos = buffer.find(b'\n', pos) + 1
+            if pos >= self._size:
+                # Last line ended exactly at end of buffer
+                self._lines_total = len(self._marks) * self.STEP
+            else:
+                self._marks.append(pos)
+            return self._lines_total is None
+        # End of buffer, partial last line counts as a line
+        last_line_partial = self._size > 0 and buffer[self._size - 1:self._size] != b'\n'
+        self._lines_total = (len(self._marks) - 1) * self.STEP + (self.STEP - needed) + (1 if last_line_partial else 0)
+        return False
+
+
+class Pager():
+    """
+    Memory mapped file pager.
+
+    Arguments:
+        path: File to view.
+
+    Keyword Arguments:
+        tab_size: Tab stop interval (default: {8}).
+        encoding: Text encoding of the file (default: {'utf-8'}).
+    """
+    _CONTROL_CHARS: Final = {code: None for code in list(range(0x00, 0x09)) + list(range(0x0a, 0x20)) + [0x7f]}
+
+    def __init__(self, path: str, tab_size: int = 8, encoding: str = 'utf-8'):
+        self.path = path
+        self._tab_size = tab_size
+        self._encoding = encoding
+        self._file = open(path, 'rb')
+        self._size = os.fstat(self._file.fileno()).st_size
+        self._buffer: Union[mmap.mmap, bytes] = b''
+        if self._size > 0:
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._index = _LineIndex(self._buffer)
+        self._pattern: Pattern[bytes] = None
+        self._literal: bytes = None
+        self._highlight: Pattern[str] = None
+        self._top = 0
+        self._column = 0
+        self._screen: Tuple[int, int] = (0, 0)
+        self._message = ''
+        LOGGER.trace(f'Pager opened {path} ({self._size} bytes)')
+
+    # -- File access ---------------------------------------------------------------------------------
+    def line_count(self) -> int:
+        """Number of lines in the file (indexes the whole file on first call)."""
+        return self._index.line_count()
+
+    def line(self, line: int) -> Optional[str]:
+        """
+        Text of a line, control characters and escape sequences removed.
+
+        Arguments:
+            line: Line number (0 based).
+
+        Returns:
+            Line text, None if past the end of the file.
+        """
+        start = self._index.offset(line)
+        if start is None:
+            return None
+        return self._decode(start)
+
+    def lines(self, start: int, count: int) -> Iterator[str]:
+        """
+        Consecutive lines, from line start (0 based).
+
+        Only the first line is located through the index, following lines
+        are found by scanning on from it.
+        """
+        pos = self._index.offset(start)
+        for _ in range(count):
+            if pos is None or pos >= self._size:
+                return
+            yield self._decode(pos)
+            end = self._buffer.find(b'\n', pos)
+            pos = None if end < 0 else end + 1
+
+    def search(self, pattern: str, start_line: int = 0, backward: bool = False, regex: bool = False) -> Optional[int]:
+        """
+        Find the next line matching pattern.
+
+        The search scans the mapped buffer, all lowercase patterns match
+        case-insensitively.
+
+        Arguments:
+            pattern: Text (or regular expression) to find.
+
+        Keyword Arguments:
+            start_line: Line to search from, exclusive when searching backward (default: {0}).
+            backward: Search toward the start of the file (default: {False}).
+            regex: pattern is a regular expression (default: {False}).
+
+        Returns:
+            Matching line number (0 based), None if not found.
+        """
+        self._compile(pattern, regex)
+        return self._search(start_line, backward)
+
+    def _search(self, start_line: int, backward: bool) -> Optional[int]:
+        start = self._index.offset(start_line)
+        if start is None:
+            start = self._size
+        if self._literal is not None:
+            # Case sensitive plain text, mmap.find()/rfind() are much faster than re
+            found = self._buffer.rfind(self._literal, 0, start) if backward else self._buffer.find(self._literal, start)
+            return None if found < 0 else self._index.line_of(found)
+        if not backward:
+            match = self._pattern.search(self._buffer, start)
+            return None if match is None else self._index.line_of(match.start())
+
+        # Backward: scan windows toward the start, last match in the window wins
+        end = start
+        while end > 0:
+            low = max(end - _PagerControl.SEARCH_WINDOW, 0)
+            if low > 0:
+                # Start the window on a line boundary, a match can't span lines
+                newline = self._buffer.rfind(b'\n', 0, low)
+                low = newline + 1
+            last = None
+            for last in self._pattern.finditer(self._buffer, low, end):
+                pass
+            if last is not None:
+                return self._index.line_of(last.start())
+            end = low
+        return None
+
+    def close(self):
+        """Release the mapping and the file."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._buffer = b''
+        self._file.close()
+
+    def __enter__(self) -> 'Pager':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # -- Interactive view ----------------------------------------------------------------------------
+    def view(self, start_line: int = 0):
+        """
+        Page through the file interactively (see module documentation for keys).
+
+        If input or output is not a terminal, the file is copied to the output instead.
+
+        Keyword Arguments:
+            start_line: First line displayed (default: {0}).
+        """
+        from dt_tools.console.keyboard import Key, KeyboardReader, KeyDecoder
+
+        reader = KeyboardReader.default()
+        if not reader.is_tty() or not ConsoleHelper.valid_console():
+            self._copy_out()
+            return
+
+        ConsoleHelper.watch_console_size()
+        self._top = max(start_line, 0)
+        decoder = KeyDecoder()
+        ConsoleHelper._output_to_terminal(_PagerControl.ALT_SCREEN_ON)
+        ConsoleHelper.cursor_off()
+        try:
+            self._repaint()
+            with reader.cbreak():
+                while True:
+                    text = reader.read_text(0.25)
+                    if text is None:
+                        events = decoder.flush()
+                        if ConsoleHelper.get_console_size() != self._screen:
+                            self._repaint()
+                    else:
+                        events = decoder.feed(text)
+                    for idx, event in enumerate(events):
+                        if event.key in ('q', Key.ESCAPE):
+                            return
+                        if event.key in ('/', '?'):
+                            # Keys typed ahead (and any partial sequence) belong to the search prompt
+                            reader.unread(''.join(ev.sequence for ev in events[idx + 1:]) + decoder.take_pending())
+                            self._prompt_search(event.key, reader)
+                            break
+                        self._on_key(event.key)
+        finally:
+            ConsoleHelper.set_console_viewport()
+            ConsoleHelper.cursor_on()
+            ConsoleHelper._output_to_terminal(_PagerControl.ALT_SCREEN_OFF)
+
+    def _on_key(self, key: str):
+        from dt_tools.console.keyboard import Key
+
+        page = self._screen[0] - 1
+        if key in (Key.DOWN, 'j', Key.ENTER):
+            self._scroll(1)
+        elif key in (Key.UP, 'k'):
+            self._scroll(-1)
+        elif key in (' ', 'f', Key.PAGE_DOWN):
+            self._goto(self._top + page)
+        elif key in ('b', Key.PAGE_UP):
+            self._goto(self._top - page)
+        elif key in ('g', Key.HOME):
+            self._goto(0)
+        elif key in ('G', Key.END):
+            self._goto(self._index.line_count() - page)
+        elif key in (Key.RIGHT, Key.LEFT):
+            step = _PagerControl.H_SCROLL if key == Key.RIGHT else -_PagerControl.H_SCROLL
+            self._column = max(self._column + step, 0)
+            self._repaint()
+        elif key in ('n', 'N') and self._pattern is not None:
+            self._find(backward=(key == 'N'))
+
+    def _prompt_search(self, key: str, reader):
+        rows = self._screen[0]
+        ConsoleHelper._output_to_terminal(f'{_PagerControl.ESC}[{rows};1H{TextStyle.RESET}{_PagerControl.CLEAR_EOL}')
+        ConsoleHelper.cursor_on()
+        try:
+            text = reader.read_line(key)
+        except (EOFError, KeyboardInterrupt):
+            text = ''
+        ConsoleHelper.cursor_off()
+        if text:
+            try:
+                self._compile(text, regex=True)
+            except re.error as ex:
+                self._message = f'Invalid pattern: {ex}'
+                self._draw_status()
+                return
+        if self._pattern is not None:
+            self._find(backward=(key == '?'))
+        else:
+            self._draw_status()
+
+    def _find(self, backward: bool):
+        line = self._search(self._top if backward else self._top + 1, backward)
+        if line is None:
+            self._message = 'Pattern not found'
+            self._draw_status()
+            return
+        self._goto(line, force=True)
+
+    def _compile(self, pattern: str, regex: bool):
+        source = pattern if regex else re.escape(pattern)
+        flags = re.IGNORECASE if pattern == pattern.lower() else 0
+        self._pattern = re.compile(source.encode(self._encoding), flags)
+        self._highlight = re.compile(source, flags)
+        literal = not regex or re.escape(pattern) == pattern
+        self._literal = pattern.encode(self._encoding) if literal and not flags else None
+
+    def _scroll(self, delta: int):
+        rows = self._screen[0] - 1
+        new_top = self._clamp(self._top + delta)
+        if new_top == self._top:
+            return
+        self._top = new_top
+        esc = _PagerControl.ESC
+        if delta > 0:
+            # Region scrolls up a line, draw the new bottom line
+            text = next(self.lines(self._top + rows - 1, 1), '')
+            frame = f'{esc}[{rows};1H\n{self._format(text)}'
+        else:
+            text = next(self.lines(self._top, 1), '')
+            frame = f'{esc}[1;1H{_PagerControl.REVERSE_INDEX}{self._format(text)}'
+        ConsoleHelper._output_to_terminal(frame + self._status_frame())
+
+    def _goto(self, line: int, force: bool = False):
+        line = self._clamp(line)
+        if line != self._top or force:
+            self._top = line
+            self._repaint()
+
+    def _clamp(self, line: int) -> int:
+        page = self._screen[0] - 1
+        line = max(line, 0)
+        if self._index.offset(line + page - 1) is None:
+            # Past the last page, the index is complete by now
+            line = max(self._index.line_count() - page, 0)
+        return line
+
+    def _repaint(self):
+        size = ConsoleHelper.get_console_size()
+        if size != self._screen:
+            self._screen = size
+            ConsoleHelper.set_console_viewport(1, max(size[0] - 1, 1))
+        rows = size[0] - 1
+        esc = _PagerControl.ESC
+        parts = []
+        lines = list(self.lines(self._top, rows))
+        for row in range(rows):
+            text = self._format(lines[row]) if row < len(lines) else f'~{_PagerControl.CLEAR_EOL}'
+            parts.append(f'{esc}[{row + 1};1H{text}')
+        parts.append(self._status_frame())
+        ConsoleHelper._output_to_terminal(''.join(parts))
+
+    def _format(self, text: str) -> str:
+        width = self._screen[1]
+        visible = text[self._column:self._column + width]
+        if self._highlight is not None and visible:
+            visible = self._highlight.sub(lambda m: f'{_PagerControl.HIGHLIGHT_ON}{m.group(0)}{_PagerControl.HIGHLIGHT_OFF}', visible)
+        return f'{visible}{_PagerControl.CLEAR_EOL}'
+
+    def _draw_status(self):
+        ConsoleHelper._output_to_terminal(self._status_frame())
+
+    def _status_frame(self) -> str:
+        rows, columns = self._screen
+        bottom = self._top + rows - 1
+        total = str(self._index.known_lines()) if self._index.complete else f'{self._index.known_lines()}+'
+        offset = self._index.offset(self._top)
+        pct = 100 if self._size == 0 or offset is None else 100 * offset // self._size
+        status = f' {os.path.basename(self.path)}  lines {self._top + 1}-{bottom}/{total}  {pct}%'
+        if self._column:
+            status += f'  col {self._column + 1}'
+        status += f'  {self._message}' if self._message else '  (/ ? n N search, q quit)'
+        self._message = ''
+        return f'{_PagerControl.ESC}[{rows};1H{_PagerControl.STATUS_STYLE}{status[:columns].ljust(columns)}{TextStyle.RESET}'
+
+    def _decode(self, start: int) -> str:
+        end = self._buffer.find(b'\n', start)
+        if end < 0:
+            end = self._size
+        text = self._buffer[start:end].decode(self._encoding, errors='replace')
+        text = AnsiText.strip(text)
+        if '\t' in text:
+            text = text.expandtabs(self._tab_size)
+        return text.translate(self._CONTROL_CHARS)
+
+    def _copy_out(self):
+        out = sys.stdout.buffer
+        for pos in range(0, self._size, _PagerControl.SEARCH_WINDOW):
+            out.write(self._buffer[pos:pos + _PagerControl.SEARCH_WINDOW])
+        out.flush()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print('Usage: python -m dt_tools.console.pager <file>')
+        sys.exit(1)
+    with Pager(sys.argv[1]) as pager:
+        pager.view()
@@ -18,13 +18,13 @@ Example::
     
 """
 
-import os
 import time
 from datetime import datetime as dt
 
-from loguru import logger as LOGGER
+from dt_tools.console._lazy import LOGGER
 
 from dt_tools.console.console_helper import ConsoleHelper
+from dt_tools.console.render_hooks import RenderHooks
 
 
 class ProgressBar():
@@ -97,9 +97,19 @@ class ProgressBar():
         if current_increment > self._max_increments:
             current_increment = self._max_increments
 
+        span = RenderHooks.begin('ProgressBar.render')
+        try:
+            self._render(current_increment, suffix)
+        finally:
+            RenderHooks.end(span)
+
+        if current_increment >= self._max_increments:
+            self.cancel_progress()
+
+    def _render(self, current_increment: int, suffix: str):
         self.console.cursor_off()
         self._finished = False
-        term_columns = os.get_terminal_size().columns
+        term_columns = ConsoleHelper.get_console_size()[1]
         if ConsoleHelper.valid_console(): 
             filled_len = int(self._bar_len * current_increment // self._max_increments)
             bar = self._fill * filled_len + '-' * (self._bar_len - filled_len)
@@ -123,10 +133,7 @@ class ProgressBar():
             #     terminal_line = display_line
             # terminal_line = (display_line[:self._term_columns-7] + '...' + display_line[-3:]) if len(display_line) > self._term_columns else display_line
             terminal_line = display_line
-            print(terminal_line, end = self._str_end, flush=True)
-
-        if current_increment >= self._max_increments:
-            self.cancel_progress()
+            ConsoleHelper._output_to_terminal(terminal_line, eol=self._str_end)
 
     def cancel_progress(self):
         """Turn off progress bar."""
@@ -0,0 +1,221 @@
+"""
+Profiling hooks around widget render cycles.
+
+Registered hooks receive a START and an END :class:`RenderEvent` for each:
+
+    - ProgressBar render (``ProgressBar.render``).
+    - Spinner tick (``Spinner.tick``).
+    - ConsoleHelper.display_status() (``ConsoleHelper.display_status``).
+    - msgbox dialog, from display until closed (``msgbox.<dialog type>``).
+
+Timestamps are time.perf_counter_ns() values, END events carry the duration
+and the number of bytes written to the terminal during the render.  With no
+hooks registered, each render pays a single attribute test.
+
+TraceCollector is a ready made hook which exports the events in Chrome
+trace-event format, for viewing in chrome://tracing or https://ui.perfetto.dev.
+
+Example::
+
+    from dt_tools.console.render_hooks import RenderHooks, TraceCollector
+
+    collector = TraceCollector()
+    RenderHooks.add(collector)
+    ... run dashboard ...
+    RenderHooks.remove(collector)
+    collector.save('dashboard-trace.json')
+
+"""
+import collections
+import json
+import os
+import threading
+import time
+from typing import IO, Any, Callable, Deque, Dict, Final, List, NamedTuple, Optional, Tuple, Union
+
+from dt_tools.console._lazy import LOGGER
+
+
+class RenderPhase:
+    """RenderEvent phases."""
+    START: Final = 'start'
+    END: Final = 'end'
+
+
+class RenderEvent(NamedTuple):
+    """Render cycle start/end notification."""
+    phase: str
+    """RenderPhase.START or RenderPhase.END."""
+    name: str
+    """Render cycle name (i.e. 'ProgressBar.render')."""
+    timestamp_ns: int
+    """time.perf_counter_ns() at start (START) or end (END) of the render."""
+    duration_ns: int
+    """Render duration, 0 for START events."""
+    bytes_written: int
+    """Bytes written to the terminal during the render, 0 for START events."""
+    thread_id: int
+    """threading.get_ident() of the rendering thread."""
+    args: Optional[Dict[str, Any]] = None
+    """Optional details (i.e. dialog title)."""
+
+
+RenderHook = Callable[[RenderEvent], None]
+
+_SpanToken = Tuple[str, int, int, Optional[Dict[str, Any]]]
+
+
+class RenderHooks():
+    """
+    Registry of render hooks.
+
+    Widgets call begin()/end() around each render, ConsoleHelper reports the
+    bytes it writes through count_bytes().  All three return immediately when
+    no hook is registered.
+    """
+    _hooks: Tuple[RenderHook, ...] = ()
+    _lock = threading.Lock()
+    _local = threading.local()
+
+    @classmethod
+    def add(cls, hook: RenderHook):
+        """Register hook, called with every RenderEvent (on the rendering thread)."""
+        with cls._lock:
+            cls._hooks = cls._hooks + (hook,)
+
+    @classmethod
+    def remove(cls, hook: RenderHook):
+        """Unregister hook."""
+        with cls._lock:
+            cls._hooks = tuple(h for h in cls._hooks if h is not hook)
+
+    @classmethod
+    def clear(cls):
+        """Unregister all hooks."""
+        with cls._lock:
+            cls._hooks = ()
+
+    @classmethod
+    def enabled(cls) -> bool:
+        """True if any hook is registered."""
+        return bool(cls._hooks)
+
+    @classmethod
+    def begin(cls, name: str, args: Dict[str, Any] = None) -> Optional[_SpanToken]:
+        """
+        Start a render span.
+
+        Arguments:
+            name: Render cycle name.
+
+        Keyword Arguments:
+            args: Optional details passed to the hooks (default: {None}).
+
+        Returns:
+            Token for end(), None if no hooks are registered.
+        """
+        if not cls._hooks:
+            return None
+        start = time.perf_counter_ns()
+        cls._emit(RenderEvent(RenderPhase.START, name, start, 0, 0, threading.get_ident(), args))
+        return (name, start, cls._thread_bytes(), args)
+
+    @classmethod
+    def end(cls, token: Optional[_SpanToken]):
+        """End the render span started by begin()."""
+        if token is None:
+            return
+        name, start, start_bytes, args = token
+        now = time.perf_counter_ns()
+        cls._emit(RenderEvent(RenderPhase.END, name, now, now - start, cls._thread_bytes() - start_bytes,
+                              threading.get_ident(), args))
+
+    @classmethod
+    def count_bytes(cls, text: str):
+        """Add the size of text written to the terminal by the current thread."""
+        if cls._hooks:
+            size = len(text.encode('utf-8', errors='replace')) if isinstance(text, str) else len(text)
+            cls._local.bytes = getattr(cls._local, 'bytes', 0) + size
+
+    @classmethod
+    def _thread_bytes(cls) -> int:
+        return getattr(cls._local, 'bytes', 0)
+
+    @classmethod
+    def _emit(cls, event: RenderEvent):
+        for hook in cls._hooks:
+            try:
+                hook(event)
+            except Exception as ex:
+                LOGGER.debug(f'Render hook {hook!r} failed: {repr(ex)}')
+
+
+class TraceCollector():
+    """
+    Render hook collecting events for export in Chrome trace-event format.
+
+    Each END event becomes a complete ('X') trace event, so overlapping spans
+    (i.e. concurrent message boxes) are represented correctly.
+
+    Keyword Arguments:
+        max_events: Events kept, oldest are dropped first (default: {1_000_000}).
+    """
+    def __init__(self, max_events: int = 1_000_000):
+        self._events: Deque[RenderEvent] = collections.deque(maxlen=max_events)
+        self._thread_names: Dict[int, str] = {}
+
+    def __call__(self, event: RenderEvent):
+        if event.phase == RenderPhase.END:
+            self._events.append(event)
+            if event.thread_id not in self._thread_names:
+                self._thread_names[event.thread_id] = threading.current_thread().name
+
+    @property
+    def events(self) -> List[RenderEvent]:
+        """Collected END events."""
+        return list(self._events)
+
+    def clear(self):
+        """Discard collected events."""
+        self._events.clear()
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Collected events as a Chrome trace-event document.
+
+        Returns:
+            Dictionary, serialize with json.dump().
+        """
+        pid = os.getpid()
+        trace_events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+            for tid, name in self._thread_names.items()
+        ]
+        for event in list(self._events):
+            args = {'bytes': event.bytes_written}
+            if event.args:
+                args.update(event.args)
+            trace_events.append({
+                'name': event.name,
+                'cat': event.name.split('.', 1)[0],
+                'ph': 'X',
+                'ts': (event.timestamp_ns - event.duration_ns) / 1000,
+                'dur': event.duration_ns / 1000,
+                'pid': pid,
+                'tid': event.thread_id,
+                'args': args,
+            })
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def save(self, target: Union[str, IO[str]]):
+        """
+        Write the Chrome trace-event JSON.
+
+        Arguments:
+            target: File name or open text file.
+        """
+        if isinstance(target, str):
+            with open(target, 'w', encoding='utf-8') as trace_file:
+                json.dump(self.to_chrome_trace(), trace_file, default=str)
+        else:
+            json.dump(self.to_chrome_trace(), target, default=str)
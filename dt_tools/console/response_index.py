@@ -0,0 +1,217 @@
+"""
+Indexed set of valid responses for console prompts.
+
+Used by :func:`~dt_tools.console.console_helper.ConsoleInputHelper.get_input_with_timeout()`
+to validate input.  Responses are compiled once into a set (for constant time
+validation) and a prefix trie, which provides:
+
+    - Unique prefix acceptance (i.e. 'web0' accepted for 'web01.example.com' if no other match).
+    - Tab completion and candidate listing for partial input.
+    - Optional case-insensitive matching.
+
+Build the index once and pass it to each prompt when the list of responses is large.
+
+Example::
+
+    from dt_tools.console.console_helper import ConsoleInputHelper
+    from dt_tools.console.response_index import ResponseIndex
+
+    hosts = ResponseIndex(host_list, case_sensitive=False, allow_prefix=True)
+    host = ConsoleInputHelper.get_input_with_timeout('Host > ', valid_responses=hosts)
+
+"""
+import heapq
+from typing import Dict, Iterable, List, Optional, Union
+
+
+class _TrieNode():
+    __slots__ = ('children', 'count', 'word', 'order')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.count: int = 0
+        """Number of responses at or below this node."""
+        self.word: str = None
+        """Canonical response ending at this node."""
+        self.order: int = -1
+        """Position of word in the supplied responses."""
+
+
+class ResponseIndex():
+    """
+    Set + prefix trie of valid responses.
+
+    Arguments:
+        responses: Valid responses.
+
+    Keyword Arguments:
+        case_sensitive: Match case exactly (default: {True}).
+        allow_prefix: Accept a unique prefix of a response as that response (default: {False}).
+    """
+    def __init__(self, responses: Iterable[str], case_sensitive: bool = True, allow_prefix: bool = False):
+        self._case_sensitive = case_sensitive
+        self._allow_prefix = allow_prefix
+        self._lookup: Dict[str, str] = {}
+        self._root = _TrieNode()
+        for response in responses:
+            self._add(str(response))
+
+    @classmethod
+    def of(cls, valid_responses: Union['ResponseIndex', Iterable[str], None]) -> 'ResponseIndex':
+        """
+        Return valid_responses as a ResponseIndex, compiling it if needed.
+
+        Arguments:
+            valid_responses: ResponseIndex (returned as is) or iterable of responses.
+
+        Returns:
+            ResponseIndex with exact, case-sensitive matching for iterables.
+        """
+        if isinstance(valid_responses, ResponseIndex):
+            return valid_responses
+        return ResponseIndex(valid_responses or [])
+
+    @property
+    def case_sensitive(self) -> bool:
+        return self._case_sensitive
+
+    @property
+    def allow_prefix(self) -> bool:
+        return self._allow_prefix
+
+    def match(self, text: str) -> Optional[str]:
+        """
+        Validate text against the responses.
+
+        Arguments:
+            text: User input.
+
+        Returns:
+            The matching response (as originally supplied), or None if no match.
+        """
+        if text is None:
+            return None
+        key = self._normalize(text)
+        response = self._lookup.get(key)
+        if response is None and self._allow_prefix and key:
+            node = self._find(key)
+            if node is not None and node.count == 1:
+                response = self._first_word(node)
+        return response
+
+    def candidates(self, prefix: str, limit: int = None) -> List[str]:
+        """
+        Responses starting with prefix.
+
+        Arguments:
+            prefix: Partial input.
+
+        Keyword Arguments:
+            limit: Maximum number of candidates returned (default: {None} - all).
+
+        Returns:
+            Matching responses, in the order they were supplied to the index.
+        """
+        node = self._find(self._normalize(prefix))
+        if node is None:
+            return []
+        return self._words(node, limit)
+
+    def count(self, prefix: str) -> int:
+        """Number of responses starting with prefix."""
+        node = self._find(self._normalize(prefix))
+        return 0 if node is None else node.count
+
+    def complete(self, prefix: str) -> str:
+        """
+        Extend prefix as far as the matching responses agree.
+
+        Arguments:
+            prefix: Partial input.
+
+        Returns:
+            Longest common completion (prefix itself if none).
+        """
+        key = self._normalize(prefix)
+        node = self._find(key)
+        if node is None:
+            return prefix
+        extension = ''
+        while node.word is None and len(node.children) == 1:
+            char, node = next(iter(node.children.items()))
+            extension += char
+        if node.word is not None and node.count == 1:
+            return node.word
+        if self._case_sensitive or not extension:
+            return prefix + extension
+        # Show the completed portion in the case of the first candidate.  Trie positions are
+        # casefolded, which may be longer than the response (i.e. 'ß' -> 'ss').
+        first = self._words(node, 1)[0]
+        start = self._source_index(first, len(key))
+        if len(first[:start].casefold()) != len(key):
+            # prefix ends inside a character that casefolds to several
+            return prefix
+        return prefix + first[start:self._source_index(first, len(key) + len(extension))]
+
+    def __contains__(self, text: str) -> bool:
+        return self.match(text) is not None
+
+    def __len__(self) -> int:
+        return len(self._lookup)
+
+    def __bool__(self) -> bool:
+        return len(self._lookup) > 0
+
+    def __iter__(self):
+        return iter(self._lookup.values())
+
+    def _normalize(self, text: str) -> str:
+        return text if self._case_sensitive else text.casefold()
+
+    def _add(self, response: str):
+        key = self._normalize(response)
+        if key in self._lookup:
+            return
+        node = self._root
+        node.count += 1
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+            node.count += 1
+        node.word = response
+        node.order = len(self._lookup)
+        self._lookup[key] = response
+
+    def _find(self, key: str) -> Optional[_TrieNode]:
+        node = self._root
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def _first_word(self, node: _TrieNode) -> str:
+        while node.word is None:
+            node = next(iter(node.children.values()))
+        return node.word
+
+    def _words(self, node: _TrieNode, limit: int = None) -> List[str]:
+        """Responses at or below node, in supplied order."""
+        found = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.word is not None:
+                found.append((current.order, current.word))
+            stack.extend(current.children.values())
+        found = sorted(found) if limit is None else heapq.nsmallest(limit, found)
+        return [word for _, word in found]
+
+    @staticmethod
+    def _source_index(word: str, length: int) -> int:
+        """Number of leading characters of word whose casefolded form fits in length."""
+        size = 0
+        for idx, char in enumerate(word):
+            size += len(char.casefold())
+            if size > length:
+                return idx
+        return len(word)
@@ -0,0 +1,346 @@
+"""
+Record and replay console sessions (asciicast v2 format).
+
+SessionRecorder tees all output written through ConsoleHelper (text and
+escape sequences, including widgets and prompts) with a monotonic timestamp, either into a fixed size,
+preallocated in-memory ring buffer, or into a file written by a background
+thread.  Memory use is capped in both cases.
+
+Recordings use the asciicast v2 format, so besides SessionPlayer they can be
+played with asciinema (``asciinema play job.cast``).
+
+Example::
+
+    from dt_tools.console.session_recorder import SessionRecorder, SessionPlayer
+
+    with SessionRecorder('job.cast'):
+        run_job()
+
+    SessionPlayer('job.cast').play(speed=2.0, max_idle=1.0)
+
+    # Keep only the last 1MB of output in memory, save it if the job fails
+    recorder = SessionRecorder(max_bytes=1_000_000).start()
+    try:
+        run_job()
+    except Exception:
+        recorder.save('failed-job.cast')
+        raise
+    finally:
+        recorder.stop()
+
+"""
+import json
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+from typing import IO, Final, Iterator, List, Optional, Tuple, Union
+
+from dt_tools.console._lazy import LOGGER
+
+
+class _RingBuffer():
+    """
+    Preallocated byte ring holding (timestamp, text) records.
+
+    Each record is a 12 byte header (timestamp, payload length) followed by the
+    UTF-8 payload.  When full, the oldest records are dropped.
+    """
+    _HEADER: Final = struct.Struct('<dI')
+
+    def __init__(self, capacity: int):
+        if capacity <= self._HEADER.size:
+            raise ValueError(f'Ring buffer capacity must be > {self._HEADER.size} bytes')
+        self._buffer = bytearray(capacity)
+        self._capacity = capacity
+        self._head = 0
+        """Offset of the oldest record."""
+        self._used = 0
+        self.records = 0
+        self.dropped = 0
+        """Records dropped to make room."""
+
+    def append(self, timestamp: float, payload: bytes):
+        max_payload = self._capacity - self._HEADER.size
+        if len(payload) > max_payload:
+            payload = payload[-max_payload:]
+        size = self._HEADER.size + len(payload)
+        while self._capacity - self._used < size:
+            _, length = self._HEADER.unpack(self._read(self._head, self._HEADER.size))
+            dropped = self._HEADER.size + length
+            self._head = (self._head + dropped) % self._capacity
+            self._used -= dropped
+            self.records -= 1
+            self.dropped += 1
+        tail = (self._head + self._used) % self._capacity
+        self._write(tail, self._HEADER.pack(timestamp, len(payload)))
+        self._write((tail + self._HEADER.size) % self._capacity, payload)
+        self._used += size
+        self.records += 1
+
+    def __iter__(self) -> Iterator[Tuple[float, bytes]]:
+        offset = self._head
+        remaining = self._used
+        while remaining > 0:
+            timestamp, length = self._HEADER.unpack(self._read(offset, self._HEADER.size))
+            payload = self._read((offset + self._HEADER.size) % self._capacity, length)
+            yield timestamp, payload
+            size = self._HEADER.size + length
+            offset = (offset + size) % self._capacity
+            remaining -= size
+
+    def clear(self):
+        self._head = 0
+        self._used = 0
+        self.records = 0
+        self.dropped = 0
+
+    def _write(self, offset: int, data: bytes):
+        first = min(len(data), self._capacity - offset)
+        self._buffer[offset:offset + first] = data[:first]
+        if first < len(data):
+            self._buffer[:len(data) - first] = data[first:]
+
+    def _read(self, offset: int, length: int) -> bytes:
+        first = min(length, self._capacity - offset)
+        data = bytes(self._buffer[offset:offset + first])
+        if first < length:
+            data += bytes(self._buffer[:length - first])
+        return data
+
+
+class SessionRecorder():
+    """
+    Record ConsoleHelper terminal output.
+
+    Only one recorder is active at a time, starting a recorder replaces the
+    active one.
+
+    Keyword Arguments:
+        target: File name or open text file for the asciicast recording, None
+          records into an in-memory ring buffer (default: {None}).
+        max_bytes: In-memory: ring buffer size, oldest output is dropped when
+          full.  File: max output waiting to be written, output beyond it is
+          dropped (and counted) until the writer catches up (default: {8_000_000}).
+        flush_secs: File: interval of the background writer (default: {0.25}).
+        title: Recording title (default: {None}).
+    """
+    def __init__(self, target: Union[str, IO[str]] = None, max_bytes: int = 8_000_000,
+                 flush_secs: float = 0.25, title: str = None):
+        self._target = target
+        self._max_bytes = max_bytes
+        self._flush_secs = flush_secs
+        self._title = title
+        self._lock = threading.Lock()
+        self._ring: Optional[_RingBuffer] = None if target is not None else _RingBuffer(max_bytes)
+        self._pending: queue.SimpleQueue = queue.SimpleQueue()
+        self._pending_bytes = 0
+        self._dropped = 0
+        self._writer: threading.Thread = None
+        self._stop = threading.Event()
+        self._file: IO[str] = None
+        self._owns_file = False
+        self._start_time = 0.0
+        self._start_epoch = 0
+        self._size = (80, 24)
+
+    @property
+    def active(self) -> bool:
+        """True if this recorder is receiving output."""
+        from dt_tools.console.console_helper import ConsoleHelper
+        return ConsoleHelper._recorder is self
+
+    @property
+    def dropped(self) -> int:
+        """Number of output writes dropped to stay within max_bytes."""
+        return self._dropped + (self._ring.dropped if self._ring is not None else 0)
+
+    def start(self) -> 'SessionRecorder':
+        """Start recording, returns self."""
+        from dt_tools.console.console_helper import ConsoleHelper
+
+        try:
+            columns, rows = os.get_terminal_size()
+            self._size = (columns, rows)
+        except OSError:
+            pass
+        self._start_time = time.monotonic()
+        self._start_epoch = int(time.time())
+        if self._target is not None:
+            self._owns_file = isinstance(self._target, str)
+            self._file = open(self._target, 'w', encoding='utf-8') if self._owns_file else self._target
+            self._file.write(json.dumps(self._header()) + '\n')
+            self._stop.clear()
+            self._writer = threading.Thread(target=self._write_loop, name='session-recorder', daemon=True)
+            self._writer.start()
+
+        previous = ConsoleHelper._recorder
+        if previous is not None and previous is not self:
+            previous.stop()
+        ConsoleHelper._recorder = self
+        LOGGER.trace('SessionRecorder started')
+        return self
+
+    def stop(self):
+        """Stop recording, pending output is written and the file closed."""
+        from dt_tools.console.console_helper import ConsoleHelper
+
+        if ConsoleHelper._recorder is self:
+            ConsoleHelper._recorder = None
+        if self._writer is not None:
+            self._stop.set()
+            self._writer.join()
+            self._writer = None
+            self._file.flush()
+            if self._owns_file:
+                self._file.close()
+            self._file = None
+
+    def record(self, text: str):
+        """Add output text (called by ConsoleHelper for each terminal write)."""
+        elapsed = time.monotonic() - self._start_time
+        if self._ring is not None:
+            payload = text.encode('utf-8', errors='replace')
+            with self._lock:
+                self._ring.append(elapsed, payload)
+            return
+
+        # max_bytes is a byte limit, as in ring mode
+        size = len(text) if text.isascii() else len(text.encode('utf-8', errors='replace'))
+        with self._lock:
+            if self._pending_bytes + size > self._max_bytes:
+                self._dropped += 1
+                return
+            self._pending_bytes += size
+        self._pending.put((elapsed, text, size))
+
+    def events(self) -> List[Tuple[float, str]]:
+        """In-memory recording: (elapsed seconds, text) for each write kept in the ring buffer."""
+        if self._ring is None:
+            raise ValueError('Recording is written to file, use SessionPlayer to read it.')
+        with self._lock:
+            return [(timestamp, payload.decode('utf-8', errors='replace')) for timestamp, payload in self._ring]
+
+    def save(self, target: Union[str, IO[str]]):
+        """
+        Write the in-memory recording in asciicast v2 format.
+
+        Arguments:
+            target: File name or open text file.
+        """
+        events = self.events()
+        lines = [json.dumps(self._header())]
+        lines.extend(json.dumps([round(timestamp, 6), 'o', text]) for timestamp, text in events)
+        if isinstance(target, str):
+            with open(target, 'w', encoding='utf-8') as cast_file:
+                cast_file.write('\n'.join(lines) + '\n')
+        else:
+            target.write('\n'.join(lines) + '\n')
+
+    def __enter__(self) -> 'SessionRecorder':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _header(self) -> dict:
+        header = {'version': 2, 'width': self._size[0], 'height': self._size[1], 'timestamp': self._start_epoch}
+        if self._title:
+            header['title'] = self._title
+        return header
+
+    def _write_loop(self):
+        while True:
+            stopping = self._stop.wait(self._flush_secs)
+            lines = []
+            size = 0
+            while True:
+                try:
+                    elapsed, text, text_size = self._pending.get_nowait()
+                except queue.Empty:
+                    break
+                lines.append(json.dumps([round(elapsed, 6), 'o', text]))
+                size += text_size
+            if lines:
+                with self._lock:
+                    self._pending_bytes -= size
+                self._file.write('\n'.join(lines) + '\n')
+                self._file.flush()
+            if stopping:
+                return
+
+
+class SessionPlayer():
+    """
+    Play an asciicast v2 recording.
+
+    Arguments:
+        source: File name or open text file.
+    """
+    def __init__(self, source: Union[str, IO[str]]):
+        if isinstance(source, str):
+            with open(source, encoding='utf-8') as cast_file:
+                lines = cast_file.read().splitlines()
+        else:
+            lines = source.read().splitlines()
+        if not lines:
+            raise ValueError('Empty recording.')
+        self.header: dict = json.loads(lines[0])
+        if self.header.get('version') != 2:
+            raise ValueError(f"Unsupported asciicast version: {self.header.get('version')}")
+        self._lines = lines[1:]
+
+    def events(self) -> Iterator[Tuple[float, str]]:
+        """(elapsed seconds, text) for each output event."""
+        for line in self._lines:
+            if not line.strip():
+                continue
+            elapsed, event_type, data = json.loads(line)
+            if event_type == 'o':
+                yield elapsed, data
+
+    def play(self, speed: float = 1.0, max_idle: float = None, out: IO[str] = None):
+        """
+        Write the recording to the terminal with the recorded timing.
+
+        Keyword Arguments:
+            speed: Playback speed multiplier (default: {1.0}).
+            max_idle: Cap pauses at this many seconds, None for as recorded (default: {None}).
+            out: Output stream (default: {sys.stdout}).
+        """
+        out = sys.stdout if out is None else out
+        previous = 0.0
+        clock = time.monotonic()
+        for elapsed, text in self.events():
+            delay = elapsed - previous
+            if max_idle is not None:
+                delay = min(delay, max_idle)
+            clock += delay / speed
+            pause = clock - time.monotonic()
+            if pause > 0:
+                time.sleep(pause)
+            out.write(text)
+            out.flush()
+            previous = elapsed
+
+
+if __name__ == "__main__":
+    from dt_tools.console.console_helper import ColorFG, ConsoleHelper
+    from dt_tools.console.progress_bar import ProgressBar
+
+    recorder = SessionRecorder(max_bytes=64_000).start()
+    ConsoleHelper.print(ConsoleHelper.cwrap('Recording...', ColorFG.GREEN))
+    p_bar = ProgressBar('Recorded bar', bar_length=40, max_increments=50)
+    for incr in range(1, 51):
+        p_bar.display_progress(incr)
+        time.sleep(.02)
+    recorder.stop()
+
+    ConsoleHelper.print(ConsoleHelper.cwrap('Replay (2x)...', ColorFG.YELLOW))
+    import io
+    cast = io.StringIO()
+    recorder.save(cast)
+    cast.seek(0)
+    SessionPlayer(cast).play(speed=2.0)
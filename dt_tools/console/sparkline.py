@@ -0,0 +1,316 @@
+"""
+Sparkline and rolling histogram widgets for live trends.
+
+Samples are kept in fixed size ``array('d')`` ring buffers, so adding a
+sample is O(1) and memory does not grow.  Rendering maps values to block
+characters through lookup tables.
+
+Both classes are dashboard widgets (see dt_tools.console.dashboard) and
+can also be displayed on their own, in place like a ProgressBar.
+display() only writes when the rendered glyphs change.
+
+Example::
+
+    from dt_tools.console.sparkline import RollingHistogram, Sparkline
+
+    rate = Sparkline('Rows/s', capacity=60)
+    latency = RollingHistogram('Latency', window=1000, bins=20, minimum=0, maximum=250)
+    for batch in batches:
+        rate.add(batch.rows_per_sec)
+        latency.add(batch.latency_ms)
+        rate.display()
+
+"""
+import math
+from array import array
+from typing import Final, List, Optional, Tuple
+
+from dt_tools.console.console_helper import ConsoleHelper
+from dt_tools.console.dashboard import Widget
+
+
+class _Blocks:
+    LEVELS: Final = ' ▁▂▃▄▅▆▇█'
+    """Index = eighths filled (0..8)."""
+    SPARK: Final = '▁▂▃▄▅▆▇█'
+    """Sparkline glyphs, lowest value still visible."""
+
+
+class _SampleRing():
+    """Fixed size ring of floats."""
+    __slots__ = ('_data', '_capacity', '_next', 'count')
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError('Ring capacity must be >= 1')
+        self._data = array('d', bytes(8 * capacity))
+        self._capacity = capacity
+        self._next = 0
+        self.count = 0
+
+    def add(self, value: float) -> Optional[float]:
+        """Store value, returns the sample it replaced (None if not full)."""
+        data = self._data
+        pos = self._next
+        evicted = data[pos] if self.count == self._capacity else None
+        data[pos] = value
+        self._next = pos + 1 if pos + 1 < self._capacity else 0
+        if evicted is None:
+            self.count += 1
+        return evicted
+
+    def last(self, n: int) -> List[float]:
+        """Most recent n samples, oldest first."""
+        n = min(n, self.count)
+        if n <= 0:
+            return []
+        start = (self._next - n) % self._capacity
+        end = start + n
+        if end <= self._capacity:
+            return self._data[start:end].tolist()
+        return self._data[start:].tolist() + self._data[:end - self._capacity].tolist()
+
+    def clear(self):
+        self._next = 0
+        self.count = 0
+
+
+class _InPlaceDisplay(Widget):
+    """Standalone single line display, written only when it changes."""
+    def __init__(self, caption: str):
+        super().__init__()
+        self._caption = caption
+        self._displayed: str = None
+
+    def display(self, width: int = None) -> bool:
+        """
+        Write the widget on the current console line, if it changed.
+
+        Keyword Arguments:
+            width: Line width, None for the console width (default: {None}).
+
+        Returns:
+            True if the line was written.
+        """
+        if width is None:
+            width = ConsoleHelper.get_console_size()[1] - 1
+        line = self.render(max(width, 1), 1)[0]
+        if line == self._displayed:
+            return False
+        self._displayed = line
+        ConsoleHelper._output_to_terminal(f'\r{line}\x1b[K')
+        return True
+
+    def _label(self) -> str:
+        return f'{self._caption} ' if self._caption else ''
+
+
+class Sparkline(_InPlaceDisplay):
+    """
+    Trend of the most recent samples, one character per sample.
+
+    Keyword Arguments:
+        caption: Text before the sparkline (default: {''}).
+        capacity: Samples kept (default: {120}).
+        minimum: Fixed scale minimum, None to use the displayed samples' minimum (default: {None}).
+        maximum: Fixed scale maximum, None to use the displayed samples' maximum (default: {None}).
+        value_format: Format of the latest value shown after the sparkline, None to hide it (default: {'{:.1f}'}).
+    """
+    def __init__(self, caption: str = '', capacity: int = 120, minimum: float = None, maximum: float = None,
+                 value_format: Optional[str] = '{:.1f}'):
+        super().__init__(caption)
+        self._ring = _SampleRing(capacity)
+        self._minimum = minimum
+        self._maximum = maximum
+        self._value_format = value_format
+        self._latest = math.nan
+
+    def add(self, value: float):
+        """Add a sample, O(1)."""
+        self._ring.add(value)
+        self._latest = value
+        self.invalidate()
+
+    def clear(self):
+        """Discard all samples."""
+        self._ring.clear()
+        self._latest = math.nan
+        self.invalidate()
+
+    @property
+    def count(self) -> int:
+        """Samples held."""
+        return self._ring.count
+
+    def values(self) -> List[float]:
+        """Samples held, oldest first."""
+        return self._ring.last(self._ring.count)
+
+    def glyphs(self, width: int) -> str:
+        """
+        Sparkline of the most recent samples.
+
+        Arguments:
+            width: Number of samples (characters).
+
+        Returns:
+            Sparkline string (NaN samples are blank, +/-inf are drawn at the top/bottom
+            and not used for scaling).
+        """
+        samples = self._ring.last(width)
+        isfinite = math.isfinite
+        isnan = math.isnan
+        finite = [value for value in samples if isfinite(value)]
+        spark = _Blocks.SPARK
+        top = len(spark) - 1
+        if not finite and self._minimum is None and self._maximum is None:
+            return ''.join(' ' if isnan(value) else spark[top] if value > 0 else spark[0] for value in samples)
+        low = self._minimum if self._minimum is not None else min(finite) if finite else self._maximum
+        high = self._maximum if self._maximum is not None else max(finite) if finite else self._minimum
+        scale = top / (high - low) if high > low else 0.0
+        return ''.join(
+            spark[min(max(int((value - low) * scale + 0.5), 0), top)] if isfinite(value) else
+            ' ' if isnan(value) else spark[top] if value > 0 else spark[0]
+            for value in samples
+        )
+
+    def render(self, width: int, height: int) -> List[str]:
+        label = self._label()
+        value = ''
+        if self._value_format and not math.isnan(self._latest):
+            value = f' {self._value_format.format(self._latest)}'
+        return [f'{label}{self.glyphs(max(width - len(label) - len(value), 0))}{value}']
+
+
+class RollingHistogram(_InPlaceDisplay):
+    """
+    Distribution of the most recent samples over fixed, equal width bins.
+
+    Bin counts are maintained as samples arrive and expire, adding a sample
+    is O(1).  Values outside minimum..maximum are counted in the first/last bin.
+
+    Keyword Arguments:
+        caption: Text displayed before (single line) or above the bars (default: {''}).
+        window: Samples counted (default: {1000}).
+        bins: Number of bins (default: {20}).
+        minimum: Lower edge of the first bin (default: {0.0}).
+        maximum: Upper edge of the last bin (default: {1.0}).
+    """
+    def __init__(self, caption: str = '', window: int = 1000, bins: int = 20, minimum: float = 0.0, maximum: float = 1.0):
+        super().__init__(caption)
+        if bins < 1 or maximum <= minimum:
+            raise ValueError('RollingHistogram requires bins >= 1 and maximum > minimum.')
+        self._ring = _SampleRing(window)
+        self._bins = bins
+        self._minimum = minimum
+        self._bin_scale = bins / (maximum - minimum)
+        self._counts = array('q', bytes(8 * bins))
+
+    def _bin(self, value: float) -> int:
+        if not math.isfinite(value):
+            return 0 if value < 0 else self._bins - 1
+        idx = int((value - self._minimum) * self._bin_scale)
+        return 0 if idx < 0 else idx if idx < self._bins else self._bins - 1
+
+    def add(self, value: float):
+        """Add a sample (the oldest sample expires when the window is full), O(1).  NaN is ignored."""
+        if math.isnan(value):
+            return
+        evicted = self._ring.add(value)
+        if evicted is not None:
+            self._counts[self._bin(evicted)] -= 1
+        self._counts[self._bin(value)] += 1
+        self.invalidate()
+
+    def clear(self):
+        """Discard all samples."""
+        self._ring.clear()
+        self._counts = array('q', bytes(8 * self._bins))
+        self.invalidate()
+
+    @property
+    def count(self) -> int:
+        """Samples in the window."""
+        return self._ring.count
+
+    def counts(self) -> List[int]:
+        """Sample count per bin."""
+        return self._counts.tolist()
+
+    def bin_range(self, idx: int) -> Tuple[float, float]:
+        """(lower, upper) edge of bin idx."""
+        width = 1 / self._bin_scale
+        return (self._minimum + idx * width, self._minimum + (idx + 1) * width)
+
+    def bars(self, width: int, height: int = 1) -> List[str]:
+        """
+        Vertical bars, one column group per bin.
+
+        Arguments:
+            width: Columns available, bins are merged or widened to fit.
+
+        Keyword Arguments:
+            height: Rows (default: {1}).
+
+        Returns:
+            height lines, top row first.
+        """
+        columns = self._columns(width)
+        if not columns:
+            return [''] * height
+        peak = max(columns)
+        levels = _Blocks.LEVELS
+        eighths = [(count * height * 8 + peak - 1) // peak if peak else 0 for count in columns]
+        lines = []
+        for row in range(height - 1, -1, -1):
+            base = row * 8
+            lines.append(''.join(levels[min(max(fill - base, 0), 8)] for fill in eighths))
+        return lines
+
+    def render(self, width: int, height: int) -> List[str]:
+        label = self._label()
+        if height <= 1:
+            return [f'{label}{self.bars(max(width - len(label), 0))[0]}']
+        lines = [self._caption] if self._caption else []
+        return lines + self.bars(width, height - len(lines))
+
+    def _columns(self, width: int) -> List[int]:
+        # Bin counts mapped to width columns
+        counts = self._counts.tolist()
+        if width <= 0:
+            return []
+        if self._bins <= width:
+            repeat = width // self._bins
+            return [count for count in counts for _ in range(repeat)]
+        group = -(-self._bins // width)
+        return [sum(counts[idx:idx + group]) for idx in range(0, self._bins, group)]
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    ConsoleHelper.print('Standalone (redraws only when glyphs change):')
+    spark = Sparkline('Throughput', capacity=60, value_format='{:6.0f} rows/s')
+    writes = 0
+    for idx in range(600):
+        # Refreshed every loop, a new sample every 5th loop
+        if idx % 5 == 0:
+            spark.add(1000 + 400 * math.sin(idx / 15) + random.randint(-50, 50))
+        writes += spark.display(60)
+        time.sleep(.005)
+    ConsoleHelper.print(f'\n{writes} writes for 600 display() calls\n')
+
+    from dt_tools.console.dashboard import Dashboard, Region, StatusWidget
+    latency = RollingHistogram('Latency 0-250ms', window=500, bins=25, minimum=0, maximum=250)
+    rate = Sparkline('Req/s', capacity=200)
+    status = StatusWidget()
+    with Dashboard(Region.rows(Region('rate', rate, size=1), Region('latency', latency, size=8),
+                               Region('status', status, size=1), Region()), fps=20) as dash:
+        for idx in range(2000):
+            rate.add(500 + 200 * math.sin(idx / 50) + random.random() * 50)
+            latency.add(random.lognormvariate(4, 0.4))
+            if idx % 100 == 0:
+                status.set_text(f'Samples: {idx}  Frames: {dash.frames}')
+            time.sleep(.001)
+        time.sleep(1)
@@ -20,9 +20,10 @@ import time
 from datetime import datetime as dt
 from enum import Enum
 
-from loguru import logger as LOGGER
+from dt_tools.console._lazy import LOGGER
 
 from dt_tools.console.console_helper import ConsoleHelper
+from dt_tools.console.render_hooks import RenderHooks
 
 
 class SpinnerType(Enum):
@@ -156,9 +157,15 @@ class Spinner():
                 self._elapsed_time = self._calculate_elapsed_time(dt.now(), self._start_time)
                 elapsed_display = self._elapsed_time
             terminal_line = f'{self._caption} {cursor}  {elapsed_display} {self._suffix}'
-            ConsoleHelper.print(terminal_line, eol='')
-            ConsoleHelper.clear_to_EOL()
-            ConsoleHelper.cursor_move(column=1)
+            span = RenderHooks.begin('Spinner.tick')
+            try:
+                with ConsoleHelper._output_lock:
+                    # One frame, log output (see LogPane) must not land mid-line
+                    ConsoleHelper.print(terminal_line, eol='')
+                    ConsoleHelper.clear_to_EOL()
+                    ConsoleHelper._output_to_terminal('\r')
+            finally:
+                RenderHooks.end(span)
             time.sleep(delay)
             loopcnt += 1
 
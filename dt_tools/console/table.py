@@ -0,0 +1,272 @@
+"""
+Stream rows to the console as an aligned table.
+
+Column widths come from the column definitions, or are measured on a
+sampled prefix of the rows (the first ``sample_rows`` rows are buffered,
+all others are formatted and written as they arrive), so memory use is
+constant no matter how many rows are rendered.
+
+Features:
+    - Fixed, sampled or capped column widths.
+    - Left, right or centered alignment per column.
+    - Over-long values truncated with an ellipsis.
+    - Per-column styles (ColorFG, ColorBG, TextStyle codes).  Values may also
+      be pre-styled, widths are measured in visible characters.
+    - Output batched into large writes.
+
+Example::
+
+    from dt_tools.console.console_helper import ColorFG, TextStyle
+    from dt_tools.console.table import Align, StreamingTable, TableColumn
+
+    table = StreamingTable([
+        TableColumn('Host', max_width=30),
+        TableColumn('Status', style=ColorFG.GREEN),
+        TableColumn('Bytes', align=Align.RIGHT, width=12),
+    ])
+    table.render(cursor)  # any iterable of row sequences
+
+"""
+import itertools
+import operator
+from typing import IO, Any, Callable, Final, Iterable, Iterator, List, NamedTuple, Sequence, Union
+
+from dt_tools.console._lazy import LOGGER
+from dt_tools.console.ansi_text import AnsiText
+from dt_tools.console.console_helper import ConsoleHelper, TextStyle
+
+
+class Align:
+    """Column alignment."""
+    LEFT: Final = '<'
+    RIGHT: Final = '>'
+    CENTER: Final = '^'
+
+
+class TableColumn(NamedTuple):
+    """Table column definition."""
+    name: str
+    """Header text."""
+    width: int = None
+    """Fixed width, None to size from the sampled rows."""
+    align: str = Align.LEFT
+    """Value alignment (see Align)."""
+    style: str = None
+    """Color/style code(s) applied to values (i.e. ColorFG.GREEN)."""
+    min_width: int = 1
+    """Minimum sampled width."""
+    max_width: int = None
+    """Maximum sampled width, longer values are truncated."""
+    formatter: Callable[[Any], str] = None
+    """Value to text conversion (default: str(), None as '')."""
+
+
+class StreamingTable():
+    """
+    Table renderer for an iterator of rows.
+
+    Arguments:
+        columns: Column definitions (TableColumn, or header names).
+
+    Keyword Arguments:
+        sample_rows: Rows buffered to size columns without a fixed width (default: {100}).
+        separator: Text between columns (default: {'  '}).
+        ellipsis: Marker for truncated values (default: {'…'}).
+        header: Output the header and underline rows (default: {True}).
+        header_style: Header row style code (default: {TextStyle.BOLD}).
+        color: Output column/header styles, False for plain text (default: {True}).
+        batch_rows: Lines joined into each write (default: {1000}).
+    """
+    def __init__(self, columns: Sequence[Union[TableColumn, str]], sample_rows: int = 100, separator: str = '  ',
+                 ellipsis: str = '…', header: bool = True, header_style: str = TextStyle.BOLD,
+                 color: bool = True, batch_rows: int = 1000):
+        if not columns:
+            raise ValueError('StreamingTable requires at least one column.')
+        self.columns: List[TableColumn] = [col if isinstance(col, TableColumn) else TableColumn(str(col)) for col in columns]
+        self._sample_rows = max(sample_rows, 0)
+        self._separator = separator
+        self._ellipsis = ellipsis
+        self._header = header
+        self._header_style = header_style
+        self._color = color
+        self._batch_rows = max(batch_rows, 1)
+        self.widths: List[int] = []
+        """Column widths used by the last lines()/render() call."""
+
+    def lines(self, rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+        """
+        Format rows as table lines.
+
+        Arguments:
+            rows: Iterable of row sequences, one value per column (missing
+              values are blank, extra values are ignored).
+
+        Returns:
+            Iterator of lines (without line ending).
+        """
+        rows = iter(rows)
+        ncols = len(self.columns)
+        texts = [col.formatter for col in self.columns]
+        row_text = self._row_text
+
+        sample = [row_text(row, texts, ncols) for row in itertools.islice(rows, self._sample_rows)]
+        self.widths = self._size_columns(sample)
+        LOGGER.trace(f'StreamingTable widths: {self.widths} ({len(sample)} sampled rows)')
+
+        if self._header:
+            header_line = self._format_line(self._header_style if self._color else None)
+            yield header_line(*self._fit([col.name for col in self.columns]))
+            yield self._separator.join('-' * width for width in self.widths)
+
+        # Hot loop: locals only, checks done in C (map, str.count), _fit() only for rows that overflow
+        # or hold pre-styled values (more ESC characters than the line format itself adds)
+        row_line = self._format_line(None)
+        fit = self._fit
+        fit_styled = self._fit_styled_cells
+        widths = self.widths
+        gt = operator.gt
+        esc = '\x1b'
+        format_escapes = row_line(*[''] * ncols).count(esc)
+        for cells in sample:
+            line = row_line(*fit(cells)) if any(map(gt, map(len, cells), widths)) else row_line(*cells)
+            yield line if line.count(esc) == format_escapes else row_line(*fit_styled(cells))
+        if any(texts):
+            for row in rows:
+                cells = row_text(row, texts, ncols)
+                line = row_line(*fit(cells)) if any(map(gt, map(len, cells), widths)) else row_line(*cells)
+                yield line if line.count(esc) == format_escapes else row_line(*fit_styled(cells))
+            return
+        for row in rows:
+            cells = [value if type(value) is str else '' if value is None else str(value) for value in row]
+            if len(cells) != ncols:
+                cells = row_text(cells, texts, ncols)
+            line = row_line(*fit(cells)) if any(map(gt, map(len, cells), widths)) else row_line(*cells)
+            yield line if line.count(esc) == format_escapes else row_line(*fit_styled(cells))
+
+    def render(self, rows: Iterable[Sequence[Any]], out: IO[str] = None) -> int:
+        """
+        Write the table.
+
+        Arguments:
+            rows: Iterable of row sequences, one value per column.
+
+        Keyword Arguments:
+            out: Output stream, None for the console via ConsoleHelper (default: {None}).
+
+        Raises:
+            BrokenPipeError: The reader went away (i.e. pager quit), CLI entry points
+              usually exit quietly (see dt_tools.console.ansi_strip.main()).
+
+        Returns:
+            Number of data rows written.
+        """
+        if out is None:
+            def write(text: str):
+                ConsoleHelper._output_to_terminal(text)
+        else:
+            write = out.write
+
+        header_lines = 2 if self._header else 0
+        count = 0
+        for batch in self._batches(self.lines(rows)):
+            write('\n'.join(batch) + '\n')
+            count += len(batch)
+        if out is not None:
+            out.flush()
+        return max(count - header_lines, 0)
+
+    # -- internals -----------------------------------------------------------------------------------
+    def _batches(self, lines: Iterator[str]) -> Iterator[List[str]]:
+        size = self._batch_rows
+        while True:
+            batch = list(itertools.islice(lines, size))
+            if not batch:
+                return
+            yield batch
+
+    @staticmethod
+    def _row_text(row: Sequence[Any], texts: List[Callable[[Any], str]], ncols: int) -> List[str]:
+        cells = [text(value) if text else value if type(value) is str else '' if value is None else str(value)
+                 for value, text in zip(row, texts)]
+        if len(cells) < ncols:
+            cells.extend([''] * (ncols - len(cells)))
+        return cells
+
+    def _size_columns(self, sample: List[List[str]]) -> List[int]:
+        widths = []
+        for idx, col in enumerate(self.columns):
+            if col.width is not None:
+                widths.append(max(col.width, 1))
+                continue
+            width = max([AnsiText.visible_length(col.name) if self._header else 0] +
+                        [AnsiText.visible_length(cells[idx]) for cells in sample])
+            width = max(width, col.min_width, 1)
+            if col.max_width is not None:
+                width = min(width, max(col.max_width, 1))
+            widths.append(width)
+        return widths
+
+    def _fit(self, cells: List[str]) -> List[str]:
+        # Truncates in place, cells is a per-row list
+        ellipsis = self._ellipsis
+        keep = len(ellipsis)
+        for idx, width in enumerate(self.widths):
+            text = cells[idx]
+            if len(text) > width:
+                if '\x1b' in text:
+                    cells[idx] = self._fit_styled(text, idx)
+                else:
+                    cells[idx] = text[:width - keep] + ellipsis if width > keep else text[:width]
+        return cells
+
+    def _fit_styled_cells(self, cells: List[str]) -> List[str]:
+        # str.format() pads by raw length, pre-styled values are truncated and aligned here instead
+        for idx, text in enumerate(cells):
+            if '\x1b' in text:
+                cells[idx] = self._fit_styled(text, idx)
+        return cells
+
+    def _fit_styled(self, text: str, idx: int) -> str:
+        width = self.widths[idx]
+        text = AnsiText.truncate(text, width, self._ellipsis)
+        align = self.columns[idx].align
+        if align == Align.RIGHT:
+            return AnsiText.pad_left(text, width)
+        if align == Align.CENTER:
+            return AnsiText.center(text, width)
+        return AnsiText.pad(text, width)
+
+    def _format_line(self, line_style: str) -> Callable[..., str]:
+        # One precompiled format string per line type, alignment and padding done by str.format()
+        fields = []
+        for col, width in zip(self.columns, self.widths):
+            field = f'{{:{col.align}{width}}}'
+            style = line_style or (col.style if self._color else None)
+            if style:
+                field = f'{style}{field}{TextStyle.RESET}'
+            fields.append(field)
+        fmt = self._separator.replace('{', '{{').replace('}', '}}').join(fields)
+        return fmt.format
+
+
+if __name__ == "__main__":
+    import random
+    from dt_tools.console.console_helper import ColorFG
+
+    def sample_rows(count: int):
+        statuses = ['up', 'down', 'degraded']
+        for idx in range(count):
+            yield (f'web{idx:05}.{"internal." * random.randint(0, 4)}example.com',
+                   random.choice(statuses), random.randint(0, 10**9), round(random.random() * 100, 2))
+
+    ConsoleHelper.print_line_separator('StreamingTable - sampled widths', 60)
+    StreamingTable([
+        TableColumn('Host', max_width=32),
+        TableColumn('Status', style=ColorFG.GREEN),
+        TableColumn('Bytes', align=Align.RIGHT, formatter=lambda v: f'{v:,}'),
+        TableColumn('Load %', align=Align.RIGHT, style=ColorFG.YELLOW),
+    ], sample_rows=5).render(sample_rows(10))
+    print()
+    ConsoleHelper.print_line_separator('StreamingTable - fixed widths, no header', 60)
+    StreamingTable([TableColumn('Host', width=20), TableColumn('Status', width=4, align=Align.CENTER)],
+                   header=False, separator=' | ').render(sample_rows(5))
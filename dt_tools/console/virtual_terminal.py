@@ -0,0 +1,399 @@
+"""
+In-memory VT100 screen, a stand-in terminal for tests and benchmarks.
+
+VirtualTerminal parses the escape sequences ConsoleHelper emits into a grid
+of characters (and SGR styles), so what Spinner, ProgressBar,
+display_status(), ... draw can be checked without a tty, and the bytes
+needed for each redraw can be counted.
+
+Supported:
+
+    - Printable text with auto-wrap, CR, LF, BS, TAB.
+    - CUP/HVP (ESC[r;cH), CUU/CUD/CUF/CUB, CHA (ESC[cG), VPA (ESC[rd).
+    - ED (ESC[nJ), EL (ESC[nK), SU/SD (ESC[nS, ESC[nT).
+    - SGR (ESC[...m), tracked per cell as the active parameter string.
+    - DECSTBM scroll regions (ESC[t;br).
+    - Save/restore cursor (ESC 7 / ESC 8, ESC[s / ESC[u).
+    - DSR (ESC[6n, ESC[5n), replies are collected in VirtualTerminal.replies.
+    - Cursor visibility (ESC[?25l/h), OSC title (ESC]2;title BEL).
+
+Other sequences are consumed and ignored.  Sequences split across writes
+are handled.
+
+Example::
+
+    from dt_tools.console.console_helper import ConsoleHelper
+    from dt_tools.console.virtual_terminal import VirtualTerminal
+
+    with VirtualTerminal(rows=24, columns=80) as vt:
+        ConsoleHelper.print_at(3, 5, 'Hello')
+        assert vt.line(3).startswith('    Hello')
+        print(vt.bytes_written)
+
+"""
+import re
+from typing import Final, List, Optional, Tuple
+
+_DEFAULT_STYLE: Final = ''
+
+
+class VirtualTerminal():
+    """
+    Virtual terminal screen.
+
+    Used as ConsoleHelper's output target (see attach()), ConsoleHelper then
+    writes to the virtual screen and takes console size and cursor position
+    from it.
+
+    Keyword Arguments:
+        rows: Screen rows (default: {24}).
+        columns: Screen columns (default: {80}).
+        newline_cr: LF also returns to column 1, as the tty driver does for
+          program output (default: {True}).
+    """
+    _TOKEN: Final = re.compile(
+        r'([^\x00-\x1f\x7f\x1b]+)'                          # 1 printable run
+        r'|\x1b\[([0-?]*)[ -/]*([@-~])'                     # 2,3 CSI params, final
+        r'|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)'               # OSC
+        r'|\x1b([ -Z\\^-~])'                                # 4 ESC + one char (not CSI/OSC introducer)
+        r'|([\x00-\x1f\x7f])'                               # 5 control character
+    )
+    _MAX_CARRY: Final = 256
+    _OSC_TITLE: Final = re.compile(r'\x1b\][02];([^\x07\x1b]*)')
+
+    def __init__(self, rows: int = 24, columns: int = 80, newline_cr: bool = True):
+        if rows < 1 or columns < 1:
+            raise ValueError(f'Invalid screen size: {rows}x{columns}')
+        self.rows = rows
+        self.columns = columns
+        self.newline_cr = newline_cr
+        self.title = ''
+        self.cursor_visible = True
+        self.replies: List[str] = []
+        """Terminal replies (i.e. DSR cursor position reports), as they would be read from stdin."""
+        self._previous_target = None
+        self.reset()
+
+    # == Output target interface ==================================================
+    def write(self, text: str):
+        """Process terminal output."""
+        self.writes += 1
+        self.bytes_written += len(text.encode('utf-8', errors='replace'))
+        if self._carry:
+            text = self._carry + text
+            self._carry = ''
+        self._parse(text)
+
+    def flush(self):
+        pass
+
+    def get_size(self) -> Tuple[int, int]:
+        """Screen size as (rows, columns)."""
+        return (self.rows, self.columns)
+
+    def cursor_position(self) -> Tuple[int, int]:
+        """Answer a cursor position query, (row, column) 1 based."""
+        self.write('\x1b[6n')
+        reply = self.replies.pop()
+        row, col = reply[2:-1].split(';')
+        return int(row), int(col)
+
+    # == Attach to ConsoleHelper ==================================================
+    def attach(self) -> 'VirtualTerminal':
+        """Make this screen ConsoleHelper's output target, returns self."""
+        from dt_tools.console.console_helper import ConsoleHelper
+        self._previous_target = ConsoleHelper.set_output_target(self)
+        return self
+
+    def detach(self):
+        """Restore ConsoleHelper's previous output target."""
+        from dt_tools.console.console_helper import ConsoleHelper
+        if ConsoleHelper.get_output_target() is self:
+            ConsoleHelper.set_output_target(self._previous_target)
+        self._previous_target = None
+
+    def __enter__(self) -> 'VirtualTerminal':
+        return self.attach()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.detach()
+
+    # == Screen contents ==========================================================
+    @property
+    def cursor(self) -> Tuple[int, int]:
+        """Cursor location (row, column), 1 based."""
+        return (self._row + 1, self._col + 1)
+
+    @property
+    def scroll_region(self) -> Tuple[int, int]:
+        """Scroll region (top, bottom), 1 based."""
+        return (self._top + 1, self._bottom + 1)
+
+    def line(self, row: int, strip: bool = True) -> str:
+        """
+        Text of a screen row.
+
+        Arguments:
+            row: Row number, 1 based.
+
+        Keyword Arguments:
+            strip: Remove trailing blanks (default: {True}).
+        """
+        text = ''.join(self._chars[row - 1])
+        return text.rstrip() if strip else text
+
+    def display(self, strip: bool = True) -> List[str]:
+        """Text of all screen rows."""
+        return [self.line(row, strip) for row in range(1, self.rows + 1)]
+
+    def style_at(self, row: int, col: int) -> str:
+        """Active SGR parameters when the cell was written (i.e. '31;1'), '' for default."""
+        return self._styles[row - 1][col - 1]
+
+    def find(self, text: str) -> Optional[Tuple[int, int]]:
+        """Location (row, column) of the first occurrence of text on screen, None if not found."""
+        for idx, line in enumerate(self.display(strip=False)):
+            col = line.find(text)
+            if col >= 0:
+                return (idx + 1, col + 1)
+        return None
+
+    def reset(self):
+        """Clear screen, cursor home, default style and scroll region, zero counters."""
+        self._chars: List[List[str]] = [[' '] * self.columns for _ in range(self.rows)]
+        self._styles: List[List[str]] = [[_DEFAULT_STYLE] * self.columns for _ in range(self.rows)]
+        self._row = 0
+        self._col = 0
+        self._wrap_pending = False
+        self._style = _DEFAULT_STYLE
+        self._top = 0
+        self._bottom = self.rows - 1
+        self._saved: Tuple[int, int, str] = (0, 0, _DEFAULT_STYLE)
+        self._carry = ''
+        self.reset_counters()
+
+    def reset_counters(self):
+        """Zero writes, bytes_written, cells_written, scrolls."""
+        self.writes = 0
+        self.bytes_written = 0
+        self.cells_written = 0
+        self.scrolls = 0
+
+    def __str__(self) -> str:
+        return '\n'.join(self.display())
+
+    # == Parser ===================================================================
+    def _parse(self, text: str):
+        pos = 0
+        length = len(text)
+        match_at = self._TOKEN.match
+        while pos < length:
+            match = match_at(text, pos)
+            if match is None or (match.group(5) == '\x1b'):
+                # Incomplete escape sequence, keep it for the next write
+                if length - pos <= self._MAX_CARRY:
+                    self._carry = text[pos:]
+                    return
+                pos += 1
+                continue
+            pos = match.end()
+            printable, params, final, esc, control = match.group(1, 2, 3, 4, 5)
+            if printable is not None:
+                self._put_text(printable)
+            elif final is not None:
+                self._csi(params, final)
+            elif esc is not None:
+                self._esc(esc)
+            elif control is not None:
+                self._control(control)
+            else:
+                title = self._OSC_TITLE.match(match.group(0))
+                if title:
+                    self.title = title.group(1)
+
+    def _put_text(self, text: str):
+        columns = self.columns
+        style = self._style
+        idx = 0
+        while idx < len(text):
+            if self._wrap_pending:
+                self._wrap_pending = False
+                self._col = 0
+                self._line_feed()
+            room = columns - self._col
+            chunk = text[idx:idx + room]
+            end = self._col + len(chunk)
+            row_chars = self._chars[self._row]
+            row_chars[self._col:end] = chunk
+            self._styles[self._row][self._col:end] = [style] * len(chunk)
+            self.cells_written += len(chunk)
+            idx += len(chunk)
+            if end >= columns:
+                self._col = columns - 1
+                self._wrap_pending = True
+            else:
+                self._col = end
+
+    def _control(self, char: str):
+        if char == '\r':
+            self._col = 0
+            self._wrap_pending = False
+        elif char == '\n':
+            self._line_feed()
+            self._wrap_pending = False
+            if self.newline_cr:
+                self._col = 0
+        elif char == '\b':
+            if self._col > 0:
+                self._col -= 1
+            self._wrap_pending = False
+        elif char == '\t':
+            self._col = min(self.columns - 1, (self._col // 8 + 1) * 8)
+        # BEL and other control characters are ignored
+
+    def _esc(self, char: str):
+        if char == '7':
+            self._saved = (self._row, self._col, self._style)
+        elif char == '8':
+            self._row, self._col, self._style = self._saved
+            self._wrap_pending = False
+        elif char == 'D':
+            self._line_feed()
+        elif char == 'E':
+            self._col = 0
+            self._line_feed()
+        elif char == 'M':
+            self._reverse_line_feed()
+        elif char == 'c':
+            self.reset()
+
+    def _csi(self, params: str, final: str):
+        private = params.startswith('?')
+        if private:
+            if params in ('?25l', '?25h'):
+                self.cursor_visible = final == 'h'
+            return
+        args = [int(arg) if arg.isdigit() else 0 for arg in params.split(';')] if params else []
+
+        def arg(idx: int = 0, default: int = 1) -> int:
+            value = args[idx] if idx < len(args) else 0
+            return value if value > 0 else default
+
+        self._wrap_pending = False
+        if final in 'Hf':
+            self._row = min(self.rows, arg(0)) - 1
+            self._col = min(self.columns, arg(1)) - 1
+        elif final == 'A':
+            self._row = max(0, self._row - arg())
+        elif final == 'B':
+            self._row = min(self.rows - 1, self._row + arg())
+        elif final == 'C':
+            self._col = min(self.columns - 1, self._col + arg())
+        elif final == 'D':
+            self._col = max(0, self._col - arg())
+        elif final == 'G':
+            self._col = min(self.columns, arg()) - 1
+        elif final == 'd':
+            self._row = min(self.rows, arg()) - 1
+        elif final == 'J':
+            self._erase_display(arg(default=0))
+        elif final == 'K':
+            self._erase_line(arg(default=0))
+        elif final == 'm':
+            self._sgr(params)
+        elif final == 'r':
+            top = arg(0) - 1
+            bottom = min(self.rows, arg(1, self.rows)) - 1
+            if top < bottom:
+                self._top, self._bottom = top, bottom
+                self._row, self._col = 0, 0
+        elif final == 'S':
+            for _ in range(arg()):
+                self._scroll_up()
+        elif final == 'T':
+            for _ in range(arg()):
+                self._scroll_down()
+        elif final == 's':
+            self._saved = (self._row, self._col, self._style)
+        elif final == 'u':
+            self._row, self._col, self._style = self._saved
+        elif final == 'n':
+            if arg(default=0) == 6:
+                self.replies.append(f'\x1b[{self._row + 1};{self._col + 1}R')
+            elif arg(default=0) == 5:
+                self.replies.append('\x1b[0n')
+
+    def _sgr(self, params: str):
+        style = [] if not self._style else self._style.split(';')
+        for param in (params.split(';') if params else ['0']):
+            if param in ('', '0'):
+                style = []
+            elif param not in style:
+                style.append(param)
+        self._style = ';'.join(style)
+
+    def _erase_line(self, mode: int):
+        row_chars = self._chars[self._row]
+        row_styles = self._styles[self._row]
+        start, end = {0: (self._col, self.columns), 1: (0, self._col + 1)}.get(mode, (0, self.columns))
+        row_chars[start:end] = [' '] * (end - start)
+        row_styles[start:end] = [_DEFAULT_STYLE] * (end - start)
+
+    def _erase_display(self, mode: int):
+        if mode == 0:
+            self._erase_line(0)
+            rows = range(self._row + 1, self.rows)
+        elif mode == 1:
+            self._erase_line(1)
+            rows = range(0, self._row)
+        else:
+            rows = range(self.rows)
+        for row in rows:
+            self._chars[row] = [' '] * self.columns
+            self._styles[row] = [_DEFAULT_STYLE] * self.columns
+
+    def _line_feed(self):
+        if self._row == self._bottom:
+            self._scroll_up()
+        elif self._row < self.rows - 1:
+            self._row += 1
+
+    def _reverse_line_feed(self):
+        if self._row == self._top:
+            self._scroll_down()
+        elif self._row > 0:
+            self._row -= 1
+
+    def _scroll_up(self):
+        del self._chars[self._top]
+        del self._styles[self._top]
+        self._chars.insert(self._bottom, [' '] * self.columns)
+        self._styles.insert(self._bottom, [_DEFAULT_STYLE] * self.columns)
+        self.scrolls += 1
+
+    def _scroll_down(self):
+        del self._chars[self._bottom]
+        del self._styles[self._bottom]
+        self._chars.insert(self._top, [' '] * self.columns)
+        self._styles.insert(self._top, [_DEFAULT_STYLE] * self.columns)
+        self.scrolls += 1
+
+
+if __name__ == "__main__":
+    from dt_tools.console.console_helper import ColorFG, ConsoleHelper
+    from dt_tools.console.progress_bar import ProgressBar
+
+    with VirtualTerminal(rows=10, columns=60) as vt:
+        ConsoleHelper.clear_screen()
+        ConsoleHelper.print_at(2, 5, ConsoleHelper.cwrap('Hello, virtual world', ColorFG.GREEN))
+        p_bar = ProgressBar('Progress', bar_length=30, max_increments=10)
+        ConsoleHelper.cursor_move(5, 1)
+        for incr in range(1, 11):
+            p_bar.display_progress(incr)
+        ConsoleHelper.display_status('Status line')
+
+    print('+' + '-' * vt.columns + '+')
+    for line in vt.display(strip=False):
+        print(f'|{line}|')
+    print('+' + '-' * vt.columns + '+')
+    print(f'writes: {vt.writes}  bytes: {vt.bytes_written}  cells: {vt.cells_written}  cursor: {vt.cursor}')
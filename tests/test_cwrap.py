@@ -0,0 +1,28 @@
+"""ConsoleHelper.cwrap()/print() with text that is already styled."""
+import io
+
+from dt_tools.console.ansi_text import AnsiText
+from dt_tools.console.console_helper import ColorFG, ConsoleHelper
+
+
+def test_cwrap_nested_is_not_padded():
+    inner = ConsoleHelper.cwrap('red', ColorFG.RED)
+    outer = ConsoleHelper.cwrap(f'a {inner} b')
+    assert outer == 'a \x1b[31mred\x1b[0m b\x1b[0m'
+    assert AnsiText.visible_length(outer) == len('a red b')
+
+
+def test_cwrap_pads_to_visible_length():
+    wrapped = ConsoleHelper.cwrap(ConsoleHelper.cwrap('red', ColorFG.RED), length=6)
+    assert AnsiText.strip(wrapped) == 'red   '
+
+
+def test_print_styled_text():
+    out = io.StringIO()
+    previous = ConsoleHelper.set_output_target(out)
+    try:
+        ConsoleHelper.print('a ' + ConsoleHelper.cwrap('red', ColorFG.RED) + ' b')
+    finally:
+        ConsoleHelper.set_output_target(previous)
+    # No padding added for the escape characters
+    assert AnsiText.strip(out.getvalue()) == 'a red b\n'
@@ -0,0 +1,22 @@
+"""Dashboard relayout on console resize."""
+from dt_tools.console.console_helper import ConsoleHelper
+from dt_tools.console.dashboard import Dashboard, Region, TextWidget
+from dt_tools.console.virtual_terminal import VirtualTerminal
+
+
+def test_resize_repaints_unmoved_regions():
+    root = Region(children=[Region('title', TextWidget('Title'), size=1),
+                            Region('body', TextWidget('Body'))])
+    dash = Dashboard(root, alt_screen=False)
+    previous = ConsoleHelper.set_output_target(VirtualTerminal(rows=10, columns=40))
+    try:
+        dash.render()
+        # Resized: the title region keeps its place, the screen is cleared
+        terminal = VirtualTerminal(rows=12, columns=40)
+        ConsoleHelper.set_output_target(terminal)
+        dash.render()
+        screen = terminal.display()
+        assert screen[0] == 'Title'
+        assert screen[1] == 'Body'
+    finally:
+        ConsoleHelper.set_output_target(previous)
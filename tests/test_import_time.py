@@ -0,0 +1,37 @@
+"""Cold start budget for ConsoleHelper (see python -X importtime)."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parents[1]
+_MODULE = 'dt_tools.console.console_helper'
+_BUDGET_US = 50_000
+"""Import time allowed for console_helper excluding loguru (~30ms, was ~70ms before lazy imports)."""
+_RUNS = 3
+
+
+def _import_times() -> dict:
+    env = dict(os.environ, PYTHONPATH=str(_ROOT), PYTHONDONTWRITEBYTECODE='1')
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'from {_MODULE} import ConsoleHelper'],
+                          capture_output=True, text=True, env=env, check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_console_helper_skips_heavy_imports():
+    times = _import_times()
+    assert _MODULE in times
+    assert 'tkinter' not in times
+
+
+def test_console_helper_import_budget():
+    # Best of a few runs, the first may include disk cache misses
+    # loguru is always loaded (the package log default is applied at import), its cost is not ours
+    best = min(times[_MODULE] - times.get('loguru', 0) for times in (_import_times() for _ in range(_RUNS)))
+    assert best < _BUDGET_US, f'{_MODULE} import took {best / 1000:.1f}ms (budget {_BUDGET_US / 1000:.0f}ms)'
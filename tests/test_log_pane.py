@@ -0,0 +1,28 @@
+"""LogPane flushes while a live widget owns the last line."""
+import time
+
+from dt_tools.console.console_helper import ConsoleHelper
+from dt_tools.console.log_pane import LogPane
+from dt_tools.console.spinner import Spinner
+from dt_tools.console.virtual_terminal import VirtualTerminal
+
+
+def test_flush_repaints_running_spinner():
+    terminal = VirtualTerminal(rows=5, columns=40)
+    previous = ConsoleHelper.set_output_target(terminal)
+    spinner = Spinner('Working')
+    pane = LogPane(flush_secs=60).start()
+    try:
+        spinner.start_spinner()
+        time.sleep(0.5)
+        with ConsoleHelper._output_lock:
+            # Spinner thread is held off, the screen is what flush() left
+            pane.write('log line\n')
+            pane.flush()
+            screen = terminal.display()
+        assert screen[0] == 'log line'
+        assert screen[1].startswith('Working')
+    finally:
+        spinner.stop_spinner()
+        pane.stop()
+        ConsoleHelper.set_output_target(previous)
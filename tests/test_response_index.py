@@ -0,0 +1,24 @@
+"""ResponseIndex candidate order and completion."""
+from dt_tools.console.response_index import ResponseIndex
+
+
+def test_candidates_in_supplied_order():
+    index = ResponseIndex(['web2', 'web10', 'web1', 'db1'])
+    assert index.candidates('web') == ['web2', 'web10', 'web1']
+    assert index.candidates('web', limit=2) == ['web2', 'web10']
+    assert index.candidates('') == ['web2', 'web10', 'web1', 'db1']
+
+
+def test_complete_uses_first_supplied_case():
+    index = ResponseIndex(['Server-B', 'SERVER-A'], case_sensitive=False)
+    assert index.complete('se') == 'server-'
+
+
+def test_complete_casefold_changes_length():
+    # 'ß' casefolds to 'ss', trie positions no longer line up with the response
+    index = ResponseIndex(['Straße-Nord', 'STRASSE-Süd'], case_sensitive=False)
+    assert index.complete('str') == 'straße-'
+    assert index.complete('strasse') == 'strasse-'
+    assert index.complete('stras') == 'stras'
+    assert index.match('strasse-n') is None
+    assert index.match('STRASSE-NORD') == 'Straße-Nord'